@@ -1,21 +1,56 @@
-import requests
-from bs4 import BeautifulSoup
 import streamlit as st
 import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
+import io
+import time
+import uuid
 from datetime import datetime, timedelta
 import seaborn as sns
-from scipy import stats
-from scipy.signal import fftconvolve
-from joblib import Parallel, delayed
 import warnings
 from matplotlib.ticker import FuncFormatter
-from SALib.sample.sobol import sample
-from SALib.analyze.sobol import analyze
+
+from simulador_cervejaria import (
+    ParametrosCervejaria,
+    calcular_emissoes_aterro,
+    calcular_emissoes_compostagem_cervejaria,
+    calcular_emissoes_vermicompostagem_cervejaria,
+    calcular_valor_creditos,
+    valorar_cenarios_precos,
+)
+from simulador_cervejaria.amostragem import AMOSTRADORES, NOMES_AMOSTRADORES
+from simulador_cervejaria.armazenamento import armazem_resultados, chave_resultado
+from simulador_cervejaria.cenarios import (
+    LIMITES_PARAMETROS,
+    avaliar_cenarios,
+    grade_cenarios,
+    resumir_cenarios,
+    rotulo_cenario,
+    validar_valor_grade,
+)
+from simulador_cervejaria.cotacoes import cache_cotacoes, estatisticas_fontes
+from simulador_cervejaria.incerteza import (
+    amostras_necessarias,
+    comparar_metodos,
+    executar_monte_carlo,
+    executar_monte_carlo_adaptativo,
+)
+from simulador_cervejaria.instrumentacao import contar, cronometrar, iniciar_servidor_metricas, metricas
+from simulador_cervejaria.resultados import ResultadoDiario
+from simulador_cervejaria.sensibilidade import (
+    PROBLEMA_SOBOL_CERVEJARIA,
+    SEMENTE_SOBOL,
+    executar_analise_sobol,
+    executar_analise_sobol_adaptativa,
+)
+from simulador_cervejaria.tarefas import gerenciador_tarefas
 
 np.random.seed(50)
 
+inicio_rerun = time.perf_counter()
+contar('reruns')
+iniciar_servidor_metricas()  # /metrics local se SIMULADOR_METRICAS_PORTA estiver definida
+
 # Configurações iniciais
 st.set_page_config(page_title="Simulador de Emissões CO₂eq - Cervejarias", layout="wide")
 warnings.filterwarnings("ignore", category=FutureWarning)
@@ -27,142 +62,19 @@ plt.rcParams['font.size'] = 10
 sns.set_style("whitegrid")
 
 # =============================================================================
-# FUNÇÕES DE COTAÇÃO DO CARBONO (mantidas iguais)
+# COTAÇÕES DO CARBONO
 # =============================================================================
 
-def obter_cotacao_carbono_investing():
-    try:
-        url = "https://www.investing.com/commodities/carbon-emissions"
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Accept-Language': 'pt-BR,pt;q=0.9,en;q=0.8',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Referer': 'https://www.investing.com/'
-        }
-        
-        response = requests.get(url, headers=headers, timeout=15)
-        response.raise_for_status()
-        
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
-        selectores = [
-            '[data-test="instrument-price-last"]',
-            '.text-2xl',
-            '.last-price-value',
-            '.instrument-price-last',
-            '.pid-1062510-last',
-            '.float_lang_base_1',
-            '.top.bold.inlineblock',
-            '#last_last'
-        ]
-        
-        preco = None
-        fonte = "Investing.com"
-        
-        for seletor in selectores:
-            try:
-                elemento = soup.select_one(seletor)
-                if elemento:
-                    texto_preco = elemento.text.strip().replace(',', '')
-                    texto_preco = ''.join(c for c in texto_preco if c.isdigit() or c == '.')
-                    if texto_preco:
-                        preco = float(texto_preco)
-                        break
-            except (ValueError, AttributeError):
-                continue
-        
-        if preco is not None:
-            return preco, "€", "Carbon Emissions Future", True, fonte
-        
-        import re
-        padroes_preco = [
-            r'"last":"([\d,]+)"',
-            r'data-last="([\d,]+)"',
-            r'last_price["\']?:\s*["\']?([\d,]+)',
-            r'value["\']?:\s*["\']?([\d,]+)'
-        ]
-        
-        html_texto = str(soup)
-        for padrao in padroes_preco:
-            matches = re.findall(padrao, html_texto)
-            for match in matches:
-                try:
-                    preco_texto = match.replace(',', '')
-                    preco = float(preco_texto)
-                    if 50 < preco < 200:
-                        return preco, "€", "Carbon Emissions Future", True, fonte
-                except ValueError:
-                    continue
-                    
-        return None, None, None, False, fonte
-        
-    except Exception as e:
-        return None, None, None, False, f"Investing.com - Erro: {str(e)}"
-
-def obter_cotacao_carbono():
-    preco, moeda, contrato_info, sucesso, fonte = obter_cotacao_carbono_investing()
-    
-    if sucesso:
-        return preco, moeda, f"{contrato_info}", True, fonte
-    
-    return 85.50, "€", "Carbon Emissions (Referência)", False, "Referência"
-
-def obter_cotacao_euro_real():
-    try:
-        url = "https://economia.awesomeapi.com.br/last/EUR-BRL"
-        response = requests.get(url, timeout=10)
-        if response.status_code == 200:
-            data = response.json()
-            cotacao = float(data['EURBRL']['bid'])
-            return cotacao, "R$", True, "AwesomeAPI"
-    except:
-        pass
-    
-    try:
-        url = "https://api.exchangerate-api.com/v4/latest/EUR"
-        response = requests.get(url, timeout=10)
-        if response.status_code == 200:
-            data = response.json()
-            cotacao = data['rates']['BRL']
-            return cotacao, "R$", True, "ExchangeRate-API"
-    except:
-        pass
-    
-    return 5.50, "R$", False, "Referência"
-
-def calcular_valor_creditos(emissoes_evitadas_tco2eq, preco_carbono_por_tonelada, moeda, taxa_cambio=1):
-    valor_total = emissoes_evitadas_tco2eq * preco_carbono_por_tonelada * taxa_cambio
-    return valor_total
-
 def exibir_cotacao_carbono():
     st.sidebar.header("💰 Mercado de Carbono e Câmbio")
     
-    if not st.session_state.get('cotacao_carregada', False):
-        st.session_state.mostrar_atualizacao = True
-        st.session_state.cotacao_carregada = True
-    
     col1, col2 = st.sidebar.columns([3, 1])
     with col1:
         if st.button("🔄 Atualizar Cotações", key="atualizar_cotacoes"):
-            st.session_state.cotacao_atualizada = True
-            st.session_state.mostrar_atualizacao = True
+            cache_cotacoes.atualizar()
     
-    if st.session_state.get('mostrar_atualizacao', False):
-        st.sidebar.info("🔄 Atualizando cotações...")
-        
-        preco_carbono, moeda, contrato_info, sucesso_carbono, fonte_carbono = obter_cotacao_carbono()
-        preco_euro, moeda_real, sucesso_euro, fonte_euro = obter_cotacao_euro_real()
-        
-        st.session_state.preco_carbono = preco_carbono
-        st.session_state.moeda_carbono = moeda
-        st.session_state.taxa_cambio = preco_euro
-        st.session_state.moeda_real = moeda_real
-        st.session_state.fonte_cotacao = fonte_carbono
-        
-        st.session_state.mostrar_atualizacao = False
-        st.session_state.cotacao_atualizada = False
-        
-        st.rerun()
+    if cache_cotacoes.atualizando():
+        st.sidebar.info("🔄 Atualizando cotações em segundo plano...")
 
     st.sidebar.metric(
         label=f"Preço do Carbono (tCO₂eq)",
@@ -199,42 +111,40 @@ def exibir_cotacao_carbono():
         - Preços em tempo real
         
         **🔄 Atualização:**
-        - As cotações são carregadas automaticamente ao abrir o aplicativo
+        - As cotações são carregadas em segundo plano ao abrir o aplicativo e renovadas periodicamente
         - Clique em **"Atualizar Cotações"** para obter valores mais recentes
-        - Em caso de falha na conexão, são utilizados valores de referência atualizados
+        - Enquanto não há resposta, ou em caso de falha na conexão, são utilizados os últimos valores conhecidos ou valores de referência
         
         **💡 Importante:**
         - Os preços são baseados no mercado regulado da UE
         - Valores em tempo real sujeitos a variações de mercado
         - Conversão para Real utilizando câmbio comercial
         """)
+        
+        st.markdown("**📡 Fontes consultadas:**")
+        st.dataframe(pd.DataFrame(estatisticas_fontes()), hide_index=True)
 
 # =============================================================================
 # INICIALIZAÇÃO DA SESSION STATE
 # =============================================================================
 
+def sincronizar_cotacoes():
+    # Lê o cache de processo sem bloquear; valores novos aparecem no próximo rerun
+    cotacao_carbono, cotacao_euro = cache_cotacoes.obter()
+    preco_carbono, moeda, contrato_info, sucesso, fonte = cotacao_carbono
+    preco_euro, moeda_real, sucesso_euro, fonte_euro = cotacao_euro
+
+    st.session_state.preco_carbono = preco_carbono
+    st.session_state.moeda_carbono = moeda
+    st.session_state.fonte_cotacao = fonte
+    st.session_state.taxa_cambio = preco_euro
+    st.session_state.moeda_real = moeda_real
+
 def inicializar_session_state():
-    if 'preco_carbono' not in st.session_state:
-        preco_carbono, moeda, contrato_info, sucesso, fonte = obter_cotacao_carbono()
-        st.session_state.preco_carbono = preco_carbono
-        st.session_state.moeda_carbono = moeda
-        st.session_state.fonte_cotacao = fonte
-        
-    if 'taxa_cambio' not in st.session_state:
-        preco_euro, moeda_real, sucesso_euro, fonte_euro = obter_cotacao_euro_real()
-        st.session_state.taxa_cambio = preco_euro
-        st.session_state.moeda_real = moeda_real
-        
-    if 'moeda_real' not in st.session_state:
-        st.session_state.moeda_real = "R$"
-    if 'cotacao_atualizada' not in st.session_state:
-        st.session_state.cotacao_atualizada = False
+    sincronizar_cotacoes()
+
     if 'run_simulation' not in st.session_state:
         st.session_state.run_simulation = False
-    if 'mostrar_atualizacao' not in st.session_state:
-        st.session_state.mostrar_atualizacao = False
-    if 'cotacao_carregada' not in st.session_state:
-        st.session_state.cotacao_carregada = False
 
 inicializar_session_state()
 
@@ -257,6 +167,36 @@ def br_format(x, pos):
         return f"{x:,.0f}".replace(",", "X").replace(".", ",").replace("X", ".")
     return f"{x:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
 
+def formatar_convergencia_sobol(convergencia):
+    meia_largura = convergencia['historico'][-1]['meia_largura_ic']
+    if convergencia['convergiu']:
+        estado = f"convergiu com N = {convergencia['n_samples']} (meia-largura do IC {meia_largura:.3f} ≤ {convergencia['tolerancia']:.2f})"
+    else:
+        estado = f"atingiu o máximo N = {convergencia['n_samples']} sem convergir (meia-largura do IC {meia_largura:.3f})"
+    return f"Sobol adaptativo: {estado} · {convergencia['avaliacoes_economizadas']} avaliações do modelo economizadas"
+
+def formatar_convergencia_mc(convergencia):
+    if convergencia['convergiu']:
+        estado = f"convergiu com N = {convergencia['n_simulations']} simulações pareadas"
+    else:
+        estado = f"atingiu o máximo N = {convergencia['n_simulations']} sem convergir"
+    return (f"Monte Carlo adaptativo: {estado} · {convergencia['avaliacoes']} avaliações do modelo · metas: erro padrão "
+            f"≤ {convergencia['erro_padrao_max'] * 100:.2f}% e IC dos limites ≤ {convergencia['largura_limites_max'] * 100:.1f}% da média")
+
+def tabela_convergencia_mc(historico):
+    # Traço de convergência em % da média, uma coluna por indicador e método
+    df = pd.DataFrame(historico).set_index('n')
+    return pd.DataFrame({
+        'Erro padrão - Compostagem (%)': df['erro_padrao_compostagem'] * 100,
+        'Erro padrão - Minhocas (%)': df['erro_padrao_vermicompostagem'] * 100,
+        'IC dos limites - Compostagem (%)': df['largura_limites_compostagem'] * 100,
+        'IC dos limites - Minhocas (%)': df['largura_limites_vermicompostagem'] * 100,
+    })
+
+def formatar_tempos_sobol(tempos, n_avaliacoes):
+    return (f"{n_avaliacoes} avaliações · amostragem {tempos['amostragem'] * 1000:.1f} ms · "
+            f"avaliação {tempos['avaliacao'] * 1000:.1f} ms · analyze {tempos['analise'] * 1000:.1f} ms")
+
 # Título do aplicativo para cervejarias
 st.title("🍻 Simulador de Emissões de tCO₂eq para Cervejarias")
 st.markdown("""
@@ -274,17 +214,17 @@ with st.sidebar:
     
     # Produção de cerveja e cálculo automático de resíduos
     producao_mensal_litros = st.slider("Produção mensal de cerveja (litros)", 
-                                     min_value=500, max_value=10000, value=1500, step=500,
+                                     *LIMITES_PARAMETROS['producao_mensal_litros'], value=1500, step=500,
                                      help="Volume mensal de cerveja produzida")
     
     # Cálculo automático de resíduos baseado na produção
-    dias_operacao_mes = st.slider("Dias de operação por mês", 20, 30, 25, 1,
+    dias_operacao_mes = st.slider("Dias de operação por mês", *LIMITES_PARAMETROS['dias_operacao_mes'], 25, 1,
                                 help="Número de dias em que a cervejaria opera por mês")
     
     # NOVO: Fator de conversão para resíduos
     st.subheader("📊 Cálculo de Resíduos")
     fator_residuos = st.slider("Fator de resíduos (kg/litro)", 
-                              min_value=0.10, max_value=0.30, value=0.17, step=0.01,
+                              *LIMITES_PARAMETROS['fator_residuos'], value=0.17, step=0.01,
                               help="Quantidade de resíduos gerados por litro de cerveja produzida")
     
     # CORREÇÃO: Cálculo reativo dos resíduos - usando valores atuais dos sliders
@@ -299,16 +239,16 @@ with st.sidebar:
     st.subheader("📊 Composição dos Resíduos")
     
     # Composição dos resíduos da cervejaria
-    percentual_bagaco = st.slider("Percentual de bagaço de malte", 70, 90, 80, 1,
+    percentual_bagaco = st.slider("Percentual de bagaço de malte", *LIMITES_PARAMETROS['percentual_bagaco'], 80, 1,
                                  help="Percentual de bagaço de malte na composição dos resíduos")
     percentual_levedura = 100 - percentual_bagaco
     
     st.write(f"**Composição:** {percentual_bagaco}% bagaço + {percentual_levedura}% levedura")
     
     # Umidade média ponderada baseada na composição
-    umidade_bagaco = st.slider("Umidade do bagaço (%)", 75, 85, 80, 1,
+    umidade_bagaco = st.slider("Umidade do bagaço (%)", *LIMITES_PARAMETROS['umidade_bagaco'], 80, 1,
                               help="Teor de umidade do bagaço de malte")
-    umidade_levedura = st.slider("Umidade da levedura (%)", 85, 95, 90, 1,
+    umidade_levedura = st.slider("Umidade da levedura (%)", *LIMITES_PARAMETROS['umidade_levedura'], 90, 1,
                                 help="Teor de umidade da levedura gasta")
     
     # Calcular umidade média ponderada
@@ -320,13 +260,13 @@ with st.sidebar:
     st.subheader("🌡️ Parâmetros Operacionais")
     
     # Temperatura - PARÂMETRO IMPORTANTE
-    temperatura = st.slider("Temperatura média (°C)", 15, 35, 25, 1,
+    temperatura = st.slider("Temperatura média (°C)", *LIMITES_PARAMETROS['temperatura'], 25, 1,
                            help="Temperatura ambiente que influencia a decomposição e cálculo do DOCf")
     
     # DOC específico para resíduos de cervejaria
-    doc_bagaco = st.slider("DOC do bagaço", 0.70, 0.90, 0.80, 0.01,
+    doc_bagaco = st.slider("DOC do bagaço", *LIMITES_PARAMETROS['doc_bagaco'], 0.80, 0.01,
                           help="Carbono Orgânico Degradável do bagaço de malte")
-    doc_levedura = st.slider("DOC da levedura", 0.80, 0.95, 0.90, 0.01,
+    doc_levedura = st.slider("DOC da levedura", *LIMITES_PARAMETROS['doc_levedura'], 0.90, 0.01,
                             help="Carbono Orgânico Degradável da levedura")
     
     # DOC médio ponderado
@@ -342,7 +282,7 @@ with st.sidebar:
     
     # CORREÇÃO: Horas expostas agora é o único parâmetro operacional
     st.subheader("⏰ Horas de Exposição")
-    h_exposta = st.slider("Horas expostas por dia", 4, 24, 8, 1,
+    h_exposta = st.slider("Horas expostas por dia", *LIMITES_PARAMETROS['h_exposta'], 8, 1,
                          help="Horas diárias de exposição dos resíduos para tratamento")
     
     # Mostrar automaticamente a massa exposta (calculada)
@@ -402,459 +342,610 @@ with st.sidebar:
         """)
     
     st.subheader("🎯 Configuração de Simulação")
-    anos_simulacao = st.slider("Anos de simulação", 5, 50, 20, 5)
+    anos_simulacao = st.slider("Anos de simulação", *LIMITES_PARAMETROS['anos_simulacao'], 20, 5)
     n_simulations = st.slider("Número de simulações Monte Carlo", 50, 1000, 100, 50)
+    amostrador_mc = st.selectbox(
+        "Amostrador Monte Carlo", ['legado', *AMOSTRADORES],
+        format_func=lambda chave: NOMES_AMOSTRADORES.get(chave, "Pseudoaleatório (sementes 50/51)"),
+        help="LHS e Sobol cobrem melhor o espaço de parâmetros e estabilizam o IC 95% com menos simulações",
+    )
+    amostrador_mc = None if amostrador_mc == 'legado' else amostrador_mc
     n_samples = st.slider("Número de amostras Sobol", 32, 256, 64, 16)
+    series_float32 = st.checkbox("Séries diárias em float32", value=False,
+                                 help="Metade da memória por sessão; acumulados continuam em float64")
+    
+    with st.expander("⚡ Execução paralela (Sobol)"):
+        n_workers_sobol = st.number_input("Workers", min_value=0, max_value=64, value=1, step=1,
+                                          help="Processos do pool para avaliar a matriz de Saltelli (0 = um por núcleo)")
+        tamanho_bloco_sobol = st.number_input("Tamanho do bloco", min_value=0, max_value=100000, value=0, step=256,
+                                              help="Linhas por tarefa enviada ao pool (0 = dividir igualmente entre os workers); "
+                                                   "a barra de progresso avança a cada bloco concluído")
+    
+    with st.expander("🎯 Sobol adaptativo"):
+        sobol_adaptativo = st.checkbox("Parar ao convergir", value=False,
+                                       help="Dobra as amostras (32, 64, 128, ...) até os ICs de S1/ST ficarem estreitos")
+        n_max_sobol = st.select_slider("Máximo de amostras", options=[64, 128, 256, 512, 1024, 2048], value=1024)
+        tolerancia_sobol = st.slider("Meia-largura máxima do IC 95%", 0.02, 0.30, 0.15, 0.01)
+    
+    with st.expander("🎯 Monte Carlo adaptativo"):
+        mc_adaptativo = st.checkbox("Parar ao atingir a precisão", value=False,
+                                    help="Roda lotes de 100 simulações pareadas (mesmos pontos para os dois métodos) "
+                                         "até as metas abaixo valerem para compostagem e minhocas")
+        n_max_mc = st.select_slider("Máximo de simulações", options=[1000, 2000, 5000, 10000, 20000], value=5000)
+        erro_padrao_mc = st.slider("Erro padrão máximo da média (% da média)", 0.05, 2.0, 0.5, 0.05)
+        largura_limites_mc = st.slider("Largura máxima do IC dos limites 2,5%/97,5% (% da média)", 0.5, 10.0, 3.0, 0.5)
+    
+    with st.expander("💹 Cenários de preço e desconto"):
+        faixa_precos = st.slider("Faixa de preço do carbono (€/tCO₂eq)", 10, 300, (40, 160), 10)
+        faixa_cambios = st.slider("Faixa de câmbio EUR/BRL", 3.0, 9.0, (4.5, 6.5), 0.25)
+        taxa_desconto = st.slider("Taxa de desconto anual (%)", 0.0, 20.0, 8.0, 0.5,
+                                  help="Usada no VPL dos créditos; receitas descontadas ao fim de cada ano")
     
     if st.button("🚀 Executar Simulação", type="primary"):
         st.session_state.run_simulation = True
 
 # =============================================================================
-# PARÂMETROS FIXOS AJUSTADOS PARA CERVEJARIAS
+# PARÂMETROS DA SIMULAÇÃO
 # =============================================================================
 
-# Usando temperatura do sidebar
-DOCf_val = 0.0147 * temperatura + 0.28
-MCF = 1
-F = 0.5
-OX = 0.1
-Ri = 0.0
-k_ano = 0.06
-
-# Parâmetros específicos para resíduos de cervejaria
-TOC_CERVEJARIA = 0.45  # Maior que resíduos genéricos devido à alta matéria orgânica
-TN_CERVEJARIA = 25.0 / 1000  # Teor de nitrogênio mais alto
-
-# Ajustar fatores de emissão para resíduos de cervejaria (mais biodegradáveis)
-CH4_C_FRAC_CERVEJARIA = 0.20 / 100  # Maior potencial de metano
-N2O_N_FRAC_CERVEJARIA = 1.20 / 100  # Maior potencial de óxido nitroso
-
-DIAS_COMPOSTAGEM = 50
-
-# Perfis de emissão ajustados para resíduos de cervejaria (decomposição mais rápida)
-PERFIL_CH4_CERVEJARIA = np.array([
-    0.03, 0.04, 0.05, 0.07, 0.09,  # Dias 1-5 (início mais rápido)
-    0.12, 0.15, 0.18, 0.20, 0.18,  # Dias 6-10 (pico antecipado)
-    0.15, 0.12, 0.10, 0.08, 0.06,  # Dias 11-15
-    0.05, 0.04, 0.03, 0.02, 0.02,  # Dias 16-20
-    0.01, 0.01, 0.01, 0.005, 0.005,  # Dias 21-25
-    0.005, 0.005, 0.005, 0.005, 0.005,  # Dias 26-30
-    0.002, 0.002, 0.002, 0.002, 0.002,  # Dias 31-35
-    0.001, 0.001, 0.001, 0.001, 0.001,  # Dias 36-40
-    0.001, 0.001, 0.001, 0.001, 0.001,  # Dias 41-45
-    0.001, 0.001, 0.001, 0.001, 0.001   # Dias 46-50
-])
-PERFIL_CH4_CERVEJARIA /= PERFIL_CH4_CERVEJARIA.sum()
-
-PERFIL_N2O_CERVEJARIA = np.array([
-    0.12, 0.15, 0.20, 0.08, 0.05,  # Dias 1-5 (pico mais pronunciado)
-    0.06, 0.08, 0.10, 0.12, 0.15,  # Dias 6-10
-    0.18, 0.20, 0.18, 0.15, 0.12,  # Dias 11-15 (pico principal)
-    0.10, 0.08, 0.06, 0.05, 0.04,  # Dias 16-20
-    0.03, 0.02, 0.01, 0.01, 0.01,  # Dias 21-25
-    0.005, 0.005, 0.005, 0.005, 0.005,  # Dias 26-30
-    0.002, 0.002, 0.002, 0.002, 0.002,  # Dias 31-35
-    0.001, 0.001, 0.001, 0.001, 0.001,  # Dias 36-40
-    0.001, 0.001, 0.001, 0.001, 0.001,  # Dias 41-45
-    0.001, 0.001, 0.001, 0.001, 0.001   # Dias 46-50
-])
-PERFIL_N2O_CERVEJARIA /= PERFIL_N2O_CERVEJARIA.sum()
-
-# Emissões pré-descarte ajustadas para cervejaria
-CH4_pre_descarte_ugC_por_kg_h_media = 3.50  # Valor mais alto para resíduos de cervejaria
-fator_conversao_C_para_CH4 = 16/12
-CH4_pre_descarte_ugCH4_por_kg_h_media = CH4_pre_descarte_ugC_por_kg_h_media * fator_conversao_C_para_CH4
-CH4_pre_descarte_g_por_kg_dia = CH4_pre_descarte_ugCH4_por_kg_h_media * 24 / 1_000_000
-
-N2O_pre_descarte_mgN_por_kg = 25.0  # Valor mais alto
-N2O_pre_descarte_mgN_por_kg_dia = N2O_pre_descarte_mgN_por_kg / 3
-N2O_pre_descarte_g_por_kg_dia = N2O_pre_descarte_mgN_por_kg_dia * (44/28) / 1000
-
-PERFIL_N2O_PRE_DESCARTE = {1: 0.8623, 2: 0.10, 3: 0.0377}
-
-# GWP (IPCC AR6)
-GWP_CH4_20 = 79.7
-GWP_N2O_20 = 273
+cervejaria = ParametrosCervejaria(
+    producao_mensal_litros=producao_mensal_litros,
+    dias_operacao_mes=dias_operacao_mes,
+    fator_residuos=fator_residuos,
+    percentual_bagaco=percentual_bagaco,
+    umidade_bagaco=umidade_bagaco,
+    umidade_levedura=umidade_levedura,
+    temperatura=temperatura,
+    doc_bagaco=doc_bagaco,
+    doc_levedura=doc_levedura,
+    h_exposta=h_exposta,
+    anos_simulacao=anos_simulacao,
+)
 
 # Período de Simulação
-dias = anos_simulacao * 365
 ano_inicio = datetime.now().year
 data_inicio = datetime(ano_inicio, 1, 1)
-datas = pd.date_range(start=data_inicio, periods=dias, freq='D')
-
-PERFIL_N2O = {1: 0.10, 2: 0.30, 3: 0.40, 4: 0.15, 5: 0.05}
 
 # =============================================================================
-# FUNÇÕES DE CÁLCULO ESPECÍFICAS PARA CERVEJARIAS
+# CACHE DOS RESULTADOS
 # =============================================================================
 
-def ajustar_emissoes_pre_descarte(O2_concentracao):
-    ch4_ajustado = CH4_pre_descarte_g_por_kg_dia
-
-    if O2_concentracao == 21:
-        fator_n2o = 1.0
-    elif O2_concentracao == 10:
-        fator_n2o = 11.11 / 20.26
-    elif O2_concentracao == 1:
-        fator_n2o = 7.86 / 20.26
-    else:
-        fator_n2o = 1.0
-
-    n2o_ajustado = N2O_pre_descarte_g_por_kg_dia * fator_n2o
-    return ch4_ajustado, n2o_ajustado
-
-def calcular_emissoes_pre_descarte(O2_concentracao, dias_simulacao=dias):
-    ch4_ajustado, n2o_ajustado = ajustar_emissoes_pre_descarte(O2_concentracao)
+# Resultados determinísticos, cenários e amostras necessárias memorizados entre reruns (LRU
+# limitado por max_entries), com chave apenas nas entradas que os afetam: mudar o preço do
+# carbono, o câmbio ou abrir um expander só refaz os valores financeiros. Sobol e Monte Carlo
+# ficam nas etapas em segundo plano, mais abaixo.
+
+def simular_resultado_diario(cervejaria, data_inicio, dtype=np.float64):
+    params_base = cervejaria.params_base
+
+    ch4_aterro_dia, n2o_aterro_dia = calcular_emissoes_aterro(params_base, cervejaria)
+    ch4_compost_dia, n2o_compost_dia = calcular_emissoes_compostagem_cervejaria(params_base, cervejaria)
+    ch4_vermi_dia, n2o_vermi_dia = calcular_emissoes_vermicompostagem_cervejaria(params_base, cervejaria)
+
+    # Só as séries primitivas ficam guardadas; tCO₂eq, acumulados e resumo anual são derivados sob demanda
+    return ResultadoDiario(data_inicio, {
+        'CH4_Aterro': ch4_aterro_dia,
+        'N2O_Aterro': n2o_aterro_dia,
+        'CH4_Compost': ch4_compost_dia,
+        'N2O_Compost': n2o_compost_dia,
+        'CH4_Vermi': ch4_vermi_dia,
+        'N2O_Vermi': n2o_vermi_dia,
+    }, dtype)
+
+# Em caso de falta no cache da sessão, os resultados vêm do armazenamento em disco
+# (endereçado pela versão do modelo + entradas) antes de serem recalculados
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def calcular_resultado_diario(cervejaria, data_inicio, dtype='float64'):
+    def calcular():
+        resultado = simular_resultado_diario(cervejaria, data_inicio, dtype)
+        return resultado.series_kg_dia, {}
+
+    series, _ = armazem_resultados.memorizar_arrays(
+        'resultado_diario', {'cervejaria': cervejaria, 'data_inicio': data_inicio, 'dtype': dtype}, calcular,
+    )
+    return ResultadoDiario(data_inicio, series, dtype)
+
+# Campos da barra lateral que podem entrar na grade de cenários
+CAMPOS_CENARIOS = {
+    'h_exposta': "Horas expostas por dia",
+    'percentual_bagaco': "Percentual de bagaço de malte",
+    'producao_mensal_litros': "Produção mensal de cerveja (litros)",
+    'dias_operacao_mes': "Dias de operação por mês",
+    'fator_residuos': "Fator de resíduos (kg/litro)",
+    'umidade_bagaco': "Umidade do bagaço (%)",
+    'umidade_levedura': "Umidade da levedura (%)",
+    'temperatura': "Temperatura média (°C)",
+    'doc_bagaco': "DOC do bagaço",
+    'doc_levedura': "DOC da levedura",
+    'anos_simulacao': "Anos de simulação",
+}
+MAX_CENARIOS = 48
+
+def ler_valores_grade(campo, texto):
+    # "8, 12; 24" -> [8, 12, 24], sem repetições e na ordem digitada; ValueError se algum valor
+    # não serve para o campo (não numérico, fracionário num campo inteiro ou fora da faixa)
+    partes = [parte.strip() for parte in texto.replace(';', ',').split(',')]
+    return list(dict.fromkeys(validar_valor_grade(campo, parte) for parte in partes if parte))
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def avaliar_cenarios_em_cache(cenarios, campos):
+    anuais = avaliar_cenarios(list(cenarios))
+    return anuais, resumir_cenarios(cenarios, anuais, campos)
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def amostras_necessarias_em_cache(metodo, cervejaria, largura_relativa):
+    return pd.DataFrame(amostras_necessarias(metodo, cervejaria, largura_relativa))
 
-    emissoes_CH4_pre_descarte_kg = np.full(dias_simulacao, residuos_kg_dia * ch4_ajustado / 1000)
-    emissoes_N2O_pre_descarte_kg = np.zeros(dias_simulacao)
+# =============================================================================
+# ETAPAS PESADAS EM SEGUNDO PLANO (SOBOL E MONTE CARLO)
+# =============================================================================
 
-    for dia_entrada in range(dias_simulacao):
-        for dias_apos_descarte, fracao in PERFIL_N2O_PRE_DESCARTE.items():
-            dia_emissao = dia_entrada + dias_apos_descarte - 1
-            if dia_emissao < dias_simulacao:
-                emissoes_N2O_pre_descarte_kg[dia_emissao] += (
-                    residuos_kg_dia * n2o_ajustado * fracao / 1000
+# Sobol e Monte Carlo rodam no executor de segundo plano (simulador_cervejaria.tarefas), fora do
+# st.cache_data: cada rerun só acompanha a tarefa, que sobrevive às interações do usuário e pode
+# ser cancelada. O resultado fica na sessão (o último de cada etapa) e no armazém em disco, que
+# também atende as outras sessões. Cada etapa tem uma só chave ativa por sessão: quando as
+# entradas mudam, a tarefa da chave anterior é cancelada e descartada (se nenhuma outra sessão
+# a acompanha), em vez de continuar ocupando o executor.
+
+def id_sessao():
+    return st.session_state.setdefault('id_sessao', uuid.uuid4().hex)
+
+def ativar_etapa(etapa, entradas):
+    chave = chave_resultado(etapa, **entradas)
+    ativas = st.session_state.setdefault('etapas_ativas', {})
+    anterior = ativas.get(etapa)
+    if anterior is not None and anterior != chave:
+        gerenciador_tarefas.liberar(anterior, id_sessao())
+        st.session_state.setdefault('etapas_canceladas', set()).discard(anterior)
+    ativas[etapa] = chave
+    return chave
+
+def iniciar_etapa(etapa, rotulo, entradas, funcao):
+    # Submete a etapa sem esperar por ela, para que rode enquanto as seções anteriores são exibidas
+    chave = ativar_etapa(etapa, entradas)
+    concluidas = st.session_state.setdefault('etapas_concluidas', {})
+    if concluidas.get(etapa, (None,))[0] != chave and chave not in st.session_state.setdefault('etapas_canceladas', set()):
+        gerenciador_tarefas.obter(chave, funcao, id_sessao())
+
+def executar_etapa(etapa, rotulo, entradas, funcao, exibir_parcial=None):
+    # Espera a etapa mostrando barra de progresso, resultado parcial e botão de cancelar.
+    # Devolve None se a etapa foi cancelada
+    chave = ativar_etapa(etapa, entradas)
+    concluidas = st.session_state.setdefault('etapas_concluidas', {})
+    if concluidas.get(etapa, (None,))[0] == chave:
+        return concluidas[etapa][1]
+
+    area = st.empty()
+    canceladas = st.session_state.setdefault('etapas_canceladas', set())
+    if chave in canceladas:
+        with area.container():
+            st.info(f"{rotulo}: cancelada.")
+            if not st.button("Executar novamente", key=f'retomar_{etapa}'):
+                return None
+        canceladas.discard(chave)
+
+    tarefa = gerenciador_tarefas.obter(chave, funcao, id_sessao())
+    with area.container():
+        barra = st.progress(0.0, text=rotulo)
+        area_parcial = st.empty()
+        if st.button("Cancelar", key=f'cancelar_{etapa}'):
+            tarefa.cancelar()
+
+    exibido = None
+    with cronometrar(f'etapa_{etapa}'):
+        while not tarefa.aguardar(0.1):
+            barra.progress(tarefa.progresso, text=f"{rotulo}: {tarefa.progresso:.0%}")
+            if exibir_parcial is not None and tarefa.parcial is not exibido:
+                exibido = tarefa.parcial
+                with area_parcial.container():
+                    exibir_parcial(exibido)
+    area.empty()
+    gerenciador_tarefas.descartar(chave)
+
+    if tarefa.cancelada:
+        canceladas.add(chave)
+        st.info(f"{rotulo}: cancelada.")
+        return None
+    concluidas[etapa] = (chave, tarefa.resultado())
+    return concluidas[etapa][1]
+
+def etapa_sobol(metodo):
+    # Resultado: (Si, tempos, avaliações do modelo, convergência ou None) conforme o modo da barra lateral.
+    # Os dois modos usam a mesma etapa: trocar de modo também substitui a tarefa anterior
+    # n_workers_sobol = 0 pede explicitamente um worker por núcleo
+    tamanho_bloco, n_workers = tamanho_bloco_sobol or None, int(n_workers_sobol)
+    if sobol_adaptativo:
+        entradas = {'problema': PROBLEMA_SOBOL_CERVEJARIA, 'n_max': n_max_sobol, 'tolerancia': tolerancia_sobol,
+                    'metodo': metodo, 'cervejaria': cervejaria, 'semente': SEMENTE_SOBOL}
+
+        def calcular(tarefa):
+            def executar():
+                Si, tempos, convergencia = executar_analise_sobol_adaptativa(
+                    PROBLEMA_SOBOL_CERVEJARIA, n_max_sobol, metodo, cervejaria, tolerancia_sobol,
+                    tamanho_bloco=tamanho_bloco, n_workers=n_workers, ao_progresso=tarefa.informar,
                 )
+                return dict(Si), {'tempos': tempos, 'convergencia': convergencia}
 
-    return emissoes_CH4_pre_descarte_kg, emissoes_N2O_pre_descarte_kg
-
-def calcular_emissoes_aterro(params, dias_simulacao=dias):
-    umidade_val, temp_val, doc_val = params
-
-    fator_umid = (1 - umidade_val) / (1 - 0.55)
-    f_aberto = np.clip((massa_exposta_kg / residuos_kg_dia) * (h_exposta / 24), 0.0, 1.0)
-    docf_calc = 0.0147 * temp_val + 0.28
+            Si, extras = armazem_resultados.memorizar_arrays('sobol_adaptativo', entradas, executar)
+            return dict(Si), extras['tempos'], extras['convergencia']['avaliacoes'], extras['convergencia']
 
-    potencial_CH4_por_kg = doc_val * docf_calc * MCF * F * (16/12) * (1 - Ri) * (1 - OX)
-    potencial_CH4_lote_diario = residuos_kg_dia * potencial_CH4_por_kg
+        return f'sobol_{metodo}', "Sobol adaptativo", entradas, calcular
 
-    t = np.arange(1, dias_simulacao + 1, dtype=float)
-    kernel_ch4 = np.exp(-k_ano * (t - 1) / 365.0) - np.exp(-k_ano * t / 365.0)
-    entradas_diarias = np.ones(dias_simulacao, dtype=float)
-    emissoes_CH4 = fftconvolve(entradas_diarias, kernel_ch4, mode='full')[:dias_simulacao]
-    emissoes_CH4 *= potencial_CH4_lote_diario
+    entradas = {'problema': PROBLEMA_SOBOL_CERVEJARIA, 'n_samples': n_samples, 'metodo': metodo, 'cervejaria': cervejaria}
 
-    # Valores ajustados para resíduos de cervejaria
-    E_aberto = 2.25  # Maior que resíduos genéricos
-    E_fechado = 2.50
-    E_medio = f_aberto * E_aberto + (1 - f_aberto) * E_fechado
-    E_medio_ajust = E_medio * fator_umid
-    emissao_diaria_N2O = (E_medio_ajust * (44/28) / 1_000_000) * residuos_kg_dia
+    def calcular(tarefa):
+        def executar():
+            Si, tempos = executar_analise_sobol(PROBLEMA_SOBOL_CERVEJARIA, n_samples, metodo, cervejaria,
+                                                tamanho_bloco, n_workers, ao_progresso=tarefa.informar)
+            return dict(Si), tempos
 
-    kernel_n2o = np.array([PERFIL_N2O.get(d, 0) for d in range(1, 6)], dtype=float)
-    emissoes_N2O = fftconvolve(np.full(dias_simulacao, emissao_diaria_N2O), kernel_n2o, mode='full')[:dias_simulacao]
+        Si, tempos = armazem_resultados.memorizar_arrays('sobol', entradas, executar)
+        return dict(Si), tempos, n_samples * (2 * PROBLEMA_SOBOL_CERVEJARIA['num_vars'] + 2), None
 
-    O2_concentracao = 21
-    emissoes_CH4_pre_descarte_kg, emissoes_N2O_pre_descarte_kg = calcular_emissoes_pre_descarte(O2_concentracao, dias_simulacao)
+    return f'sobol_{metodo}', "Análise de Sobol", entradas, calcular
 
-    total_ch4_aterro_kg = emissoes_CH4 + emissoes_CH4_pre_descarte_kg
-    total_n2o_aterro_kg = emissoes_N2O + emissoes_N2O_pre_descarte_kg
+TAMANHO_LOTE_MC = 100
+METODOS_MC = ('compostagem', 'vermicompostagem')
 
-    return total_ch4_aterro_kg, total_n2o_aterro_kg
+def etapa_monte_carlo():
+    # Resultado: (resultados compostagem, resultados vermicompostagem, testes estatísticos, convergência ou None)
+    if mc_adaptativo:
+        # O modo legado usa sementes diferentes por método e não gera pares, então vira 'mc'
+        entradas = {'n_max': n_max_mc, 'erro_padrao_max': erro_padrao_mc / 100,
+                    'largura_limites_max': largura_limites_mc / 100, 'tamanho_lote': TAMANHO_LOTE_MC,
+                    'amostrador': amostrador_mc or 'mc', 'cervejaria': cervejaria}
 
-def calcular_emissoes_compostagem_cervejaria(params, dias_simulacao=dias):
-    umidade_val, temp_val, doc_val = params
-    fracao_ms = 1 - umidade_val
-    
-    # Usando parâmetros específicos para cervejaria
-    ch4_total_por_lote = residuos_kg_dia * (TOC_CERVEJARIA * CH4_C_FRAC_CERVEJARIA * (16/12) * fracao_ms)
-    n2o_total_por_lote = residuos_kg_dia * (TN_CERVEJARIA * N2O_N_FRAC_CERVEJARIA * (44/28) * fracao_ms)
+        def calcular(tarefa):
+            def executar():
+                return executar_monte_carlo_adaptativo(
+                    cervejaria, entradas['erro_padrao_max'], entradas['largura_limites_max'], n_max_mc,
+                    TAMANHO_LOTE_MC, entradas['amostrador'],
+                    ao_lote=lambda historico: tarefa.informar(historico[-1]['n'] / n_max_mc, list(historico)),
+                )
 
-    emissoes_CH4 = np.zeros(dias_simulacao)
-    emissoes_N2O = np.zeros(dias_simulacao)
+            resultados, convergencia = armazem_resultados.memorizar_arrays('monte_carlo_adaptativo', entradas, executar)
+            compost, vermi = (np.asarray(resultados[metodo]) for metodo in METODOS_MC)
+            return compost, vermi, comparar_metodos(compost, vermi), convergencia
 
-    for dia_entrada in range(dias_simulacao):
-        for dia_compostagem in range(len(PERFIL_CH4_CERVEJARIA)):
-            dia_emissao = dia_entrada + dia_compostagem
-            if dia_emissao < dias_simulacao:
-                emissoes_CH4[dia_emissao] += ch4_total_por_lote * PERFIL_CH4_CERVEJARIA[dia_compostagem]
-                emissoes_N2O[dia_emissao] += n2o_total_por_lote * PERFIL_N2O_CERVEJARIA[dia_compostagem]
+        return 'monte_carlo', "Monte Carlo adaptativo", entradas, calcular
 
-    return emissoes_CH4, emissoes_N2O
+    entradas = {'n_simulations': n_simulations, 'cervejaria': cervejaria, 'amostrador': amostrador_mc}
 
-def calcular_emissoes_vermicompostagem_cervejaria(params, dias_simulacao=dias):
-    umidade_val, temp_val, doc_val = params
-    fracao_ms = 1 - umidade_val
-    
-    # Usando parâmetros específicos para cervejaria com vermicompostagem
-    ch4_total_por_lote = residuos_kg_dia * (TOC_CERVEJARIA * (CH4_C_FRAC_CERVEJARIA * 0.5) * (16/12) * fracao_ms)
-    n2o_total_por_lote = residuos_kg_dia * (TN_CERVEJARIA * (N2O_N_FRAC_CERVEJARIA * 0.3) * (44/28) * fracao_ms)
+    def calcular(tarefa):
+        resultados = []
+        for i, metodo in enumerate(METODOS_MC):
+            arrays, _ = armazem_resultados.memorizar_arrays(
+                'monte_carlo', {**entradas, 'metodo': metodo},
+                lambda metodo=metodo: ({'resultados': executar_monte_carlo(n_simulations, metodo, cervejaria, amostrador_mc)}, {}),
+            )
+            resultados.append(np.asarray(arrays['resultados']))
+            tarefa.informar((i + 1) / (len(METODOS_MC) + 1))
+        return (*resultados, comparar_metodos(*resultados), None)
 
-    emissoes_CH4 = np.zeros(dias_simulacao)
-    emissoes_N2O = np.zeros(dias_simulacao)
+    return 'monte_carlo', "Monte Carlo", entradas, calcular
 
-    for dia_entrada in range(dias_simulacao):
-        for dia_compostagem in range(len(PERFIL_CH4_CERVEJARIA)):
-            dia_emissao = dia_entrada + dia_compostagem
-            if dia_emissao < dias_simulacao:
-                emissoes_CH4[dia_emissao] += ch4_total_por_lote * PERFIL_CH4_CERVEJARIA[dia_compostagem] * 0.7
-                emissoes_N2O[dia_emissao] += n2o_total_por_lote * PERFIL_N2O_CERVEJARIA[dia_compostagem] * 0.5
+# =============================================================================
+# GRÁFICOS (RENDERIZAÇÃO SOB DEMANDA E EM CACHE)
+# =============================================================================
 
-    return emissoes_CH4, emissoes_N2O
+# Cada gráfico é renderizado para PNG uma única vez por conteúdo dos dados (st.cache_data
+# faz o hash dos arrays) e só quando a seção correspondente está aberta. Séries diárias são
+# reduzidas à resolução da tela antes de chegar ao matplotlib.
+PONTOS_MAX_GRAFICO = 1500  # largura em pixels de uma figura de 10 pol a 150 dpi
+ANOS_MAX_ROTULOS = 20  # acima disso os rótulos por barra se sobrepõem
+
+def indices_decimados(n_pontos, n_max=PONTOS_MAX_GRAFICO):
+    # Índices igualmente espaçados, sempre incluindo o primeiro e o último ponto
+    if n_pontos <= n_max:
+        return np.arange(n_pontos)
+    return np.unique(np.linspace(0, n_pontos - 1, n_max).round().astype(int))
+
+def figura_para_png(fig):
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format='png', bbox_inches='tight')
+    plt.close(fig)
+    contar('graficos_renderizados')  # só falhas do cache de PNGs chegam aqui
+    return buffer.getvalue()
+
+def exibir_grafico(chave, renderizar, *args, aberto=True):
+    # O PNG só é gerado (ou buscado no cache) se o usuário mantiver o gráfico visível
+    if st.toggle("Mostrar gráfico", value=aberto, key=f'mostrar_{chave}'):
+        with cronometrar(f'grafico_{chave}'):
+            png = renderizar(*args)
+        st.image(png)
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def grafico_comparacao_anual(anos, reducao_compost, reducao_vermi):
+    fig, ax = plt.subplots(figsize=(10, 6))
+    x = np.arange(len(anos))
+    bar_width = 0.35
+
+    ax.bar(x - bar_width/2, reducao_compost, width=bar_width,
+            label='Compostagem Tradicional', edgecolor='black')
+    ax.bar(x + bar_width/2, reducao_vermi, width=bar_width,
+            label='Compostagem em Reatores Com Minhocas', edgecolor='black', hatch='//')
+
+    # Adicionar valores formatados em cima das barras
+    if len(anos) <= ANOS_MAX_ROTULOS:
+        for i, (v1, v2) in enumerate(zip(reducao_compost, reducao_vermi)):
+            ax.text(i - bar_width/2, v1 + max(v1, v2)*0.01, 
+                    formatar_br(v1), ha='center', fontsize=9, fontweight='bold')
+            ax.text(i + bar_width/2, v2 + max(v1, v2)*0.01, 
+                    formatar_br(v2), ha='center', fontsize=9, fontweight='bold')
 
-def executar_simulacao_completa_cervejaria(parametros):
-    umidade, T, DOC = parametros
+    ax.set_xlabel('Ano')
+    ax.set_ylabel('Emissões Evitadas (t CO₂eq)')
+    ax.set_title('Comparação Anual das Emissões Evitadas: Compostagem Tradicional vs Compostagem em Reatores Com Minhocas')
     
-    ch4_aterro, n2o_aterro = calcular_emissoes_aterro([umidade, T, DOC])
-    ch4_compost, n2o_compost = calcular_emissoes_compostagem_cervejaria([umidade, T, DOC])
-
-    total_aterro_tco2eq = (ch4_aterro * GWP_CH4_20 + n2o_aterro * GWP_N2O_20) / 1000
-    total_compost_tco2eq = (ch4_compost * GWP_CH4_20 + n2o_compost * GWP_N2O_20) / 1000
+    ax.set_xticks(x)
+    ax.set_xticklabels(anos, fontsize=8)
 
-    reducao_tco2eq = total_aterro_tco2eq.sum() - total_compost_tco2eq.sum()
-    return reducao_tco2eq
+    ax.legend(title='Método de Tratamento')
+    ax.yaxis.set_major_formatter(FuncFormatter(br_format))
+    ax.grid(axis='y', linestyle='--', alpha=0.7)
+    return figura_para_png(fig)
 
-def executar_simulacao_vermicompostagem_cervejaria(parametros):
-    umidade, T, DOC = parametros
+@st.cache_data(max_entries=32, show_spinner=False)
+def grafico_reducao_acumulada(datas, aterro_acum, compost_acum, vermi_acum, anos_simulacao):
+    fig, ax = plt.subplots(figsize=(10, 6))
     
-    ch4_aterro, n2o_aterro = calcular_emissoes_aterro([umidade, T, DOC])
-    ch4_vermi, n2o_vermi = calcular_emissoes_vermicompostagem_cervejaria([umidade, T, DOC])
-
-    total_aterro_tco2eq = (ch4_aterro * GWP_CH4_20 + n2o_aterro * GWP_N2O_20) / 1000
-    total_vermi_tco2eq = (ch4_vermi * GWP_CH4_20 + n2o_vermi * GWP_N2O_20) / 1000
-
-    reducao_tco2eq = total_aterro_tco2eq.sum() - total_vermi_tco2eq.sum()
-    return reducao_tco2eq
+    # Plotar apenas o cenário base e as áreas de redução
+    ax.plot(datas, aterro_acum, 'r-', 
+            label='Cenário Base (Aterro Sanitário)', linewidth=3)
+    
+    # Área da compostagem tradicional (menor)
+    ax.fill_between(datas, compost_acum, aterro_acum,
+                    color='lightgreen', alpha=0.4, label='Redução - Compostagem Tradicional')
+    
+    # Área da vermicompostagem (maior - mais destacada)
+    ax.fill_between(datas, vermi_acum, aterro_acum,
+                    color='lightblue', alpha=0.7, hatch='///', 
+                    label='Redução - Compostagem com Minhocas (Maior Redução)')
+    
+    ax.set_title(f'Redução de Emissões Acumulada em {anos_simulacao} Anos - Cervejaria')
+    ax.set_xlabel('Ano')
+    ax.set_ylabel('tCO₂eq Acumulado')
+    ax.legend(loc='upper left')
+    ax.grid(True, linestyle='--', alpha=0.7)
+    ax.yaxis.set_major_formatter(FuncFormatter(br_format))
+    return figura_para_png(fig)
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def grafico_vpl(vpl_brl, titulo):
+    fig, ax = plt.subplots(figsize=(6, 5))
+    sns.heatmap(vpl_brl.iloc[::-1], cmap='YlGn', ax=ax, cbar_kws={'label': 'VPL (mil R$)'})
+    ax.set_title(titulo, fontsize=10)
+    ax.set_xlabel('Câmbio EUR/BRL')
+    ax.set_ylabel('Preço do carbono (€/tCO₂eq)')
+    return figura_para_png(fig)
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def grafico_cenarios(anuais, rotulos):
+    # Redução acumulada por cenário, uma curva por cenário em cada método
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(12, 5), sharey=True)
+    for cenario, rotulo in enumerate(rotulos):
+        dados = anuais[anuais['cenario'] == cenario]
+        ax1.plot(dados['ano'], dados['reducao_compost_tco2eq'].cumsum(), label=rotulo)
+        ax2.plot(dados['ano'], dados['reducao_vermi_tco2eq'].cumsum(), label=rotulo)
+
+    ax1.set_title('Compostagem Tradicional')
+    ax2.set_title('Compostagem em Reatores Com Minhocas')
+    for ax in (ax1, ax2):
+        ax.set_xlabel('Ano')
+        ax.grid(True, linestyle='--', alpha=0.7)
+        ax.yaxis.set_major_formatter(FuncFormatter(br_format))
+    ax1.set_ylabel('Redução acumulada (t CO₂eq)')
+    ax2.legend(title='Cenário', fontsize=7, bbox_to_anchor=(1.02, 1), loc='upper left')
+    return figura_para_png(fig)
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def grafico_sobol(sensibilidade_df, titulo):
+    fig, ax = plt.subplots(figsize=(10, 6))
+    sns.barplot(x='ST', y='Parâmetro', data=sensibilidade_df, palette='viridis', ax=ax)
+    ax.set_title(titulo)
+    ax.set_xlabel('Índice ST')
+    ax.set_ylabel('')
+    ax.grid(axis='x', linestyle='--', alpha=0.7)
+    return figura_para_png(fig)
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def grafico_monte_carlo(resultados, cor, titulo):
+    media = np.mean(resultados)
+    intervalo_95 = np.percentile(resultados, [2.5, 97.5])
+
+    fig, ax = plt.subplots(figsize=(10, 6))
+    sns.histplot(resultados, kde=True, bins=30, color=cor, ax=ax)
+    ax.axvline(media, color='red', linestyle='--', 
+               label=f'Média: {formatar_br(media)} tCO₂eq')
+    ax.axvline(intervalo_95[0], color='green', linestyle=':', label='IC 95%')
+    ax.axvline(intervalo_95[1], color='green', linestyle=':')
+    ax.set_title(titulo)
+    ax.set_xlabel('Emissões Evitadas (tCO₂eq)')
+    ax.set_ylabel('Frequência')
+    ax.legend()
+    ax.grid(alpha=0.3)
+    ax.xaxis.set_major_formatter(br_format)
+    return figura_para_png(fig)
 
 # =============================================================================
 # EXECUÇÃO DA SIMULAÇÃO PARA CERVEJARIAS
 # =============================================================================
 
 if st.session_state.get('run_simulation', False):
-    with st.spinner('Executando simulação para cervejaria...'):
-        params_base = [umidade, temperatura, DOC]
-
-        ch4_aterro_dia, n2o_aterro_dia = calcular_emissoes_aterro(params_base)
-        ch4_compost_dia, n2o_compost_dia = calcular_emissoes_compostagem_cervejaria(params_base)
-        ch4_vermi_dia, n2o_vermi_dia = calcular_emissoes_vermicompostagem_cervejaria(params_base)
-
-        # Construir DataFrame
-        df = pd.DataFrame({
-            'Data': datas,
-            'CH4_Aterro_kg_dia': ch4_aterro_dia,
-            'N2O_Aterro_kg_dia': n2o_aterro_dia,
-            'CH4_Compost_kg_dia': ch4_compost_dia,
-            'N2O_Compost_kg_dia': n2o_compost_dia,
-            'CH4_Vermi_kg_dia': ch4_vermi_dia,
-            'N2O_Vermi_kg_dia': n2o_vermi_dia,
-        })
-
-        for gas in ['CH4_Aterro', 'N2O_Aterro', 'CH4_Compost', 'N2O_Compost', 'CH4_Vermi', 'N2O_Vermi']:
-            df[f'{gas}_tCO2eq'] = df[f'{gas}_kg_dia'] * (GWP_CH4_20 if 'CH4' in gas else GWP_N2O_20) / 1000
-
-        df['Total_Aterro_tCO2eq_dia'] = df['CH4_Aterro_tCO2eq'] + df['N2O_Aterro_tCO2eq']
-        df['Total_Compost_tCO2eq_dia'] = df['CH4_Compost_tCO2eq'] + df['N2O_Compost_tCO2eq']
-        df['Total_Vermi_tCO2eq_dia'] = df['CH4_Vermi_tCO2eq'] + df['N2O_Vermi_tCO2eq']
-
-        df['Total_Aterro_tCO2eq_acum'] = df['Total_Aterro_tCO2eq_dia'].cumsum()
-        df['Total_Compost_tCO2eq_acum'] = df['Total_Compost_tCO2eq_dia'].cumsum()
-        df['Total_Vermi_tCO2eq_acum'] = df['Total_Vermi_tCO2eq_dia'].cumsum()
-        
-        df['Reducao_Compost_tCO2eq_acum'] = df['Total_Aterro_tCO2eq_acum'] - df['Total_Compost_tCO2eq_acum']
-        df['Reducao_Vermi_tCO2eq_acum'] = df['Total_Aterro_tCO2eq_acum'] - df['Total_Vermi_tCO2eq_acum']
-
-        # Resumo anual
-        df['Year'] = df['Data'].dt.year
-        df_anual = df.groupby('Year').agg({
-            'Total_Aterro_tCO2eq_dia': 'sum',
-            'Total_Compost_tCO2eq_dia': 'sum',
-            'Total_Vermi_tCO2eq_dia': 'sum',
-        }).reset_index()
-
-        df_anual['Emission reductions Compost (t CO₂eq)'] = df_anual['Total_Aterro_tCO2eq_dia'] - df_anual['Total_Compost_tCO2eq_dia']
-        df_anual['Emission reductions Vermi (t CO₂eq)'] = df_anual['Total_Aterro_tCO2eq_dia'] - df_anual['Total_Vermi_tCO2eq_dia']
-        df_anual['Cumulative reduction Compost (t CO₂eq)'] = df_anual['Emission reductions Compost (t CO₂eq)'].cumsum()
-        df_anual['Cumulative reduction Vermi (t CO₂eq)'] = df_anual['Emission reductions Vermi (t CO₂eq)'].cumsum()
-
-        df_anual.rename(columns={
-            'Total_Aterro_tCO2eq_dia': 'Baseline emissions (t CO₂eq)',
-            'Total_Compost_tCO2eq_dia': 'Project emissions Compost (t CO₂eq)',
-            'Total_Vermi_tCO2eq_dia': 'Project emissions Vermi (t CO₂eq)',
-        }, inplace=True)
-
-        # =============================================================================
-        # EXIBIÇÃO DOS RESULTADOS
-        # =============================================================================
-
-        st.header("📈 Resultados da Simulação - Cervejaria")
-        
-        # Obter valores totais
-        total_evitado_compost = df['Reducao_Compost_tCO2eq_acum'].iloc[-1]
-        total_evitado_vermi = df['Reducao_Vermi_tCO2eq_acum'].iloc[-1]
-        
-        # Obter preço do carbono
-        preco_carbono = st.session_state.preco_carbono
-        moeda = st.session_state.moeda_carbono
-        taxa_cambio = st.session_state.taxa_cambio
-        fonte_cotacao = st.session_state.fonte_cotacao
-        
-        # Calcular valores financeiros
-        valor_compost_eur = calcular_valor_creditos(total_evitado_compost, preco_carbono, moeda)
-        valor_vermi_eur = calcular_valor_creditos(total_evitado_vermi, preco_carbono, moeda)
-        valor_compost_brl = calcular_valor_creditos(total_evitado_compost, preco_carbono, "R$", taxa_cambio)
-        valor_vermi_brl = calcular_valor_creditos(total_evitado_vermi, preco_carbono, "R$", taxa_cambio)
-        
-        # SEÇÃO: VALOR FINANCEIRO
-        st.subheader("💰 Valor Financeiro das Emissões Evitadas")
-        
-        # Primeira linha: Euros
-        col1, col2, col3 = st.columns(3)
-        with col1:
-            st.metric(
-                f"Preço Carbono (Euro)", 
-                f"{moeda} {preco_carbono:.2f}/tCO₂eq",
-                help=f"Fonte: {fonte_cotacao}"
-            )
-        with col2:
-            st.metric(
-                "Valor Compostagem (Euro)", 
-                f"{moeda} {formatar_br(valor_compost_eur)}",
-                help=f"Baseado em {formatar_br(total_evitado_compost)} tCO₂eq evitadas"
-            )
-        with col3:
-            st.metric(
-                "Valor Compostagem em Reatores Com Minhocas (Euro)", 
-                f"{moeda} {formatar_br(valor_vermi_eur)}",
-                help=f"Baseado em {formatar_br(total_evitado_vermi)} tCO₂eq evitadas"
-            )
-        
-        # Segunda linha: Reais
-        col1, col2, col3 = st.columns(3)
-        with col1:
-            st.metric(
-                f"Preço Carbono (R$)", 
-                f"R$ {formatar_br(preco_carbono * taxa_cambio)}/tCO₂eq",
-                help="Preço do carbono convertido para Reais"
-            )
-        with col2:
-            st.metric(
-                "Valor Compostagem (R$)", 
-                f"R$ {formatar_br(valor_compost_brl)}",
-                help=f"Baseado em {formatar_br(total_evitado_compost)} tCO₂eq evitadas"
-            )
-        with col3:
-            st.metric(
-                "Valor Compostagem em Reatores Com Minhocas (R$)", 
-                f"R$ {formatar_br(valor_vermi_brl)}",
-                help=f"Baseado em {formatar_br(total_evitado_vermi)} tCO₂eq evitadas"
-            )
+    with cronometrar('resultado_diario'):
+        resultado = calcular_resultado_diario(cervejaria, data_inicio, 'float32' if series_float32 else 'float64')
+    df_anual = resultado.resumo_anual()
 
-        # RESUMO DAS EMISSÕES EVITADAS
-        st.subheader("📊 Resumo das Emissões Evitadas")
-        
-        media_anual_compost = total_evitado_compost / anos_simulacao
-        media_anual_vermi = total_evitado_vermi / anos_simulacao
-        
-        col1, col2 = st.columns(2)
-        with col1:
-            st.markdown("#### 🍂 Compostagem Tradicional")
-            st.metric(
-                "Total de emissões evitadas", 
-                f"{formatar_br(total_evitado_compost)} tCO₂eq",
-                help=f"Total acumulado em {anos_simulacao} anos"
-            )
-            st.metric(
-                "Média anual", 
-                f"{formatar_br(media_anual_compost)} tCO₂eq/ano",
-                help="Emissões evitadas por ano em média"
-            )
+    # =============================================================================
+    # EXIBIÇÃO DOS RESULTADOS
+    # =============================================================================
 
-        with col2:
-            st.markdown("#### 🐛 Compostagem em Reatores Com Minhocas")
-            st.metric(
-                "Total de emissões evitadas", 
-                f"{formatar_br(total_evitado_vermi)} tCO₂eq",
-                help=f"Total acumulado em {anos_simulacao} anos"
-            )
-            st.metric(
-                "Média anual", 
-                f"{formatar_br(media_anual_vermi)} tCO₂eq/ano",
-                help="Emissões evitadas por ano em média"
+    st.header("📈 Resultados da Simulação - Cervejaria")
+    
+    # Obter valores totais
+    total_evitado_compost = resultado.total_evitado('Compost')
+    total_evitado_vermi = resultado.total_evitado('Vermi')
+    
+    # Obter preço do carbono
+    preco_carbono = st.session_state.preco_carbono
+    moeda = st.session_state.moeda_carbono
+    taxa_cambio = st.session_state.taxa_cambio
+    fonte_cotacao = st.session_state.fonte_cotacao
+    
+    # Calcular valores financeiros
+    valor_compost_eur = calcular_valor_creditos(total_evitado_compost, preco_carbono, moeda)
+    valor_vermi_eur = calcular_valor_creditos(total_evitado_vermi, preco_carbono, moeda)
+    valor_compost_brl = calcular_valor_creditos(total_evitado_compost, preco_carbono, "R$", taxa_cambio)
+    valor_vermi_brl = calcular_valor_creditos(total_evitado_vermi, preco_carbono, "R$", taxa_cambio)
+    
+    # SEÇÃO: VALOR FINANCEIRO
+    st.subheader("💰 Valor Financeiro das Emissões Evitadas")
+    
+    # Primeira linha: Euros
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric(
+            f"Preço Carbono (Euro)", 
+            f"{moeda} {preco_carbono:.2f}/tCO₂eq",
+            help=f"Fonte: {fonte_cotacao}"
+        )
+    with col2:
+        st.metric(
+            "Valor Compostagem (Euro)", 
+            f"{moeda} {formatar_br(valor_compost_eur)}",
+            help=f"Baseado em {formatar_br(total_evitado_compost)} tCO₂eq evitadas"
+        )
+    with col3:
+        st.metric(
+            "Valor Compostagem em Reatores Com Minhocas (Euro)", 
+            f"{moeda} {formatar_br(valor_vermi_eur)}",
+            help=f"Baseado em {formatar_br(total_evitado_vermi)} tCO₂eq evitadas"
+        )
+    
+    # Segunda linha: Reais
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric(
+            f"Preço Carbono (R$)", 
+            f"R$ {formatar_br(preco_carbono * taxa_cambio)}/tCO₂eq",
+            help="Preço do carbono convertido para Reais"
+        )
+    with col2:
+        st.metric(
+            "Valor Compostagem (R$)", 
+            f"R$ {formatar_br(valor_compost_brl)}",
+            help=f"Baseado em {formatar_br(total_evitado_compost)} tCO₂eq evitadas"
+        )
+    with col3:
+        st.metric(
+            "Valor Compostagem em Reatores Com Minhocas (R$)", 
+            f"R$ {formatar_br(valor_vermi_brl)}",
+            help=f"Baseado em {formatar_br(total_evitado_vermi)} tCO₂eq evitadas"
+        )
+
+    # SENSIBILIDADE AO PREÇO DO CARBONO (só a camada financeira; emissões vêm do cache)
+    st.subheader("💹 Sensibilidade ao Preço do Carbono")
+    precos_grade = np.linspace(faixa_precos[0], faixa_precos[1], 13)
+    cambios_grade = np.linspace(faixa_cambios[0], faixa_cambios[1], 9)
+    descontos_grade = np.array([0.0, 0.04, 0.08, 0.12, taxa_desconto / 100])
+    cenarios = valorar_cenarios_precos({
+        'compostagem': df_anual['Emission reductions Compost (t CO₂eq)'].to_numpy(),
+        'vermicompostagem': df_anual['Emission reductions Vermi (t CO₂eq)'].to_numpy(),
+    }, precos_grade, cambios_grade, descontos_grade)
+
+    col1, col2 = st.columns(2)
+    for coluna, metodo, titulo in [(col1, 'compostagem', 'Compostagem Tradicional'),
+                                   (col2, 'vermicompostagem', 'Compostagem em Reatores Com Minhocas')]:
+        with coluna:
+            vpl_brl = pd.DataFrame(
+                cenarios[metodo]['vpl_brl'][:, :, -1] / 1000,
+                index=[f"{p:.0f}" for p in precos_grade],
+                columns=[f"{c:.2f}".replace(".", ",") for c in cambios_grade],
             )
+            exibir_grafico(f'vpl_{metodo}', grafico_vpl, vpl_brl,
+                           f'VPL a {formatar_br(taxa_desconto)}% a.a. - {titulo}', aberto=False)
+
+    vpl_eur_por_desconto = pd.DataFrame({
+        'Preço (€/tCO₂eq)': precos_grade,
+        **{f'Compostagem - {formatar_br(d * 100)}%': cenarios['compostagem']['vpl_eur'][:, i]
+           for i, d in enumerate(descontos_grade[:-1])},
+        **{f'Minhocas - {formatar_br(d * 100)}%': cenarios['vermicompostagem']['vpl_eur'][:, i]
+           for i, d in enumerate(descontos_grade[:-1])},
+    })
+    with st.expander("📋 VPL em euros por taxa de desconto"):
+        st.dataframe(vpl_eur_por_desconto.set_index('Preço (€/tCO₂eq)').apply(lambda coluna: coluna.map(formatar_br)))
+
+    # RESUMO DAS EMISSÕES EVITADAS
+    st.subheader("📊 Resumo das Emissões Evitadas")
+    
+    media_anual_compost = total_evitado_compost / anos_simulacao
+    media_anual_vermi = total_evitado_vermi / anos_simulacao
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        st.markdown("#### 🍂 Compostagem Tradicional")
+        st.metric(
+            "Total de emissões evitadas", 
+            f"{formatar_br(total_evitado_compost)} tCO₂eq",
+            help=f"Total acumulado em {anos_simulacao} anos"
+        )
+        st.metric(
+            "Média anual", 
+            f"{formatar_br(media_anual_compost)} tCO₂eq/ano",
+            help="Emissões evitadas por ano em média"
+        )
 
-        # GRÁFICO COMPARATIVO ANUAL
-        st.subheader("📊 Comparação Anual das Emissões Evitadas")
-        df_evitadas_anual = pd.DataFrame({
-            'Year': df_anual['Year'],
-            'Compostagem Tradicional': df_anual['Emission reductions Compost (t CO₂eq)'],
-            'Compostagem em Reatores Com Minhocas': df_anual['Emission reductions Vermi (t CO₂eq)']
-        })
-
-        fig, ax = plt.subplots(figsize=(10, 6))
-        br_formatter = FuncFormatter(br_format)
-        x = np.arange(len(df_evitadas_anual['Year']))
-        bar_width = 0.35
-
-        ax.bar(x - bar_width/2, df_evitadas_anual['Compostagem Tradicional'], width=bar_width,
-                label='Compostagem Tradicional', edgecolor='black')
-        ax.bar(x + bar_width/2, df_evitadas_anual['Compostagem em Reatores Com Minhocas'], width=bar_width,
-                label='Compostagem em Reatores Com Minhocas', edgecolor='black', hatch='//')
-
-        # Adicionar valores formatados em cima das barras
-        for i, (v1, v2) in enumerate(zip(df_evitadas_anual['Compostagem Tradicional'], 
-                                         df_evitadas_anual['Compostagem em Reatores Com Minhocas'])):
-            ax.text(i - bar_width/2, v1 + max(v1, v2)*0.01, 
-                    formatar_br(v1), ha='center', fontsize=9, fontweight='bold')
-            ax.text(i + bar_width/2, v2 + max(v1, v2)*0.01, 
-                    formatar_br(v2), ha='center', fontsize=9, fontweight='bold')
+    with col2:
+        st.markdown("#### 🐛 Compostagem em Reatores Com Minhocas")
+        st.metric(
+            "Total de emissões evitadas", 
+            f"{formatar_br(total_evitado_vermi)} tCO₂eq",
+            help=f"Total acumulado em {anos_simulacao} anos"
+        )
+        st.metric(
+            "Média anual", 
+            f"{formatar_br(media_anual_vermi)} tCO₂eq/ano",
+            help="Emissões evitadas por ano em média"
+        )
 
-        ax.set_xlabel('Ano')
-        ax.set_ylabel('Emissões Evitadas (t CO₂eq)')
-        ax.set_title('Comparação Anual das Emissões Evitadas: Compostagem Tradicional vs Compostagem em Reatores Com Minhocas')
-        
-        ax.set_xticks(x)
-        ax.set_xticklabels(df_anual['Year'], fontsize=8)
+    # GRÁFICO COMPARATIVO ANUAL
+    st.subheader("📊 Comparação Anual das Emissões Evitadas")
+    exibir_grafico(
+        'comparacao_anual', grafico_comparacao_anual,
+        df_anual['Year'].to_numpy(),
+        df_anual['Emission reductions Compost (t CO₂eq)'].to_numpy(),
+        df_anual['Emission reductions Vermi (t CO₂eq)'].to_numpy(),
+    )
 
-        ax.legend(title='Método de Tratamento')
-        ax.yaxis.set_major_formatter(br_formatter)
-        ax.grid(axis='y', linestyle='--', alpha=0.7)
-        st.pyplot(fig)
+    # GRÁFICO DE REDUÇÃO ACUMULADA - AJUSTADO CONFORME SOLICITADO (SEM ANOTAÇÕES)
+    st.subheader("📉 Redução de Emissões Acumulada")
+    indices = indices_decimados(resultado.dias)
+    exibir_grafico(
+        'reducao_acumulada', grafico_reducao_acumulada,
+        resultado.datas.to_numpy()[indices],
+        resultado.acumulado('Aterro')[indices],
+        resultado.acumulado('Compost')[indices],
+        resultado.acumulado('Vermi')[indices],
+        anos_simulacao,
+    )
 
-        # GRÁFICO DE REDUÇÃO ACUMULADA - AJUSTADO CONFORME SOLICITADO (SEM ANOTAÇÕES)
-        st.subheader("📉 Redução de Emissões Acumulada")
-        fig, ax = plt.subplots(figsize=(10, 6))
-        
-        # Plotar apenas o cenário base e as áreas de redução
-        ax.plot(df['Data'], df['Total_Aterro_tCO2eq_acum'], 'r-', 
-                label='Cenário Base (Aterro Sanitário)', linewidth=3)
-        
-        # Área da compostagem tradicional (menor)
-        ax.fill_between(df['Data'], df['Total_Compost_tCO2eq_acum'], df['Total_Aterro_tCO2eq_acum'],
-                        color='lightgreen', alpha=0.4, label='Redução - Compostagem Tradicional')
-        
-        # Área da vermicompostagem (maior - mais destacada)
-        ax.fill_between(df['Data'], df['Total_Vermi_tCO2eq_acum'], df['Total_Aterro_tCO2eq_acum'],
-                        color='lightblue', alpha=0.7, hatch='///', 
-                        label='Redução - Compostagem com Minhocas (Maior Redução)')
-        
-        ax.set_title(f'Redução de Emissões Acumulada em {anos_simulacao} Anos - Cervejaria')
-        ax.set_xlabel('Ano')
-        ax.set_ylabel('tCO₂eq Acumulado')
-        ax.legend(loc='upper left')
-        ax.grid(True, linestyle='--', alpha=0.7)
-        ax.yaxis.set_major_formatter(br_formatter)
-        
-        st.pyplot(fig)
+    # ETAPAS PESADAS: o Monte Carlo já começa em segundo plano enquanto as seções de Sobol são
+    # exibidas; cada seção só espera pela própria etapa, com barra de progresso e cancelamento
+    etapa_mc = etapa_monte_carlo()
+    iniciar_etapa(*etapa_mc)
 
-        # ANÁLISE DE SENSIBILIDADE - COMPOSTAGEM
-        st.subheader("🎯 Análise de Sensibilidade Global (Sobol) - Compostagem")
-        
-        problem_compost = {
-            'num_vars': 3,
-            'names': ['umidade', 'T', 'DOC'],
-            'bounds': [
-                [0.75, 0.90],    # Umidade para cervejaria
-                [20.0, 35.0],    # Temperatura
-                [0.70, 0.90],    # DOC para cervejaria
-            ]
-        }
-
-        param_values_compost = sample(problem_compost, n_samples)
-        results_compost = Parallel(n_jobs=-1)(
-            delayed(executar_simulacao_completa_cervejaria)(params) for params in param_values_compost
-        )
-        Si_compost = analyze(problem_compost, np.array(results_compost), print_to_console=False)
+    # ANÁLISE DE SENSIBILIDADE - COMPOSTAGEM
+    st.subheader("🎯 Análise de Sensibilidade Global (Sobol) - Compostagem")
+    
+    problem_compost = PROBLEMA_SOBOL_CERVEJARIA
+
+    # Sobol só alimenta este gráfico: sem a seção aberta, nada é calculado
+    resultado_sobol = None
+    if st.toggle("Mostrar gráfico", value=False, key='mostrar_sobol_compostagem'):
+        resultado_sobol = executar_etapa(*etapa_sobol('compostagem'))
+    if resultado_sobol is not None:
+        Si_compost, tempos_compost, avaliacoes_compost, convergencia_compost = resultado_sobol
         
         sensibilidade_df_compost = pd.DataFrame({
             'Parâmetro': problem_compost['names'],
@@ -862,32 +953,22 @@ if st.session_state.get('run_simulation', False):
             'ST': Si_compost['ST']
         }).sort_values('ST', ascending=False)
 
-        fig, ax = plt.subplots(figsize=(10, 6))
-        sns.barplot(x='ST', y='Parâmetro', data=sensibilidade_df_compost, palette='viridis', ax=ax)
-        ax.set_title('Sensibilidade Global dos Parâmetros - Compostagem')
-        ax.set_xlabel('Índice ST')
-        ax.set_ylabel('')
-        ax.grid(axis='x', linestyle='--', alpha=0.7)
-        st.pyplot(fig)
+        st.image(grafico_sobol(sensibilidade_df_compost, 'Sensibilidade Global dos Parâmetros - Compostagem'))
+        st.caption(formatar_tempos_sobol(tempos_compost, avaliacoes_compost))
+        if convergencia_compost is not None:
+            st.caption(formatar_convergencia_sobol(convergencia_compost))
 
-        # ANÁLISE DE SENSIBILIDADE - VERMICOMPOSTAGEM
-        st.subheader("🎯 Análise de Sensibilidade Global (Sobol) - Compostagem em Reatores Com Minhocas")
-        
-        problem_vermi = {
-            'num_vars': 3,
-            'names': ['umidade', 'T', 'DOC'],
-            'bounds': [
-                [0.75, 0.90],    # Umidade para cervejaria
-                [20.0, 35.0],    # Temperatura
-                [0.70, 0.90],    # DOC para cervejaria
-            ]
-        }
-
-        param_values_vermi = sample(problem_vermi, n_samples)
-        results_vermi = Parallel(n_jobs=-1)(
-            delayed(executar_simulacao_vermicompostagem_cervejaria)(params) for params in param_values_vermi
-        )
-        Si_vermi = analyze(problem_vermi, np.array(results_vermi), print_to_console=False)
+    # ANÁLISE DE SENSIBILIDADE - VERMICOMPOSTAGEM
+    st.subheader("🎯 Análise de Sensibilidade Global (Sobol) - Compostagem em Reatores Com Minhocas")
+    
+    problem_vermi = PROBLEMA_SOBOL_CERVEJARIA
+
+    # Sobol só alimenta este gráfico: sem a seção aberta, nada é calculado
+    resultado_sobol = None
+    if st.toggle("Mostrar gráfico", value=False, key='mostrar_sobol_vermicompostagem'):
+        resultado_sobol = executar_etapa(*etapa_sobol('vermicompostagem'))
+    if resultado_sobol is not None:
+        Si_vermi, tempos_vermi, avaliacoes_vermi, convergencia_vermi = resultado_sobol
         
         sensibilidade_df_vermi = pd.DataFrame({
             'Parâmetro': problem_vermi['names'],
@@ -895,114 +976,86 @@ if st.session_state.get('run_simulation', False):
             'ST': Si_vermi['ST']
         }).sort_values('ST', ascending=False)
 
-        fig, ax = plt.subplots(figsize=(10, 6))
-        sns.barplot(x='ST', y='Parâmetro', data=sensibilidade_df_vermi, palette='viridis', ax=ax)
-        ax.set_title('Sensibilidade Global dos Parâmetros - Compostagem em Reatores Com Minhocas')
-        ax.set_xlabel('Índice ST')
-        ax.set_ylabel('')
-        ax.grid(axis='x', linestyle='--', alpha=0.7)
-        st.pyplot(fig)
+        st.image(grafico_sobol(sensibilidade_df_vermi, 'Sensibilidade Global dos Parâmetros - Compostagem em Reatores Com Minhocas'))
+        st.caption(formatar_tempos_sobol(tempos_vermi, avaliacoes_vermi))
+        if convergencia_vermi is not None:
+            st.caption(formatar_convergencia_sobol(convergencia_vermi))
+
+    # MONTE CARLO (no modo adaptativo, lotes pareados com o traço de convergência ao vivo)
+    if mc_adaptativo:
+        st.subheader("📉 Convergência do Monte Carlo")
+    else:
+        st.subheader("🎲 Análise de Incerteza (Monte Carlo)")
+    resultado_mc = executar_etapa(
+        *etapa_mc, exibir_parcial=lambda historico: st.line_chart(tabela_convergencia_mc(historico))
+    )
+
+    if resultado_mc is not None:
+        results_array_compost, results_array_vermi, comparacao, convergencia_mc = resultado_mc
+        if convergencia_mc is not None:
+            st.line_chart(tabela_convergencia_mc(convergencia_mc['historico']))
+            st.caption(formatar_convergencia_mc(convergencia_mc))
 
         # ANÁLISE DE INCERTEZA - COMPOSTAGEM (CORRIGIDA)
         st.subheader("🎲 Análise de Incerteza (Monte Carlo) - Compostagem")
         
-        def gerar_parametros_mc_compost(n):
-            np.random.seed(50)  # Seed para compostagem tradicional
-            umidade_vals = np.random.uniform(0.75, 0.90, n)
-            temp_vals = np.random.normal(25, 3, n)
-            doc_vals = np.random.triangular(0.70, 0.80, 0.90, n)
-            return umidade_vals, temp_vals, doc_vals
-
-        umidade_vals, temp_vals, doc_vals = gerar_parametros_mc_compost(n_simulations)
-        
-        results_mc_compost = []
-        for i in range(n_simulations):
-            params = [umidade_vals[i], temp_vals[i], doc_vals[i]]
-            results_mc_compost.append(executar_simulacao_completa_cervejaria(params))
-
-        results_array_compost = np.array(results_mc_compost)
         media_compost = np.mean(results_array_compost)
-        intervalo_95_compost = np.percentile(results_array_compost, [2.5, 97.5])
-
-        fig, ax = plt.subplots(figsize=(10, 6))
-        sns.histplot(results_array_compost, kde=True, bins=30, color='skyblue', ax=ax)
-        ax.axvline(media_compost, color='red', linestyle='--', 
-                   label=f'Média: {formatar_br(media_compost)} tCO₂eq')
-        ax.axvline(intervalo_95_compost[0], color='green', linestyle=':', label='IC 95%')
-        ax.axvline(intervalo_95_compost[1], color='green', linestyle=':')
-        ax.set_title('Distribuição das Emissões Evitadas - Compostagem')
-        ax.set_xlabel('Emissões Evitadas (tCO₂eq)')
-        ax.set_ylabel('Frequência')
-        ax.legend()
-        ax.grid(alpha=0.3)
-        ax.xaxis.set_major_formatter(br_format)
-        st.pyplot(fig)
+
+        exibir_grafico('monte_carlo_compost', grafico_monte_carlo, results_array_compost, 'skyblue',
+                       'Distribuição das Emissões Evitadas - Compostagem', aberto=False)
 
         # ANÁLISE DE INCERTEZA - VERMICOMPOSTAGEM (CORRIGIDA COM SEED DIFERENTE)
         st.subheader("🎲 Análise de Incerteza (Monte Carlo) - Compostagem em Reatores Com Minhocas")
         
-        def gerar_parametros_mc_vermi(n):
-            np.random.seed(51)  # SEED DIFERENTE para vermicompostagem!
-            umidade_vals = np.random.uniform(0.78, 0.88, n)  # Faixa mais estreita
-            temp_vals = np.random.normal(28, 2, n)  # Temperatura ideal para minhocas
-            doc_vals = np.random.triangular(0.75, 0.82, 0.88, n)  # DOC mais alto
-            return umidade_vals, temp_vals, doc_vals
-
-        umidade_vals, temp_vals, doc_vals = gerar_parametros_mc_vermi(n_simulations)
-        
-        results_mc_vermi = []
-        for i in range(n_simulations):
-            params = [umidade_vals[i], temp_vals[i], doc_vals[i]]
-            results_mc_vermi.append(executar_simulacao_vermicompostagem_cervejaria(params))
-
-        results_array_vermi = np.array(results_mc_vermi)
         media_vermi = np.mean(results_array_vermi)
-        intervalo_95_vermi = np.percentile(results_array_vermi, [2.5, 97.5])
-
-        fig, ax = plt.subplots(figsize=(10, 6))
-        sns.histplot(results_array_vermi, kde=True, bins=30, color='coral', ax=ax)
-        ax.axvline(media_vermi, color='red', linestyle='--', 
-                   label=f'Média: {formatar_br(media_vermi)} tCO₂eq')
-        ax.axvline(intervalo_95_vermi[0], color='green', linestyle=':', label='IC 95%')
-        ax.axvline(intervalo_95_vermi[1], color='green', linestyle=':')
-        ax.set_title('Distribuição das Emissões Evitadas - Compostagem em Reatores Com Minhocas')
-        ax.set_xlabel('Emissões Evitadas (tCO₂eq)')
-        ax.set_ylabel('Frequência')
-        ax.legend()
-        ax.grid(alpha=0.3)
-        ax.xaxis.set_major_formatter(br_format)
-        st.pyplot(fig)
 
+        exibir_grafico('monte_carlo_vermi', grafico_monte_carlo, results_array_vermi, 'coral',
+                       'Distribuição das Emissões Evitadas - Compostagem em Reatores Com Minhocas', aberto=False)
+
+    # AMOSTRAS NECESSÁRIAS POR AMOSTRADOR (calculado só com a seção aberta)
+    st.subheader("📏 Amostras Necessárias por Amostrador")
+    if st.toggle("Comparar amostradores", value=False, key='mostrar_amostras_necessarias'):
+        largura_alvo = st.slider("Largura máxima do IC dos percentis 2,5%/97,5% (% da média)", 0.5, 5.0, 1.0, 0.5)
+        col1, col2 = st.columns(2)
+        for coluna, metodo, titulo in [(col1, 'compostagem', 'Compostagem Tradicional'),
+                                       (col2, 'vermicompostagem', 'Compostagem em Reatores Com Minhocas')]:
+            with coluna:
+                st.markdown(f"**{titulo}**")
+                relatorio = amostras_necessarias_em_cache(metodo, cervejaria, largura_alvo / 100)
+                st.dataframe(pd.DataFrame({
+                    'Amostrador': relatorio['amostrador'].map(NOMES_AMOSTRADORES),
+                    'Simulações necessárias': relatorio['n_necessario'].map(
+                        lambda n: f"{int(n)}" if pd.notna(n) else "> 8192"),
+                    'Largura obtida (% da média)': (relatorio['largura_relativa'] * 100).round(2),
+                }), hide_index=True)
+        st.caption("Largura do IC 95% dos percentis estimada com 20 réplicas independentes por tamanho (potências de dois).")
+
+    # Testes pareados sobre os resultados do Monte Carlo (ausentes se a etapa foi cancelada)
+    if resultado_mc is not None:
         # ANÁLISE ESTATÍSTICA DE COMPARAÇÃO (AGORA COM RESULTADOS DIFERENTES)
         st.subheader("📊 Análise Estatística de Comparação")
-        
-        # Teste de normalidade para as diferenças
-        diferencas = results_array_compost - results_array_vermi
-        _, p_valor_normalidade_diff = stats.normaltest(diferencas)
-        
-        # Teste T pareado
-        ttest_pareado, p_ttest_pareado = stats.ttest_rel(results_array_compost, results_array_vermi)
-        
-        # Teste de Wilcoxon para amostras pareadas
-        wilcoxon_stat, p_wilcoxon = stats.wilcoxon(results_array_compost, results_array_vermi)
+    
+        p_valor_normalidade_diff = comparacao['p_normalidade']
+        ttest_pareado, p_ttest_pareado = comparacao['ttest'], comparacao['p_ttest']
+        wilcoxon_stat, p_wilcoxon = comparacao['wilcoxon'], comparacao['p_wilcoxon']
 
         # Exibir resultados com formatação melhorada
         col1, col2, col3 = st.columns(3)
-        
+    
         with col1:
             st.metric(
                 "Teste de Normalidade", 
                 f"p = {p_valor_normalidade_diff:.5f}",
                 help="p < 0.05 indica que as diferenças não seguem distribuição normal"
             )
-        
+    
         with col2:
             st.metric(
                 "Teste T Pareado", 
                 f"p = {p_ttest_pareado:.5f}",
                 help="Testa se há diferença significativa entre os métodos"
             )
-        
+    
         with col3:
             st.metric(
                 "Teste de Wilcoxon", 
@@ -1014,35 +1067,111 @@ if st.session_state.get('run_simulation', False):
         with st.expander("🔍 Interpretação dos Resultados Estatísticos"):
             st.markdown(f"""
             **📊 Significado dos Testes Estatísticos:**
-            
+        
             **Teste de Normalidade (p = {p_valor_normalidade_diff:.5f}):**
             - {f"**Diferenças NÃO normais** - Use testes não paramétricos" if p_valor_normalidade_diff < 0.05 else "**Diferenças normais** - Pressuposto atendido"}
-            
+        
             **Teste T Pareado (p = {p_ttest_pareado:.5f}):**
             - {f"**Diferença SIGNIFICATIVA** entre os métodos" if p_ttest_pareado < 0.05 else "**Sem diferença significativa** entre os métodos"}
             - Estatística t = {ttest_pareado:.5f}
-            
+        
             **Teste de Wilcoxon (p = {p_wilcoxon:.5f}):**
             - {f"**Diferença SIGNIFICATIVA** (não paramétrico)" if p_wilcoxon < 0.05 else "**Sem diferença significativa** (não paramétrico)"}
             - Estatística = {wilcoxon_stat:.5f}
-            
+        
             **💡 Conclusão:**
             - Os dois métodos de tratamento produzem resultados **{'DIFERENTES' if p_ttest_pareado < 0.05 else 'SIMILARES'}**
             - A vermicompostagem apresenta **{'vantagem estatisticamente significativa' if p_ttest_pareado < 0.05 and media_vermi > media_compost else 'desempenho similar'}**
             - Confiança nos resultados: **{'ALTA' if p_ttest_pareado < 0.01 else 'MODERADA' if p_ttest_pareado < 0.05 else 'BAIXA'}**
             """)
 
-        # TABELAS DE RESULTADOS
-        st.subheader("📋 Resultados Anuais")
-        df_anual_formatado = df_anual.copy()
-        for col in df_anual_formatado.columns:
-            if col != 'Year':
-                df_anual_formatado[col] = df_anual_formatado[col].apply(formatar_br)
-        st.dataframe(df_anual_formatado)
+    # COMPARAÇÃO DE CENÁRIOS (grade sobre os parâmetros da barra lateral, calculada só com a seção aberta)
+    st.subheader("🧮 Comparação de Cenários")
+    if st.toggle("Comparar cenários", value=False, key='mostrar_cenarios'):
+        campos_grade = st.multiselect("Parâmetros variados", list(CAMPOS_CENARIOS), default=['h_exposta'],
+                                      format_func=CAMPOS_CENARIOS.get)
+        grade = {}
+        colunas = st.columns(max(len(campos_grade), 1))
+        for coluna, campo in zip(colunas, campos_grade):
+            atual = getattr(cervejaria, campo)
+            padrao = "8, 12, 24" if campo == 'h_exposta' else f"{atual:g}"
+            with coluna:
+                texto = st.text_input(CAMPOS_CENARIOS[campo], padrao, key=f'grade_{campo}',
+                                      help="Valores separados por vírgula")
+            try:
+                grade[campo] = ler_valores_grade(campo, texto)
+            except ValueError as erro:
+                st.error(f"Valores inválidos para {CAMPOS_CENARIOS[campo]}: {erro}")
+
+        cenarios = []
+        if grade and len(grade) == len(campos_grade) and all(grade.values()):
+            try:
+                cenarios = grade_cenarios(cervejaria, grade)
+            except ValueError as erro:
+                st.error(str(erro))
+        if len(cenarios) > MAX_CENARIOS:
+            st.warning(f"A grade gera {len(cenarios)} cenários; reduza para no máximo {MAX_CENARIOS}.")
+        elif cenarios:
+            with cronometrar('cenarios'):
+                anuais_cenarios, resumo_cenarios = avaliar_cenarios_em_cache(tuple(cenarios), tuple(grade))
+            rotulos = [rotulo_cenario(cenario, grade) for cenario in cenarios]
+            st.image(grafico_cenarios(anuais_cenarios, rotulos))
+
+            resumo_cenarios[f'Créditos Vermi ({moeda})'] = calcular_valor_creditos(
+                resumo_cenarios['reducao_vermi_tco2eq'], preco_carbono, moeda)
+            resumo_cenarios = resumo_cenarios.rename(columns={
+                **CAMPOS_CENARIOS,
+                'aterro_tco2eq': 'Linha de base (t CO₂eq)',
+                'reducao_compost_tco2eq': 'Redução Compost (t CO₂eq)',
+                'reducao_vermi_tco2eq': 'Redução Vermi (t CO₂eq)',
+            })
+            colunas_valores = ['Linha de base (t CO₂eq)', 'Redução Compost (t CO₂eq)', 'Redução Vermi (t CO₂eq)',
+                               f'Créditos Vermi ({moeda})']
+            resumo_cenarios[colunas_valores] = resumo_cenarios[colunas_valores].apply(
+                lambda coluna: coluna.map(formatar_br))
+            st.dataframe(resumo_cenarios, hide_index=True)
+            st.caption(f"{len(cenarios)} cenários avaliados em lote; a linha de base é compartilhada entre "
+                       "cenários com as mesmas entradas do aterro.")
+
+    # TABELAS DE RESULTADOS
+    st.subheader("📋 Resultados Anuais")
+    df_anual_formatado = df_anual.copy()
+    for col in df_anual_formatado.columns:
+        if col != 'Year':
+            df_anual_formatado[col] = df_anual_formatado[col].apply(formatar_br)
+    st.dataframe(df_anual_formatado)
+
+    with st.expander("📅 Resultados Mensais"):
+        df_mensal_formatado = resultado.resumo_mensal()
+        df_mensal_formatado['Mês'] = df_mensal_formatado['Mês'].dt.strftime('%m/%Y')
+        for col in df_mensal_formatado.columns:
+            if col != 'Mês':
+                df_mensal_formatado[col] = df_mensal_formatado[col].apply(formatar_br)
+        st.dataframe(df_mensal_formatado, hide_index=True)
 
 else:
     st.info("💡 Ajuste os parâmetros da cervejaria na barra lateral e clique em 'Executar Simulação' para ver os resultados.")
 
+# =============================================================================
+# DIAGNÓSTICO (TEMPOS POR FASE)
+# =============================================================================
+
+metricas.registrar_tempo('rerun', time.perf_counter() - inicio_rerun)
+
+with st.sidebar.expander("🩺 Diagnóstico de desempenho"):
+    fases, contadores = metricas.instantaneo()
+    if fases:
+        st.dataframe(pd.DataFrame([
+            {'Fase': nome, 'Chamadas': fase['chamadas'], 'Última (ms)': fase['ultimo_s'] * 1000,
+             'Média (ms)': fase['total_s'] / fase['chamadas'] * 1000, 'Máx. (ms)': fase['max_s'] * 1000}
+            for nome, fase in sorted(fases.items())
+        ]).round(2), hide_index=True)
+    st.dataframe(pd.DataFrame(sorted(contadores.items()), columns=['Evento', 'Total']), hide_index=True)
+    st.caption("Métricas do processo (todas as sessões); Sobol com workers mede só as etapas no processo principal.")
+    st.code(metricas.texto_prometheus(), language='text')
+    if st.button("Zerar métricas"):
+        metricas.zerar()
+
 # Rodapé específico para cervejarias
 st.markdown("---")
 st.markdown("""
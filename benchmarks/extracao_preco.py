@@ -0,0 +1,78 @@
+"""Benchmark da extração do preço do carbono: árvore BeautifulSoup x caminho rápido em bytes.
+
+Uso::
+
+    python benchmarks/extracao_preco.py [pagina1.html pagina2.html ...]
+
+Sem argumentos, usa ``benchmarks/fixtures/*.html`` se existirem; caso contrário,
+gera páginas sintéticas (~300 KB) com o preço nas posições usadas pelo Investing.com.
+Para cada página, confere que os dois caminhos dão o mesmo preço e reporta o
+tempo médio e o pico de memória (tracemalloc) de cada um.
+"""
+
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from simulador_cervejaria.cotacoes import extrair_preco_arvore, extrair_preco_html  # noqa: E402
+
+DIRETORIO_FIXTURES = Path(__file__).resolve().parent / 'fixtures'
+
+
+def _pagina_sintetica(corpo_preco, kb_cabecalho=120, kb_rodape=180):
+    linha = b'<div class="row"><a href="/x">item</a><span class="muted">0,00</span></div>\n'
+    cabecalho = linha * (kb_cabecalho * 1024 // len(linha))
+    rodape = linha * (kb_rodape * 1024 // len(linha))
+    return b'<html><head><title>Carbon</title></head><body>' + cabecalho + corpo_preco + rodape + b'</body></html>'
+
+def paginas_sinteticas():
+    return {
+        'sintetica_data_test': _pagina_sintetica(
+            b'<div class="text-5xl" data-test="instrument-price-last">72.35</div>'),
+        'sintetica_last_last': _pagina_sintetica(
+            b'<span class="arial_26 inlineblock pid-1062510-last" id="last_last" dir="ltr">71.80</span>'),
+        'sintetica_sem_preco': _pagina_sintetica('<p>Indisponível</p>'.encode()),
+    }
+
+def carregar_paginas(caminhos):
+    if not caminhos and DIRETORIO_FIXTURES.is_dir():
+        caminhos = sorted(DIRETORIO_FIXTURES.glob('*.html'))
+    if not caminhos:
+        return paginas_sinteticas()
+    return {Path(c).stem: Path(c).read_bytes() for c in caminhos}
+
+def medir(funcao, conteudo, repeticoes):
+    funcao(conteudo)
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        resultado = funcao(conteudo)
+    tempo_ms = (time.perf_counter() - inicio) / repeticoes * 1000
+
+    tracemalloc.start()
+    funcao(conteudo)
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return resultado, tempo_ms, pico / 1024
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    paginas = carregar_paginas(argv)
+
+    print(f"{'página':<24}{'KB':>8}{'antes (ms)':>12}{'depois (ms)':>13}{'antes (KB)':>12}{'depois (KB)':>13}  preço")
+    divergencias = 0
+    for nome, conteudo in paginas.items():
+        preco_antes, tempo_antes, pico_antes = medir(extrair_preco_arvore, conteudo, 2)
+        preco_depois, tempo_depois, pico_depois = medir(extrair_preco_html, conteudo, 5)
+        if preco_antes != preco_depois:
+            divergencias += 1
+        print(f"{nome:<24}{len(conteudo) / 1024:>8.0f}{tempo_antes:>12.2f}{tempo_depois:>13.2f}"
+              f"{pico_antes:>12.0f}{pico_depois:>13.0f}  {preco_antes} / {preco_depois}")
+
+    return 1 if divergencias else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,148 @@
+"""Benchmark do modelo de emissões e das etapas de sensibilidade e incerteza.
+
+Uso::
+
+    python benchmarks/modelo.py                      # mede e compara com a referência
+    python benchmarks/modelo.py --salvar-referencia  # grava a referência desta máquina
+    python benchmarks/modelo.py --rapido             # só os extremos de cada faixa
+
+Cobre as faixas dos sliders do app: séries diárias (aterro, compostagem,
+vermicompostagem) para 5–50 anos, Sobol para 32–256 amostras e Monte Carlo para
+50–1000 simulações, além do Monte Carlo em fluxo com 10⁴–10⁵ simulações (cujo
+pico de memória deve ficar constante). Para cada caso mede o tempo mediano em regime (após uma
+chamada de aquecimento, ou seja, com os caches de kernels preenchidos) e o pico
+de memória alocada (tracemalloc). Sai com código 1 quando algum caso piora além
+das tolerâncias, e com código 2 quando falta a referência (o arquivo ou algum
+caso medido); nesse caso, rode antes com ``--salvar-referencia``. A referência
+depende da máquina e não é versionada.
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from simulador_cervejaria import (  # noqa: E402
+    ParametrosCervejaria,
+    calcular_emissoes_aterro,
+    calcular_emissoes_compostagem_cervejaria,
+    calcular_emissoes_vermicompostagem_cervejaria,
+)
+from simulador_cervejaria.incerteza import executar_monte_carlo, executar_monte_carlo_streaming  # noqa: E402
+from simulador_cervejaria.sensibilidade import PROBLEMA_SOBOL_CERVEJARIA, executar_analise_sobol  # noqa: E402
+
+REFERENCIA_PADRAO = Path(__file__).resolve().parent / 'referencia_modelo.json'
+
+ANOS = [5, 10, 20, 30, 50]
+AMOSTRAS_SOBOL = [32, 64, 128, 256]
+SIMULACOES_MC = [50, 100, 250, 500, 1000]
+SIMULACOES_MC_STREAMING = [10_000, 100_000]
+
+
+def casos(rapido=False):
+    anos = [ANOS[0], ANOS[-1]] if rapido else ANOS
+    amostras = [AMOSTRAS_SOBOL[0], AMOSTRAS_SOBOL[-1]] if rapido else AMOSTRAS_SOBOL
+    simulacoes = [SIMULACOES_MC[0], SIMULACOES_MC[-1]] if rapido else SIMULACOES_MC
+
+    for n_anos in anos:
+        cervejaria = ParametrosCervejaria(anos_simulacao=n_anos)
+        params = cervejaria.params_base
+        yield f'aterro[anos={n_anos}]', lambda c=cervejaria, p=params: calcular_emissoes_aterro(p, c)
+        yield f'compostagem[anos={n_anos}]', lambda c=cervejaria, p=params: calcular_emissoes_compostagem_cervejaria(p, c)
+        yield f'vermicompostagem[anos={n_anos}]', lambda c=cervejaria, p=params: calcular_emissoes_vermicompostagem_cervejaria(p, c)
+
+    cervejaria = ParametrosCervejaria()
+    for n_samples in amostras:
+        for metodo in ('compostagem', 'vermicompostagem'):
+            yield (f'sobol[{metodo},n={n_samples}]',
+                   lambda n=n_samples, m=metodo: executar_analise_sobol(PROBLEMA_SOBOL_CERVEJARIA, n, m, cervejaria, n_workers=1))
+    for n_simulations in simulacoes:
+        for metodo in ('compostagem', 'vermicompostagem'):
+            yield (f'monte_carlo[{metodo},n={n_simulations}]',
+                   lambda n=n_simulations, m=metodo: executar_monte_carlo(n, m, cervejaria))
+    for n_simulations in SIMULACOES_MC_STREAMING:
+        yield (f'monte_carlo_streaming[n={n_simulations}]',
+               lambda n=n_simulations: executar_monte_carlo_streaming(n, 'compostagem', cervejaria))
+
+def medir(funcao, tempo_minimo=0.2, repeticoes_minimas=5):
+    funcao()  # aquecimento: imports tardios e caches de kernels
+
+    tempos = []
+    inicio_total = time.perf_counter()
+    while len(tempos) < repeticoes_minimas or time.perf_counter() - inicio_total < tempo_minimo:
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - inicio)
+
+    tracemalloc.start()
+    funcao()
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {'tempo_ms': statistics.median(tempos) * 1000, 'pico_kb': pico / 1024, 'repeticoes': len(tempos)}
+
+def comparar(resultados, referencia, tolerancia_tempo, tolerancia_memoria, folga_ms=0.5):
+    # Regressão: pior que a referência × tolerância (com folga absoluta para casos de microssegundos)
+    regressoes = []
+    for nome, medida in resultados.items():
+        anterior = referencia.get(nome)
+        if anterior is None:
+            continue
+        if medida['tempo_ms'] > anterior['tempo_ms'] * tolerancia_tempo + folga_ms:
+            regressoes.append(f"{nome}: tempo {anterior['tempo_ms']:.2f} → {medida['tempo_ms']:.2f} ms")
+        if medida['pico_kb'] > anterior['pico_kb'] * tolerancia_memoria + 64:
+            regressoes.append(f"{nome}: memória {anterior['pico_kb']:.0f} → {medida['pico_kb']:.0f} KB")
+    return regressoes
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark do modelo de emissões, Sobol e Monte Carlo.")
+    parser.add_argument('--referencia', type=Path, default=REFERENCIA_PADRAO, help="JSON com a referência")
+    parser.add_argument('--salvar-referencia', '--gravar-referencia', action='store_true',
+                        help="Grava os resultados como nova referência")
+    parser.add_argument('--rapido', action='store_true', help="Só os extremos de cada faixa")
+    parser.add_argument('--tolerancia-tempo', type=float, default=1.5, help="Fator máximo sobre o tempo de referência")
+    parser.add_argument('--tolerancia-memoria', type=float, default=1.2, help="Fator máximo sobre o pico de referência")
+    parser.add_argument('--filtro', default='', help="Só casos cujo nome contém este texto")
+    args = parser.parse_args(argv)
+
+    # Sem referência não há comparação possível: falha antes de medir, em vez de passar em silêncio
+    if not args.salvar_referencia and not args.referencia.exists():
+        print(f"Sem referência em {args.referencia}; rode com --salvar-referencia para criá-la.", file=sys.stderr)
+        return 2
+
+    resultados = {}
+    print(f"{'caso':<42}{'tempo (ms)':>12}{'pico (KB)':>12}")
+    for nome, funcao in casos(args.rapido):
+        if args.filtro not in nome:
+            continue
+        resultados[nome] = medida = medir(funcao)
+        print(f"{nome:<42}{medida['tempo_ms']:>12.3f}{medida['pico_kb']:>12.0f}")
+
+    if args.salvar_referencia:
+        referencia = json.loads(args.referencia.read_text()) if args.referencia.exists() else {}
+        referencia.update(resultados)
+        args.referencia.write_text(json.dumps(referencia, indent=2, sort_keys=True))
+        print(f"Referência gravada em {args.referencia}")
+        return 0
+
+    referencia = json.loads(args.referencia.read_text())
+    regressoes = comparar(resultados, referencia, args.tolerancia_tempo, args.tolerancia_memoria)
+    for regressao in regressoes:
+        print(f"REGRESSÃO {regressao}")
+    if regressoes:
+        return 1
+
+    sem_referencia = [nome for nome in resultados if nome not in referencia]
+    if sem_referencia:
+        print(f"Casos sem referência em {args.referencia}: {', '.join(sem_referencia)}; "
+              "rode com --salvar-referencia para incluí-los.", file=sys.stderr)
+        return 2
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,75 @@
+"""Núcleo de simulação de emissões para cervejarias, sem dependência do Streamlit.
+
+Importar este pacote não faz I/O nem carrega pandas/scipy/SALib.
+``ResultadoDiario`` (que depende do pandas) é carregado só no primeiro acesso a
+``simulador_cervejaria.ResultadoDiario``. As rotinas de
+sensibilidade (``simulador_cervejaria.sensibilidade``) e de incerteza
+(``simulador_cervejaria.incerteza``) ficam em submódulos importados sob demanda.
+"""
+
+from .constantes import (
+    GWP_CH4_20,
+    GWP_N2O_20,
+    O2_REGIMES_PRE_DESCARTE,
+    PERFIL_CH4_CERVEJARIA,
+    PERFIL_N2O,
+    PERFIL_N2O_CERVEJARIA,
+    PERFIL_N2O_PRE_DESCARTE,
+    k_ano,
+)
+from .emissoes import (
+    ajustar_emissoes_pre_descarte,
+    calcular_emissoes_aterro,
+    calcular_emissoes_compostagem_cervejaria,
+    calcular_emissoes_pre_descarte,
+    calcular_emissoes_pre_descarte_regimes,
+    calcular_emissoes_vermicompostagem_cervejaria,
+    convoluir_perfil,
+    obter_entradas_diarias,
+)
+from .financeiro import calcular_valor_creditos, valorar_cenarios_precos, valorar_reducoes
+from .parametros import ParametrosCervejaria
+from .totais import (
+    calcular_totais_anuais_cervejaria,
+    calcular_totais_cervejaria,
+    executar_simulacao_completa_cervejaria,
+    executar_simulacao_lote_cervejaria,
+    executar_simulacao_vermicompostagem_cervejaria,
+)
+
+__all__ = [
+    'GWP_CH4_20',
+    'GWP_N2O_20',
+    'O2_REGIMES_PRE_DESCARTE',
+    'PERFIL_CH4_CERVEJARIA',
+    'PERFIL_N2O',
+    'PERFIL_N2O_CERVEJARIA',
+    'PERFIL_N2O_PRE_DESCARTE',
+    'ParametrosCervejaria',
+    'ResultadoDiario',
+    'ajustar_emissoes_pre_descarte',
+    'calcular_emissoes_aterro',
+    'calcular_emissoes_compostagem_cervejaria',
+    'calcular_emissoes_pre_descarte',
+    'calcular_emissoes_pre_descarte_regimes',
+    'calcular_emissoes_vermicompostagem_cervejaria',
+    'calcular_totais_anuais_cervejaria',
+    'calcular_totais_cervejaria',
+    'calcular_valor_creditos',
+    'convoluir_perfil',
+    'executar_simulacao_completa_cervejaria',
+    'executar_simulacao_lote_cervejaria',
+    'executar_simulacao_vermicompostagem_cervejaria',
+    'k_ano',
+    'obter_entradas_diarias',
+    'valorar_cenarios_precos',
+    'valorar_reducoes',
+]
+
+
+def __getattr__(nome):
+    # Importação preguiçosa: o pandas só é carregado por quem usa ResultadoDiario
+    if nome == 'ResultadoDiario':
+        from .resultados import ResultadoDiario
+        return ResultadoDiario
+    raise AttributeError(f"module {__name__!r} has no attribute {nome!r}")
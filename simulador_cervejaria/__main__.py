@@ -0,0 +1,3 @@
+from .lote import main
+
+main()
@@ -0,0 +1,44 @@
+"""Agregação de séries diárias em totais anuais e mensais.
+
+O calendário do horizonte é conhecido de antemão: os índices de início de cada
+ano (ou mês) são calculados uma vez com aritmética de ``datetime64`` (anos
+bissextos incluídos) e memorizados, e a redução é um ``np.add.reduceat`` sobre
+esses limites, sem ``groupby`` nem coluna de datas.
+"""
+
+from functools import lru_cache
+
+import numpy as np
+
+UNIDADES_PERIODO = {'anual': 'Y', 'mensal': 'M'}
+
+
+@lru_cache(maxsize=64)
+def _limites_periodos(data_inicio, dias, frequencia):
+    unidade = UNIDADES_PERIODO[frequencia]
+    inicio = np.datetime64(data_inicio, 'D')
+    periodos = np.arange(inicio.astype(f'datetime64[{unidade}]'),
+                         (inicio + (dias - 1)).astype(f'datetime64[{unidade}]') + 1)
+    inicios = (periodos.astype('datetime64[D]') - inicio).astype(np.int64)
+    inicios[0] = 0  # o primeiro período pode começar no meio do ano/mês
+
+    periodos.flags.writeable = False
+    inicios.flags.writeable = False
+    return periodos, inicios
+
+def limites_periodos(data_inicio, dias, frequencia='anual'):
+    # (períodos datetime64[Y|M], índice do primeiro dia de cada período na série diária)
+    return _limites_periodos(str(np.datetime64(data_inicio, 'D')), int(dias), frequencia)
+
+def agregar_periodos(series, data_inicio, frequencia='anual'):
+    # series: array (dias,) ou (n, dias); soma ao longo do último eixo
+    series = np.asarray(series)
+    periodos, inicios = limites_periodos(data_inicio, series.shape[-1], frequencia)
+    return periodos, np.add.reduceat(series, inicios, axis=-1)
+
+def totais_anuais(series, data_inicio):
+    anos, totais = agregar_periodos(series, data_inicio, 'anual')
+    return anos.astype(int) + 1970, totais
+
+def totais_mensais(series, data_inicio):
+    return agregar_periodos(series, data_inicio, 'mensal')
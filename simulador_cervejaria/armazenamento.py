@@ -0,0 +1,165 @@
+"""Armazenamento em disco, endereçado por conteúdo, dos resultados da simulação.
+
+Cada resultado (séries diárias, índices de Sobol, amostras de Monte Carlo) é
+gravado em um diretório cujo nome é o hash SHA-256 da versão do modelo, do tipo
+de resultado e das entradas que o determinam. Os arrays ficam em arquivos
+``.npy`` lidos com ``mmap_mode='r'``; tabelas derivadas (resumos anual e
+mensal) não são gravadas, pois saem das séries diárias. A gravação é atômica (diretório temporário + ``os.replace``), e o
+tamanho total é limitado: ao passar do limite, as entradas menos recentemente
+usadas são removidas. Diretórios temporários deixados por uma gravação
+interrompida são apagados quando ficam mais velhos que
+``IDADE_TEMPORARIO_ORFAO``.
+
+Diretório e limite vêm de ``SIMULADOR_CACHE_DIR`` e ``SIMULADOR_CACHE_MAX_MB``.
+"""
+
+import dataclasses
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from datetime import date, datetime
+from pathlib import Path
+
+import numpy as np
+
+from .instrumentacao import contar
+
+# Incrementar sempre que uma mudança no modelo alterar os resultados: invalida o armazenamento
+VERSAO_MODELO = 2
+
+DIRETORIO_PADRAO = Path.home() / '.cache' / 'simulador_cervejaria'
+ARQUIVO_META = 'meta.json'
+PREFIXO_TEMPORARIO = '.tmp-'
+IDADE_TEMPORARIO_ORFAO = 3600  # s; gravações em andamento em outros processos são bem mais curtas
+
+
+def _normalizar(valor):
+    if dataclasses.is_dataclass(valor) and not isinstance(valor, type):
+        return {'__tipo__': type(valor).__name__, **_normalizar(dataclasses.asdict(valor))}
+    if isinstance(valor, dict):
+        return {str(k): _normalizar(v) for k, v in valor.items()}
+    if isinstance(valor, (list, tuple)):
+        return [_normalizar(v) for v in valor]
+    if isinstance(valor, np.ndarray):
+        return [_normalizar(v) for v in valor.tolist()]
+    if isinstance(valor, np.generic):
+        return valor.item()
+    if isinstance(valor, (datetime, date)):
+        return valor.isoformat()
+    return valor
+
+def chave_resultado(tipo, **entradas):
+    conteudo = json.dumps({'versao': VERSAO_MODELO, 'tipo': tipo, 'entradas': _normalizar(entradas)},
+                          sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(conteudo.encode()).hexdigest()
+
+
+class ArmazemResultados:
+    def __init__(self, diretorio=DIRETORIO_PADRAO, limite_bytes=512 * 2**20):
+        self.diretorio = Path(diretorio)
+        self.limite_bytes = limite_bytes
+        self._lock = threading.Lock()
+
+    def _caminho(self, chave):
+        return self.diretorio / chave[:2] / chave
+
+    def carregar(self, chave):
+        # Devolve (arrays, meta) ou None; arrays mapeados em memória, somente leitura
+        caminho = self._caminho(chave)
+        try:
+            with open(caminho / ARQUIVO_META) as arquivo:
+                meta = json.load(arquivo)
+            arrays = {nome: np.load(caminho / f'{nome}.npy', mmap_mode='r', allow_pickle=False)
+                      for nome in meta['arrays']}
+            os.utime(caminho / ARQUIVO_META)  # marca o uso para a política LRU
+        except (OSError, ValueError, KeyError):
+            return None
+        return arrays, meta.get('extras', {})
+
+    def salvar(self, chave, arrays, extras=None):
+        destino = self._caminho(chave)
+        destino.parent.mkdir(parents=True, exist_ok=True)
+        temporario = Path(tempfile.mkdtemp(prefix=PREFIXO_TEMPORARIO, dir=destino.parent))
+        try:
+            for nome, array in arrays.items():
+                np.save(temporario / f'{nome}.npy', np.asarray(array), allow_pickle=False)
+            with open(temporario / ARQUIVO_META, 'w') as arquivo:
+                json.dump({'arrays': list(arrays), 'extras': _normalizar(extras or {})}, arquivo)
+            try:
+                os.replace(temporario, destino)
+            except OSError:
+                pass  # outro processo gravou a mesma chave primeiro; o conteúdo é o mesmo
+        finally:
+            shutil.rmtree(temporario, ignore_errors=True)
+        self.aplicar_limite()
+
+    def entradas(self):
+        # (último uso, bytes, caminho) de cada resultado gravado
+        registros = []
+        for caminho in self.diretorio.glob('??/*'):
+            if caminho.name.startswith(PREFIXO_TEMPORARIO):
+                continue
+            try:
+                tamanho = sum(arquivo.stat().st_size for arquivo in caminho.iterdir())
+                registros.append(((caminho / ARQUIVO_META).stat().st_mtime, tamanho, caminho))
+            except OSError:
+                continue
+        return registros
+
+    def tamanho_total(self):
+        return sum(tamanho for _, tamanho, _ in self.entradas())
+
+    def limpar_temporarios(self, idade_minima=IDADE_TEMPORARIO_ORFAO):
+        # Diretórios .tmp-* órfãos (processo interrompido no meio de salvar): entradas() os ignora,
+        # então sem isto nunca seriam contados nem removidos pelo limite
+        limite = time.time() - idade_minima
+        for caminho in self.diretorio.glob(f'??/{PREFIXO_TEMPORARIO}*'):
+            try:
+                if caminho.stat().st_mtime < limite:
+                    shutil.rmtree(caminho, ignore_errors=True)
+            except OSError:
+                continue
+
+    def aplicar_limite(self):
+        self.limpar_temporarios()
+        with self._lock:
+            registros = sorted(self.entradas())
+            total = sum(tamanho for _, tamanho, _ in registros)
+            for _, tamanho, caminho in registros:
+                if total <= self.limite_bytes:
+                    break
+                shutil.rmtree(caminho, ignore_errors=True)
+                total -= tamanho
+
+    def limpar(self):
+        shutil.rmtree(self.diretorio, ignore_errors=True)
+
+    @staticmethod
+    def _salvar_se_possivel(salvar, *args):
+        # Disco cheio ou diretório sem permissão não impedem a simulação, só a persistência
+        try:
+            salvar(*args)
+        except OSError:
+            pass
+
+    def memorizar_arrays(self, tipo, entradas, calcular):
+        # calcular() -> (dict de arrays, dict de extras JSON)
+        chave = chave_resultado(tipo, **entradas)
+        resultado = self.carregar(chave)
+        if resultado is not None:
+            contar('armazem_acerto')
+            return resultado
+        contar('armazem_falta')
+        arrays, extras = calcular()
+        self._salvar_se_possivel(self.salvar, chave, arrays, extras)
+        return arrays, extras
+
+
+armazem_resultados = ArmazemResultados(
+    diretorio=os.environ.get('SIMULADOR_CACHE_DIR', DIRETORIO_PADRAO),
+    limite_bytes=int(float(os.environ.get('SIMULADOR_CACHE_MAX_MB', 512)) * 2**20),
+)
@@ -0,0 +1,111 @@
+"""Comparação de cenários: grade sobre os parâmetros da barra lateral avaliada em lote.
+
+``grade_cenarios`` expande uma grade ``{campo: [valores]}`` (produto
+cartesiano) em ``ParametrosCervejaria``, rejeitando valores fora das faixas dos
+controles da barra lateral (``LIMITES_PARAMETROS``) e valores não inteiros em
+campos inteiros. ``avaliar_cenarios`` calcula os totais
+anuais de todos os cenários de uma vez: os cenários são agrupados por horizonte
+(as somas de kernels por ano são as mesmas dentro do grupo) e cada grupo é
+avaliado como um único ``ParametrosCervejaria`` com campos vetoriais, forma
+``(n, 1)`` contra ``(anos,)`` das somas. A linha de base (aterro) é calculada
+uma só vez por combinação distinta das entradas que a afetam e reaproveitada
+pelos cenários que só diferem no resto.
+"""
+
+from dataclasses import fields, replace
+from itertools import product
+
+import numpy as np
+import pandas as pd
+
+from .instrumentacao import contar, instrumentar
+from .parametros import ParametrosCervejaria, validar_parametro
+from .totais import _somas_kernels_anuais, _totais_aterro, _totais_projeto
+
+CAMPOS_PARAMETROS = [campo.name for campo in fields(ParametrosCervejaria)]
+
+# Faixas (mínimo, máximo) dos controles da barra lateral
+LIMITES_PARAMETROS = {
+    'producao_mensal_litros': (500, 10000),
+    'dias_operacao_mes': (20, 30),
+    'fator_residuos': (0.10, 0.30),
+    'percentual_bagaco': (70, 90),
+    'umidade_bagaco': (75, 85),
+    'umidade_levedura': (85, 95),
+    'temperatura': (15, 35),
+    'doc_bagaco': (0.70, 0.90),
+    'doc_levedura': (0.80, 0.95),
+    'h_exposta': (4, 24),
+    'anos_simulacao': (5, 50),
+}
+
+
+def validar_valor_grade(campo, valor):
+    # Como validar_parametro, mas restrito à faixa da barra lateral
+    return validar_parametro(campo, valor, LIMITES_PARAMETROS)
+
+def grade_cenarios(base, grade):
+    # grade: {campo: [valores]}; um cenário por combinação, na ordem dos campos
+    desconhecidos = [campo for campo in grade if campo not in CAMPOS_PARAMETROS]
+    if desconhecidos:
+        raise ValueError(f"Campos desconhecidos na grade: {', '.join(desconhecidos)}")
+    grade = {campo: [validar_valor_grade(campo, valor) for valor in valores] for campo, valores in grade.items()}
+    campos = list(grade)
+    return [replace(base, **dict(zip(campos, valores))) for valores in product(*grade.values())]
+
+def rotulo_cenario(cenario, campos):
+    return ', '.join(f"{campo}={getattr(cenario, campo):g}" for campo in campos)
+
+def _vetorizar(cenarios):
+    # ParametrosCervejaria com cada campo como coluna (n, 1): as propriedades derivadas
+    # (resíduos/dia, umidade e DOC médios) passam a ser calculadas para todos de uma vez
+    return ParametrosCervejaria(**{
+        campo: np.array([getattr(c, campo) for c in cenarios], dtype=float)[:, None] for campo in CAMPOS_PARAMETROS
+    })
+
+def _chaves_aterro(vetorial):
+    # Entradas que afetam a linha de base; cenários com a mesma chave compartilham o aterro
+    return np.hstack([vetorial.residuos_kg_dia, vetorial.umidade, vetorial.temperatura, vetorial.doc,
+                      vetorial.massa_exposta_kg / vetorial.residuos_kg_dia * vetorial.h_exposta])
+
+@instrumentar('cenarios')
+def avaliar_cenarios(cenarios):
+    # Tabela longa (cenario, ano, ...) com as mesmas colunas de tCO2eq do lote
+    partes = []
+    anos_por_cenario = np.array([c.anos_simulacao for c in cenarios])
+    for anos in np.unique(anos_por_cenario):
+        indices = np.flatnonzero(anos_por_cenario == anos)
+        grupo = [cenarios[i] for i in indices]
+        somas = _somas_kernels_anuais(int(anos) * 365)
+        vetorial = _vetorizar(grupo)
+
+        _, unicos, inverso = np.unique(_chaves_aterro(vetorial), axis=0, return_index=True, return_inverse=True)
+        inverso = inverso.ravel()
+        contar('cenarios_aterro_reaproveitados', len(grupo) - len(unicos))
+        vetorial_unicos = _vetorizar([grupo[i] for i in unicos])
+        aterro = sum(_totais_aterro(vetorial_unicos.params_base, vetorial_unicos, somas).values())[inverso]
+
+        projeto = _totais_projeto(vetorial.params_base, vetorial, somas)
+        compost = projeto['CH4_Compost_tCO2eq'] + projeto['N2O_Compost_tCO2eq']
+        vermi = projeto['CH4_Vermi_tCO2eq'] + projeto['N2O_Vermi_tCO2eq']
+
+        n_cenarios, n_anos = compost.shape
+        partes.append(pd.DataFrame({
+            'cenario': np.repeat(indices, n_anos),
+            'ano': np.tile(np.arange(1, n_anos + 1), n_cenarios),
+            'aterro_tco2eq': aterro.ravel(),
+            'compost_tco2eq': compost.ravel(),
+            'vermi_tco2eq': vermi.ravel(),
+            'reducao_compost_tco2eq': (aterro - compost).ravel(),
+            'reducao_vermi_tco2eq': (aterro - vermi).ravel(),
+        }))
+    return pd.concat(partes, ignore_index=True).sort_values(['cenario', 'ano'], ignore_index=True)
+
+def resumir_cenarios(cenarios, anuais, campos):
+    # Uma linha por cenário: valores dos campos da grade e totais no horizonte
+    totais = anuais.groupby('cenario')[['aterro_tco2eq', 'reducao_compost_tco2eq', 'reducao_vermi_tco2eq']].sum()
+    resumo = pd.DataFrame({campo: [getattr(c, campo) for c in cenarios] for campo in campos})
+    resumo['anos_simulacao'] = [c.anos_simulacao for c in cenarios]
+    for coluna in totais.columns:
+        resumo[coluna] = totais[coluna].to_numpy()
+    return resumo
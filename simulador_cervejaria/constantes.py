@@ -0,0 +1,74 @@
+"""Constantes do modelo de emissões para resíduos de cervejaria."""
+
+import numpy as np
+
+MCF = 1
+F = 0.5
+OX = 0.1
+Ri = 0.0
+k_ano = 0.06
+
+# Parâmetros específicos para resíduos de cervejaria
+TOC_CERVEJARIA = 0.45  # Maior que resíduos genéricos devido à alta matéria orgânica
+TN_CERVEJARIA = 25.0 / 1000  # Teor de nitrogênio mais alto
+
+# Ajustar fatores de emissão para resíduos de cervejaria (mais biodegradáveis)
+CH4_C_FRAC_CERVEJARIA = 0.20 / 100  # Maior potencial de metano
+N2O_N_FRAC_CERVEJARIA = 1.20 / 100  # Maior potencial de óxido nitroso
+
+DIAS_COMPOSTAGEM = 50
+
+# Perfis de emissão ajustados para resíduos de cervejaria (decomposição mais rápida)
+PERFIL_CH4_CERVEJARIA = np.array([
+    0.03, 0.04, 0.05, 0.07, 0.09,  # Dias 1-5 (início mais rápido)
+    0.12, 0.15, 0.18, 0.20, 0.18,  # Dias 6-10 (pico antecipado)
+    0.15, 0.12, 0.10, 0.08, 0.06,  # Dias 11-15
+    0.05, 0.04, 0.03, 0.02, 0.02,  # Dias 16-20
+    0.01, 0.01, 0.01, 0.005, 0.005,  # Dias 21-25
+    0.005, 0.005, 0.005, 0.005, 0.005,  # Dias 26-30
+    0.002, 0.002, 0.002, 0.002, 0.002,  # Dias 31-35
+    0.001, 0.001, 0.001, 0.001, 0.001,  # Dias 36-40
+    0.001, 0.001, 0.001, 0.001, 0.001,  # Dias 41-45
+    0.001, 0.001, 0.001, 0.001, 0.001   # Dias 46-50
+])
+PERFIL_CH4_CERVEJARIA /= PERFIL_CH4_CERVEJARIA.sum()
+
+PERFIL_N2O_CERVEJARIA = np.array([
+    0.12, 0.15, 0.20, 0.08, 0.05,  # Dias 1-5 (pico mais pronunciado)
+    0.06, 0.08, 0.10, 0.12, 0.15,  # Dias 6-10
+    0.18, 0.20, 0.18, 0.15, 0.12,  # Dias 11-15 (pico principal)
+    0.10, 0.08, 0.06, 0.05, 0.04,  # Dias 16-20
+    0.03, 0.02, 0.01, 0.01, 0.01,  # Dias 21-25
+    0.005, 0.005, 0.005, 0.005, 0.005,  # Dias 26-30
+    0.002, 0.002, 0.002, 0.002, 0.002,  # Dias 31-35
+    0.001, 0.001, 0.001, 0.001, 0.001,  # Dias 36-40
+    0.001, 0.001, 0.001, 0.001, 0.001,  # Dias 41-45
+    0.001, 0.001, 0.001, 0.001, 0.001   # Dias 46-50
+])
+PERFIL_N2O_CERVEJARIA /= PERFIL_N2O_CERVEJARIA.sum()
+
+# Emissões pré-descarte ajustadas para cervejaria
+CH4_pre_descarte_ugC_por_kg_h_media = 3.50  # Valor mais alto para resíduos de cervejaria
+fator_conversao_C_para_CH4 = 16/12
+CH4_pre_descarte_ugCH4_por_kg_h_media = CH4_pre_descarte_ugC_por_kg_h_media * fator_conversao_C_para_CH4
+CH4_pre_descarte_g_por_kg_dia = CH4_pre_descarte_ugCH4_por_kg_h_media * 24 / 1_000_000
+
+N2O_pre_descarte_mgN_por_kg = 25.0  # Valor mais alto
+N2O_pre_descarte_mgN_por_kg_dia = N2O_pre_descarte_mgN_por_kg / 3
+N2O_pre_descarte_g_por_kg_dia = N2O_pre_descarte_mgN_por_kg_dia * (44/28) / 1000
+
+PERFIL_N2O_PRE_DESCARTE = {1: 0.8623, 2: 0.10, 3: 0.0377}
+
+# GWP (IPCC AR6)
+GWP_CH4_20 = 79.7
+GWP_N2O_20 = 273
+
+PERFIL_N2O = {1: 0.10, 2: 0.30, 3: 0.40, 4: 0.15, 5: 0.05}
+KERNEL_N2O_ATERRO = np.array([PERFIL_N2O.get(d, 0) for d in range(1, 6)], dtype=float)
+
+# Perfis da vermicompostagem já escalados pela atividade das minhocas
+PERFIL_CH4_VERMI = PERFIL_CH4_CERVEJARIA * 0.7
+PERFIL_N2O_VERMI = PERFIL_N2O_CERVEJARIA * 0.5
+
+# Regimes de O2 avaliados no pré-descarte (%)
+O2_REGIMES_PRE_DESCARTE = (21, 10, 1)
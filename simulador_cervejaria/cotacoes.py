@@ -0,0 +1,344 @@
+"""Cotações do carbono (EU ETS) e do câmbio EUR/BRL.
+
+Cada fonte (``FonteCotacao``) sabe consultar uma URL e extrair o valor da
+resposta, registrando latência e falhas. Um ``ProvedorCotacoes`` consulta
+todas as suas fontes em paralelo sobre uma sessão HTTP com keep-alive e
+devolve a primeira resposta válida ou a mediana das válidas.
+
+Por cima disso, ``CacheCotacoes`` é um cache por processo, com TTL, que nunca
+bloqueia quem lê: enquanto não houver resposta, são devolvidos os últimos
+valores conhecidos ou os valores de referência, e a atualização roda em uma
+thread de fundo. As URLs são parâmetros das fontes para permitir apontar para
+servidores locais.
+"""
+
+import os
+import re
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from bs4 import BeautifulSoup
+import requests
+from requests.adapters import HTTPAdapter
+
+from .instrumentacao import contar, instrumentar
+
+URL_INVESTING = "https://www.investing.com/commodities/carbon-emissions"
+URL_AWESOMEAPI = "https://economia.awesomeapi.com.br/last/EUR-BRL"
+URL_EXCHANGERATE_API = "https://api.exchangerate-api.com/v4/latest/EUR"
+
+HEADERS_INVESTING = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Accept-Language': 'pt-BR,pt;q=0.9,en;q=0.8',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+    'Referer': 'https://www.investing.com/'
+}
+
+COTACAO_CARBONO_REFERENCIA = (85.50, "€", "Carbon Emissions (Referência)", False, "Referência")
+COTACAO_EURO_REFERENCIA = (5.50, "R$", False, "Referência")
+
+_executor_consultas = ThreadPoolExecutor(max_workers=8, thread_name_prefix='cotacoes')
+
+
+def criar_sessao(pool_maxsize=8):
+    # Conexões keep-alive reaproveitadas entre consultas e entre fontes do mesmo host
+    sessao = requests.Session()
+    adaptador = HTTPAdapter(pool_connections=4, pool_maxsize=pool_maxsize)
+    sessao.mount('http://', adaptador)
+    sessao.mount('https://', adaptador)
+    return sessao
+
+def _abertura_por_classe(classe):
+    return re.compile(rb'<[a-zA-Z][^>]*\sclass="(?:[^"]*\s)?' + re.escape(classe) + rb'(?:\s[^"]*)?"[^>]*>')
+
+# Seletores CSS na ordem de prioridade, com um marcador em bytes (se ausente, o seletor não
+# casa) e o padrão pré-compilado da tag de abertura equivalente. Padrão None = só pela árvore.
+SELETORES_PRECO = [
+    ('[data-test="instrument-price-last"]', b'instrument-price-last',
+     re.compile(rb'<[a-zA-Z][^>]*\sdata-test="instrument-price-last"[^>]*>')),
+    ('.text-2xl', b'text-2xl', _abertura_por_classe(b'text-2xl')),
+    ('.last-price-value', b'last-price-value', _abertura_por_classe(b'last-price-value')),
+    ('.instrument-price-last', b'instrument-price-last', _abertura_por_classe(b'instrument-price-last')),
+    ('.pid-1062510-last', b'pid-1062510-last', _abertura_por_classe(b'pid-1062510-last')),
+    ('.float_lang_base_1', b'float_lang_base_1', _abertura_por_classe(b'float_lang_base_1')),
+    ('.top.bold.inlineblock', b'inlineblock', None),
+    ('#last_last', b'last_last', re.compile(rb'<[a-zA-Z][^>]*\sid="last_last"[^>]*>')),
+]
+
+PADROES_PRECO = [
+    r'"last":"([\d,]+)"',
+    r'data-last="([\d,]+)"',
+    r'last_price["\']?:\s*["\']?([\d,]+)',
+    r'value["\']?:\s*["\']?([\d,]+)'
+]
+PADROES_PRECO_BYTES = [re.compile(padrao.encode()) for padrao in PADROES_PRECO]
+
+
+def _limpar_texto_preco(texto):
+    texto_preco = texto.strip().replace(',', '')
+    return ''.join(c for c in texto_preco if c.isdigit() or c == '.')
+
+def _preco_apos_abertura(conteudo, abertura):
+    # Texto direto do primeiro elemento que casa com `abertura`; None se incompleto ou ambíguo
+    # (filhos aninhados, texto vazio ou inválido), casos em que só a árvore dá a mesma resposta
+    m = abertura.search(conteudo)
+    if m is None:
+        return None
+    fim = conteudo.find(b'<', m.end())
+    if fim < 0 or conteudo[fim:fim + 2] != b'</':
+        return None
+    texto_preco = _limpar_texto_preco(conteudo[m.end():fim].decode('utf-8', 'replace'))
+    try:
+        return float(texto_preco) if texto_preco else None
+    except ValueError:
+        return None
+
+def extrair_preco_arvore(conteudo):
+    soup = BeautifulSoup(conteudo, 'html.parser')
+    
+    for seletor, _, _ in SELETORES_PRECO:
+        try:
+            elemento = soup.select_one(seletor)
+            if elemento:
+                texto_preco = _limpar_texto_preco(elemento.text)
+                if texto_preco:
+                    return float(texto_preco)
+        except (ValueError, AttributeError):
+            continue
+    
+    html_texto = str(soup)
+    for padrao in PADROES_PRECO:
+        matches = re.findall(padrao, html_texto)
+        for match in matches:
+            try:
+                preco_texto = match.replace(',', '')
+                preco = float(preco_texto)
+                if 50 < preco < 200:
+                    return preco
+            except ValueError:
+                continue
+    
+    return None
+
+def extrair_preco_html(conteudo):
+    # Caminho rápido sobre os bytes brutos; a árvore só é montada quando o resultado
+    # por padrões não seria garantidamente o mesmo do parse completo
+    for _, marcador, abertura in SELETORES_PRECO:
+        if marcador not in conteudo:
+            continue
+        preco = _preco_apos_abertura(conteudo, abertura) if abertura is not None else None
+        return preco if preco is not None else extrair_preco_arvore(conteudo)
+
+    for padrao in PADROES_PRECO_BYTES:
+        for match in padrao.finditer(conteudo):
+            try:
+                preco = float(match.group(1).replace(b',', b''))
+            except ValueError:
+                continue
+            if 50 < preco < 200:
+                return preco
+
+    return extrair_preco_arvore(conteudo)
+
+def extrair_preco_investing(resposta):
+    # Lê o corpo em blocos e encerra a transferência assim que o seletor principal
+    # aparece completo; senão, aplica extrair_preco_html ao documento inteiro
+    _, marcador, abertura = SELETORES_PRECO[0]
+    recebido = bytearray()
+    for bloco in resposta.iter_content(chunk_size=64 * 1024):
+        recebido += bloco
+        if marcador in recebido:
+            preco = _preco_apos_abertura(recebido, abertura)
+            if preco is not None:
+                resposta.close()
+                return preco
+    return extrair_preco_html(bytes(recebido))
+
+def extrair_cotacao_awesomeapi(resposta):
+    return float(resposta.json()['EURBRL']['bid'])
+
+def extrair_cotacao_exchangerate(resposta):
+    return float(resposta.json()['rates']['BRL'])
+
+
+class FonteCotacao:
+    def __init__(self, nome, url, extrair, timeout=10, headers=None, stream=False):
+        self.nome = nome
+        self.url = url
+        self.extrair = extrair
+        self.timeout = timeout
+        self.headers = headers
+        self.stream = stream
+        self.consultas = 0
+        self.falhas = 0
+        self.latencia_total = 0.0
+        self.ultima_latencia = None
+        self.ultimo_erro = None
+        self._lock = threading.Lock()
+
+    def consultar(self, sessao):
+        inicio = time.perf_counter()
+        erro = None
+        try:
+            # O with fecha a resposta em qualquer saída (erro HTTP ou do extrator); com stream=True,
+            # só assim a conexão volta ao pool da sessão
+            with sessao.get(self.url, headers=self.headers, timeout=self.timeout, stream=self.stream) as resposta:
+                resposta.raise_for_status()
+                valor = self.extrair(resposta)
+            if valor is None:
+                erro = "Valor não encontrado na resposta"
+        except Exception as e:
+            valor, erro = None, str(e)
+        latencia = time.perf_counter() - inicio
+
+        with self._lock:
+            self.consultas += 1
+            self.latencia_total += latencia
+            self.ultima_latencia = latencia
+            if erro is not None:
+                self.falhas += 1
+                self.ultimo_erro = erro
+        contar(f'consulta_{self.nome}')
+        if erro is not None:
+            contar(f'falha_{self.nome}')
+        return valor
+
+    def estatisticas(self):
+        with self._lock:
+            return {
+                'fonte': self.nome,
+                'consultas': self.consultas,
+                'falhas': self.falhas,
+                'latencia_media_ms': 1000 * self.latencia_total / self.consultas if self.consultas else None,
+                'ultima_latencia_ms': 1000 * self.ultima_latencia if self.ultima_latencia is not None else None,
+                'ultimo_erro': self.ultimo_erro,
+            }
+
+
+class ProvedorCotacoes:
+    ESTRATEGIAS = ('primeira', 'mediana')
+
+    def __init__(self, fontes, estrategia='primeira', sessao=None):
+        if estrategia not in self.ESTRATEGIAS:
+            raise ValueError(f"Estratégia desconhecida: {estrategia!r}")
+        self.fontes = list(fontes)
+        self.estrategia = estrategia
+        self._sessao = sessao
+
+    @property
+    def sessao(self):
+        if self._sessao is None:
+            self._sessao = criar_sessao()
+        return self._sessao
+
+    def obter(self):
+        # Consulta todas as fontes em paralelo; devolve (valor, nome da fonte) ou (None, None)
+        futuros = {_executor_consultas.submit(fonte.consultar, self.sessao): fonte for fonte in self.fontes}
+
+        if self.estrategia == 'primeira':
+            # As demais consultas seguem em segundo plano e ainda entram nas estatísticas
+            for futuro in as_completed(futuros):
+                valor = futuro.result()
+                if valor is not None:
+                    return valor, futuros[futuro].nome
+            return None, None
+
+        resultados = [(futuro.result(), fonte.nome) for futuro, fonte in futuros.items()]
+        validos = [(valor, nome) for valor, nome in resultados if valor is not None]
+        if not validos:
+            return None, None
+        if len(validos) == 1:
+            return validos[0]
+        return statistics.median(valor for valor, _ in validos), "Mediana (" + ", ".join(nome for _, nome in validos) + ")"
+
+    def estatisticas(self):
+        return [fonte.estatisticas() for fonte in self.fontes]
+
+
+provedor_carbono = ProvedorCotacoes([
+    FonteCotacao("Investing.com", URL_INVESTING, extrair_preco_investing, timeout=15, headers=HEADERS_INVESTING,
+                 stream=True),
+])
+provedor_euro = ProvedorCotacoes([
+    FonteCotacao("AwesomeAPI", URL_AWESOMEAPI, extrair_cotacao_awesomeapi),
+    FonteCotacao("ExchangeRate-API", URL_EXCHANGERATE_API, extrair_cotacao_exchangerate),
+], estrategia=os.environ.get('COTACOES_ESTRATEGIA_CAMBIO', 'primeira'))
+
+
+@instrumentar('cotacao_carbono')
+def obter_cotacao_carbono(provedor=None):
+    preco, fonte = (provedor or provedor_carbono).obter()
+    
+    if preco is not None:
+        return preco, "€", "Carbon Emissions Future", True, fonte
+    
+    return COTACAO_CARBONO_REFERENCIA
+
+@instrumentar('cotacao_euro_real')
+def obter_cotacao_euro_real(provedor=None):
+    cotacao, fonte = (provedor or provedor_euro).obter()
+    
+    if cotacao is not None:
+        return cotacao, "R$", True, fonte
+    
+    return COTACAO_EURO_REFERENCIA
+
+def estatisticas_fontes():
+    return provedor_carbono.estatisticas() + provedor_euro.estatisticas()
+
+
+class CacheCotacoes:
+    def __init__(self, ttl_segundos=900, buscar_carbono=obter_cotacao_carbono, buscar_euro=obter_cotacao_euro_real):
+        self.ttl_segundos = ttl_segundos
+        self._buscadores = {'carbono': buscar_carbono, 'euro': buscar_euro}
+        self._valores = {'carbono': COTACAO_CARBONO_REFERENCIA, 'euro': COTACAO_EURO_REFERENCIA}
+        self._atualizado_em = {'carbono': None, 'euro': None}
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def obter(self):
+        # Nunca bloqueia: devolve os últimos valores conhecidos e dispara a atualização se expirados
+        if self.expirado():
+            self.atualizar()
+        with self._lock:
+            return self._valores['carbono'], self._valores['euro']
+
+    def expirado(self):
+        agora = time.monotonic()
+        with self._lock:
+            return any(instante is None or agora - instante > self.ttl_segundos
+                       for instante in self._atualizado_em.values())
+
+    def atualizando(self):
+        thread = self._thread
+        return thread is not None and thread.is_alive()
+
+    def atualizar(self, esperar=False):
+        with self._lock:
+            if not self.atualizando():
+                self._thread = threading.Thread(target=self._atualizar_todas, name='atualizar-cotacoes', daemon=True)
+                self._thread.start()
+            thread = self._thread
+        if esperar:
+            thread.join()
+
+    def _atualizar_todas(self):
+        with ThreadPoolExecutor(max_workers=len(self._buscadores)) as executor:
+            futuros = {nome: executor.submit(buscar) for nome, buscar in self._buscadores.items()}
+
+        for nome, futuro in futuros.items():
+            try:
+                resultado = futuro.result()
+            except Exception:
+                resultado = None
+            with self._lock:
+                # Em ambas as tuplas o penúltimo campo indica sucesso; uma falha mantém o último valor
+                # conhecido, mas também conta para o TTL para não repetir a consulta a cada rerun
+                if resultado is not None and resultado[-2]:
+                    self._valores[nome] = resultado
+                self._atualizado_em[nome] = time.monotonic()
+
+
+cache_cotacoes = CacheCotacoes(ttl_segundos=float(os.environ.get('COTACOES_TTL_SEGUNDOS', 900)))
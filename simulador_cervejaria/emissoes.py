@@ -0,0 +1,189 @@
+"""Séries diárias de emissões (kg/dia) para aterro, compostagem e vermicompostagem.
+
+As condições operacionais (resíduos por dia, massa exposta, horas de exposição e
+horizonte) vêm de um objeto ``cervejaria`` (ver ``ParametrosCervejaria``); os
+parâmetros incertos ``(umidade, T, DOC)`` são passados separadamente para que
+Sobol e Monte Carlo possam variá-los.
+"""
+
+from functools import lru_cache
+
+import numpy as np
+
+from .constantes import (
+    CH4_C_FRAC_CERVEJARIA,
+    CH4_pre_descarte_g_por_kg_dia,
+    F,
+    KERNEL_N2O_ATERRO,
+    MCF,
+    N2O_N_FRAC_CERVEJARIA,
+    N2O_pre_descarte_g_por_kg_dia,
+    O2_REGIMES_PRE_DESCARTE,
+    OX,
+    PERFIL_CH4_CERVEJARIA,
+    PERFIL_CH4_VERMI,
+    PERFIL_N2O_CERVEJARIA,
+    PERFIL_N2O_PRE_DESCARTE,
+    PERFIL_N2O_VERMI,
+    Ri,
+    TN_CERVEJARIA,
+    TOC_CERVEJARIA,
+    k_ano,
+)
+from .instrumentacao import instrumentar
+
+
+def _dias(cervejaria, dias_simulacao):
+    return cervejaria.dias if dias_simulacao is None else dias_simulacao
+
+def obter_entradas_diarias(cervejaria, entradas_kg_dia=None, dias_simulacao=None):
+    dias_simulacao = _dias(cervejaria, dias_simulacao)
+    # Sem cronograma explícito, assume entrada constante de residuos_kg_dia
+    if entradas_kg_dia is None:
+        return np.full(dias_simulacao, cervejaria.residuos_kg_dia, dtype=float)
+    entradas = np.asarray(entradas_kg_dia, dtype=float)
+    if entradas.ndim == 0:
+        return np.full(dias_simulacao, float(entradas))
+    if entradas.shape[0] < dias_simulacao:
+        raise ValueError(f"Cronograma de entradas com {entradas.shape[0]} dias; esperado {dias_simulacao}")
+    return entradas[:dias_simulacao]
+
+def convoluir_perfil(entradas_diarias, perfil, dias_simulacao):
+    # Import tardio: scipy.signal leva ~1 s para carregar e não é necessário no caminho de totais
+    from scipy.signal import fftconvolve
+
+    # Cada lote diário emite segundo o perfil a partir do dia de entrada (convolução via FFT)
+    return fftconvolve(entradas_diarias, np.asarray(perfil, dtype=float), mode='full')[:dias_simulacao]
+
+def ajustar_emissoes_pre_descarte(O2_concentracao):
+    ch4_ajustado = CH4_pre_descarte_g_por_kg_dia
+
+    if O2_concentracao == 21:
+        fator_n2o = 1.0
+    elif O2_concentracao == 10:
+        fator_n2o = 11.11 / 20.26
+    elif O2_concentracao == 1:
+        fator_n2o = 7.86 / 20.26
+    else:
+        fator_n2o = 1.0
+
+    n2o_ajustado = N2O_pre_descarte_g_por_kg_dia * fator_n2o
+    return ch4_ajustado, n2o_ajustado
+
+@lru_cache(maxsize=16)
+def _kernel_acumulado_pre_descarte(dias_simulacao):
+    # Com entrada diária constante, a emissão do dia d soma as frações do perfil com atraso <= d
+    atraso_max = max(PERFIL_N2O_PRE_DESCARTE)
+    fracoes = np.array([PERFIL_N2O_PRE_DESCARTE.get(d, 0) for d in range(1, atraso_max + 1)], dtype=float)
+    kernel = np.full(dias_simulacao, fracoes.sum())
+    n = min(atraso_max, dias_simulacao)
+    kernel[:n] = np.cumsum(fracoes)[:n]
+    kernel.setflags(write=False)
+    return kernel
+
+@lru_cache(maxsize=32)
+def _series_pre_descarte(concentracoes, dias_simulacao, residuos):
+    fatores = np.array([ajustar_emissoes_pre_descarte(c) for c in concentracoes], dtype=float)
+    kernel = _kernel_acumulado_pre_descarte(dias_simulacao)
+
+    ch4_diario = residuos * fatores[:, 0] / 1000
+    emissoes_CH4 = np.broadcast_to(ch4_diario[:, None], (len(concentracoes), dias_simulacao)).copy()
+    emissoes_N2O = (residuos * fatores[:, 1] / 1000)[:, None] * kernel
+
+    # Séries compartilhadas entre chamadas: somente leitura
+    emissoes_CH4.setflags(write=False)
+    emissoes_N2O.setflags(write=False)
+    return emissoes_CH4, emissoes_N2O
+
+@instrumentar('emissoes_pre_descarte')
+def calcular_emissoes_pre_descarte_regimes(cervejaria, concentracoes=O2_REGIMES_PRE_DESCARTE, dias_simulacao=None):
+    # Uma linha por regime de O2, na ordem de `concentracoes`
+    return _series_pre_descarte(tuple(concentracoes), _dias(cervejaria, dias_simulacao), cervejaria.residuos_kg_dia)
+
+def calcular_emissoes_pre_descarte(O2_concentracao, cervejaria, dias_simulacao=None):
+    emissoes_CH4, emissoes_N2O = calcular_emissoes_pre_descarte_regimes(cervejaria, (O2_concentracao,), dias_simulacao)
+    return emissoes_CH4[0], emissoes_N2O[0]
+
+def potencial_ch4_aterro_por_kg(temp_val, doc_val):
+    docf_calc = 0.0147 * temp_val + 0.28
+    return doc_val * docf_calc * MCF * F * (16/12) * (1 - Ri) * (1 - OX)
+
+def emissao_n2o_aterro_por_kg(umidade_val, cervejaria):
+    fator_umid = (1 - umidade_val) / (1 - 0.55)
+    f_aberto = np.clip((cervejaria.massa_exposta_kg / cervejaria.residuos_kg_dia) * (cervejaria.h_exposta / 24), 0.0, 1.0)
+
+    # Valores ajustados para resíduos de cervejaria
+    E_aberto = 2.25  # Maior que resíduos genéricos
+    E_fechado = 2.50
+    E_medio = f_aberto * E_aberto + (1 - f_aberto) * E_fechado
+    E_medio_ajust = E_medio * fator_umid
+    return E_medio_ajust * (44/28) / 1_000_000
+
+def fatores_compostagem_por_kg(umidade_val):
+    fracao_ms = 1 - umidade_val
+
+    # Usando parâmetros específicos para cervejaria
+    ch4_total_por_kg = TOC_CERVEJARIA * CH4_C_FRAC_CERVEJARIA * (16/12) * fracao_ms
+    n2o_total_por_kg = TN_CERVEJARIA * N2O_N_FRAC_CERVEJARIA * (44/28) * fracao_ms
+    return ch4_total_por_kg, n2o_total_por_kg
+
+def fatores_vermicompostagem_por_kg(umidade_val):
+    fracao_ms = 1 - umidade_val
+
+    # Usando parâmetros específicos para cervejaria com vermicompostagem
+    ch4_total_por_kg = TOC_CERVEJARIA * (CH4_C_FRAC_CERVEJARIA * 0.5) * (16/12) * fracao_ms
+    n2o_total_por_kg = TN_CERVEJARIA * (N2O_N_FRAC_CERVEJARIA * 0.3) * (44/28) * fracao_ms
+    return ch4_total_por_kg, n2o_total_por_kg
+
+def kernel_ch4_aterro(dias_simulacao):
+    t = np.arange(1, dias_simulacao + 1, dtype=float)
+    return np.exp(-k_ano * (t - 1) / 365.0) - np.exp(-k_ano * t / 365.0)
+
+@instrumentar('emissoes_aterro')
+def calcular_emissoes_aterro(params, cervejaria, dias_simulacao=None):
+    umidade_val, temp_val, doc_val = params
+    dias_simulacao = _dias(cervejaria, dias_simulacao)
+    residuos_kg_dia = cervejaria.residuos_kg_dia
+
+    potencial_CH4_lote_diario = residuos_kg_dia * potencial_ch4_aterro_por_kg(temp_val, doc_val)
+
+    entradas_diarias = np.ones(dias_simulacao, dtype=float)
+    emissoes_CH4 = convoluir_perfil(entradas_diarias, kernel_ch4_aterro(dias_simulacao), dias_simulacao)
+    emissoes_CH4 *= potencial_CH4_lote_diario
+
+    emissao_diaria_N2O = emissao_n2o_aterro_por_kg(umidade_val, cervejaria) * residuos_kg_dia
+    emissoes_N2O = convoluir_perfil(np.full(dias_simulacao, emissao_diaria_N2O), KERNEL_N2O_ATERRO, dias_simulacao)
+
+    O2_concentracao = 21
+    emissoes_CH4_pre_descarte_kg, emissoes_N2O_pre_descarte_kg = calcular_emissoes_pre_descarte(
+        O2_concentracao, cervejaria, dias_simulacao
+    )
+
+    total_ch4_aterro_kg = emissoes_CH4 + emissoes_CH4_pre_descarte_kg
+    total_n2o_aterro_kg = emissoes_N2O + emissoes_N2O_pre_descarte_kg
+
+    return total_ch4_aterro_kg, total_n2o_aterro_kg
+
+@instrumentar('emissoes_compostagem')
+def calcular_emissoes_compostagem_cervejaria(params, cervejaria, dias_simulacao=None, entradas_kg_dia=None):
+    umidade_val, temp_val, doc_val = params
+    dias_simulacao = _dias(cervejaria, dias_simulacao)
+    entradas = obter_entradas_diarias(cervejaria, entradas_kg_dia, dias_simulacao)
+    ch4_total_por_kg, n2o_total_por_kg = fatores_compostagem_por_kg(umidade_val)
+
+    emissoes_CH4 = convoluir_perfil(entradas * ch4_total_por_kg, PERFIL_CH4_CERVEJARIA, dias_simulacao)
+    emissoes_N2O = convoluir_perfil(entradas * n2o_total_por_kg, PERFIL_N2O_CERVEJARIA, dias_simulacao)
+
+    return emissoes_CH4, emissoes_N2O
+
+@instrumentar('emissoes_vermicompostagem')
+def calcular_emissoes_vermicompostagem_cervejaria(params, cervejaria, dias_simulacao=None, entradas_kg_dia=None):
+    umidade_val, temp_val, doc_val = params
+    dias_simulacao = _dias(cervejaria, dias_simulacao)
+    entradas = obter_entradas_diarias(cervejaria, entradas_kg_dia, dias_simulacao)
+    ch4_total_por_kg, n2o_total_por_kg = fatores_vermicompostagem_por_kg(umidade_val)
+
+    emissoes_CH4 = convoluir_perfil(entradas * ch4_total_por_kg, PERFIL_CH4_VERMI, dias_simulacao)
+    emissoes_N2O = convoluir_perfil(entradas * n2o_total_por_kg, PERFIL_N2O_VERMI, dias_simulacao)
+
+    return emissoes_CH4, emissoes_N2O
@@ -0,0 +1,153 @@
+"""Estatísticas de Monte Carlo em fluxo, com memória constante.
+
+``AcumuladorStreaming`` recebe as amostras em blocos e mantém média e variância
+(Welford, combinando blocos pelo método de Chan), mínimo e máximo e um
+t-digest para os quantis (2,5% e 97,5% por padrão). O histograma é opcional e
+só existe com ``limites_histograma`` explícitos: os bins ficam fixos desde o
+início (nunca dependem da ordem dos dados) e valores fora dos limites são
+contados à parte, em ``abaixo`` e ``acima``. Nada cresce com o número de
+amostras: o t-digest fica limitado a cerca de ``compressao / 2`` centróides e o
+histograma ao número de bins. Acumuladores de blocos processados em paralelo
+podem ser combinados com ``mesclar``.
+"""
+
+import numpy as np
+from scipy import stats
+
+
+class TDigest:
+    # t-digest "merging" vetorizado: a cada bloco, centróides e novos pontos são ordenados e
+    # agrupados pela função de escala k1 (arco-seno), que dá centróides pequenos nas caudas
+    def __init__(self, compressao=500):
+        self.compressao = compressao
+        self.medias = np.empty(0)
+        self.pesos = np.empty(0)
+        self.minimo = np.inf
+        self.maximo = -np.inf
+
+    @property
+    def n(self):
+        return float(self.pesos.sum())
+
+    def _comprimir(self, medias, pesos):
+        ordem = np.argsort(medias, kind='stable')
+        medias, pesos = medias[ordem], pesos[ordem]
+        acumulado = np.cumsum(pesos)
+        q_centro = (acumulado - pesos / 2) / acumulado[-1]
+        k = self.compressao / (2 * np.pi) * np.arcsin(2 * q_centro - 1)
+        grupos = np.floor(k - k[0]).astype(np.int64)
+        inicios = np.flatnonzero(np.diff(grupos, prepend=-1))
+        pesos_grupos = np.add.reduceat(pesos, inicios)
+        self.medias = np.add.reduceat(medias * pesos, inicios) / pesos_grupos
+        self.pesos = pesos_grupos
+
+    def atualizar(self, valores):
+        valores = np.asarray(valores, dtype=np.float64).ravel()
+        if valores.size == 0:
+            return
+        self.minimo = min(self.minimo, float(valores.min()))
+        self.maximo = max(self.maximo, float(valores.max()))
+        self._comprimir(np.concatenate([self.medias, valores]),
+                        np.concatenate([self.pesos, np.ones(valores.size)]))
+
+    def mesclar(self, outro):
+        if outro.pesos.size == 0:
+            return
+        self.minimo = min(self.minimo, outro.minimo)
+        self.maximo = max(self.maximo, outro.maximo)
+        self._comprimir(np.concatenate([self.medias, outro.medias]), np.concatenate([self.pesos, outro.pesos]))
+
+    def quantil(self, q):
+        if self.pesos.size == 0:
+            return np.full(np.shape(q), np.nan) if np.ndim(q) else np.nan
+        acumulado = np.cumsum(self.pesos)
+        centros = (acumulado - self.pesos / 2) / acumulado[-1]
+        return np.interp(q, np.concatenate([[0.0], centros, [1.0]]),
+                         np.concatenate([[self.minimo], self.medias, [self.maximo]]))
+
+
+class AcumuladorStreaming:
+    def __init__(self, quantis=(0.025, 0.975), limites_histograma=None, n_bins=50, compressao=500):
+        # Sem limites_histograma (inferior, superior) não há histograma
+        self.quantis = tuple(quantis)
+        self.n_bins = n_bins
+        self.bordas = None
+        if limites_histograma is not None:
+            inferior, superior = map(float, limites_histograma)
+            if not inferior < superior:
+                raise ValueError(f"Limites do histograma inválidos: {limites_histograma!r}")
+            self.bordas = np.linspace(inferior, superior, n_bins + 1)
+        self.contagens = np.zeros(n_bins, dtype=np.int64)
+        self.abaixo = 0
+        self.acima = 0
+        self.n = 0
+        self.media = 0.0
+        self.m2 = 0.0
+        self.digest = TDigest(compressao)
+
+    def _combinar_momentos(self, n_b, media_b, m2_b):
+        n_a = self.n
+        n = n_a + n_b
+        delta = media_b - self.media
+        self.media += delta * n_b / n
+        self.m2 += m2_b + delta ** 2 * n_a * n_b / n
+        self.n = n
+
+    def atualizar(self, bloco):
+        bloco = np.asarray(bloco, dtype=np.float64).ravel()
+        if bloco.size == 0:
+            return
+        media_bloco = float(bloco.mean())
+        self._combinar_momentos(bloco.size, media_bloco, float(((bloco - media_bloco) ** 2).sum()))
+        self.digest.atualizar(bloco)
+
+        if self.bordas is None:
+            return
+        self.abaixo += int(np.count_nonzero(bloco < self.bordas[0]))
+        self.acima += int(np.count_nonzero(bloco > self.bordas[-1]))
+        self.contagens += np.histogram(bloco, bins=self.bordas)[0]
+
+    def mesclar(self, outro):
+        if (self.bordas is None) != (outro.bordas is None) or (
+                self.bordas is not None and not np.array_equal(self.bordas, outro.bordas)):
+            raise ValueError("Só é possível mesclar acumuladores com os mesmos bins de histograma")
+        if outro.n == 0:
+            return
+        self._combinar_momentos(outro.n, outro.media, outro.m2)
+        self.digest.mesclar(outro.digest)
+        self.contagens += outro.contagens
+        self.abaixo += outro.abaixo
+        self.acima += outro.acima
+
+    @property
+    def variancia(self):
+        return self.m2 / (self.n - 1) if self.n > 1 else np.nan
+
+    @property
+    def desvio(self):
+        return float(np.sqrt(self.variancia))
+
+    def quantil(self, q):
+        return self.digest.quantil(q)
+
+    def histograma(self):
+        if self.bordas is None:
+            raise ValueError("Histograma desativado: informe limites_histograma ao criar o acumulador")
+        return self.contagens.copy(), self.bordas.copy()
+
+    def resumo(self):
+        return {
+            'n': self.n,
+            'media': self.media,
+            'desvio': self.desvio,
+            'minimo': self.digest.minimo,
+            'maximo': self.digest.maximo,
+            **{f'q{100 * q:g}': float(self.quantil(q)) for q in self.quantis},
+        }
+
+
+def teste_t_pareado_streaming(acumulador_diferencas):
+    # O teste t pareado só depende de n, média e variância das diferenças (compost − vermi)
+    n = acumulador_diferencas.n
+    t = acumulador_diferencas.media / (acumulador_diferencas.desvio / np.sqrt(n))
+    return float(t), float(2 * stats.t.sf(abs(t), n - 1))
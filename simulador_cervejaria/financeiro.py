@@ -0,0 +1,44 @@
+"""Valoração dos créditos de carbono.
+
+A valoração parte de séries anuais de emissões evitadas já calculadas, de modo
+que cenários de preço, câmbio e desconto não tocam o motor de emissões.
+"""
+
+import numpy as np
+
+
+def calcular_valor_creditos(emissoes_evitadas_tco2eq, preco_carbono_por_tonelada, moeda, taxa_cambio=1):
+    valor_total = emissoes_evitadas_tco2eq * preco_carbono_por_tonelada * taxa_cambio
+    return valor_total
+
+def fatores_desconto(taxas_desconto, n_anos):
+    # Desconto no fim de cada ano: o ano 1 é dividido por (1 + r)
+    taxas = np.atleast_1d(np.asarray(taxas_desconto, dtype=float))
+    anos = np.arange(1, n_anos + 1)
+    return (1.0 + taxas[:, None]) ** -anos[None, :]
+
+def valorar_reducoes(reducoes_anuais, precos_carbono, taxas_cambio, taxas_desconto):
+    # Grade preços × câmbios × descontos em uma única passada vetorizada.
+    # Formas: receita anual EUR (P, A), BRL (P, C, A); VPL EUR (P, D), BRL (P, C, D)
+    reducoes = np.asarray(reducoes_anuais, dtype=float)
+    precos = np.atleast_1d(np.asarray(precos_carbono, dtype=float))
+    cambios = np.atleast_1d(np.asarray(taxas_cambio, dtype=float))
+    fatores = fatores_desconto(taxas_desconto, len(reducoes))
+
+    receita_anual_eur = calcular_valor_creditos(reducoes[None, :], precos[:, None], "€")
+    reducoes_descontadas = fatores @ reducoes
+    vpl_eur = precos[:, None] * reducoes_descontadas[None, :]
+
+    return {
+        'receita_anual_eur': receita_anual_eur,
+        'receita_anual_brl': receita_anual_eur[:, None, :] * cambios[None, :, None],
+        'vpl_eur': vpl_eur,
+        'vpl_brl': vpl_eur[:, None, :] * cambios[None, :, None],
+    }
+
+def valorar_cenarios_precos(reducoes_por_metodo, precos_carbono, taxas_cambio, taxas_desconto):
+    # reducoes_por_metodo: {'compostagem': série anual, 'vermicompostagem': série anual}
+    return {
+        metodo: valorar_reducoes(reducoes, precos_carbono, taxas_cambio, taxas_desconto)
+        for metodo, reducoes in reducoes_por_metodo.items()
+    }
@@ -0,0 +1,184 @@
+"""Análise de incerteza (Monte Carlo) e comparação estatística entre os métodos.
+
+Os geradores ``gerar_parametros_mc_*`` reproduzem as sementes globais originais
+(50 e 51). Com ``amostrador`` ('mc', 'lhs' ou 'sobol'), as mesmas marginais são
+amostradas por ``simulador_cervejaria.amostragem`` com um ``Generator`` próprio.
+``executar_monte_carlo_streaming`` roda em blocos e devolve só um
+``AcumuladorStreaming``, com memória constante para qualquer número de simulações.
+``executar_monte_carlo_adaptativo`` avalia os dois métodos sobre os mesmos pontos
+uniformes (amostras pareadas) em lotes e para ao atingir as metas de precisão,
+nunca antes de ``n_minimo_precisao`` simulações (abaixo disso o IC dos limites
+por estatísticas de ordem não existe).
+"""
+
+import numpy as np
+from scipy import stats
+
+from .amostragem import AMOSTRADORES, amostrar_marginais, blocos_marginais, blocos_uniformes, transformar_marginais
+from .estatisticas import AcumuladorStreaming
+from .instrumentacao import instrumentar
+from .totais import executar_simulacao_lote_cervejaria
+
+
+def gerar_parametros_mc_compost(n):
+    np.random.seed(50)  # Seed para compostagem tradicional
+    umidade_vals = np.random.uniform(0.75, 0.90, n)
+    temp_vals = np.random.normal(25, 3, n)
+    doc_vals = np.random.triangular(0.70, 0.80, 0.90, n)
+    return umidade_vals, temp_vals, doc_vals
+
+def gerar_parametros_mc_vermi(n):
+    np.random.seed(51)  # SEED DIFERENTE para vermicompostagem!
+    umidade_vals = np.random.uniform(0.78, 0.88, n)  # Faixa mais estreita
+    temp_vals = np.random.normal(28, 2, n)  # Temperatura ideal para minhocas
+    doc_vals = np.random.triangular(0.75, 0.82, 0.88, n)  # DOC mais alto
+    return umidade_vals, temp_vals, doc_vals
+
+GERADORES_MC = {
+    'compostagem': gerar_parametros_mc_compost,
+    'vermicompostagem': gerar_parametros_mc_vermi,
+}
+
+# Mesmas marginais dos geradores acima, na forma (tipo, parâmetros) para as CDFs inversas
+DISTRIBUICOES_MC = {
+    'compostagem': [('uniforme', (0.75, 0.90)), ('normal', (25, 3)), ('triangular', (0.70, 0.80, 0.90))],
+    'vermicompostagem': [('uniforme', (0.78, 0.88)), ('normal', (28, 2)), ('triangular', (0.75, 0.82, 0.88))],
+}
+SEMENTES_MC = {'compostagem': 50, 'vermicompostagem': 51}
+
+def gerar_parametros_mc(metodo, n, amostrador=None, semente=None):
+    if amostrador is None:
+        return GERADORES_MC[metodo](n)
+    semente = SEMENTES_MC[metodo] if semente is None else semente
+    return tuple(amostrar_marginais(DISTRIBUICOES_MC[metodo], n, amostrador, semente))
+
+
+@instrumentar('monte_carlo')
+def executar_monte_carlo(n_simulations, metodo, cervejaria, amostrador=None, semente=None):
+    umidade_vals, temp_vals, doc_vals = gerar_parametros_mc(metodo, n_simulations, amostrador, semente)
+    return executar_simulacao_lote_cervejaria(umidade_vals, temp_vals, doc_vals, cervejaria, metodo)
+
+@instrumentar('monte_carlo_streaming')
+def executar_monte_carlo_streaming(n_simulations, metodo, cervejaria, amostrador='mc', semente=None,
+                                   tamanho_bloco=4096, acumulador=None):
+    # Cada bloco de resultados é consumido pelo acumulador e descartado; nada guarda as n amostras
+    semente = SEMENTES_MC[metodo] if semente is None else semente
+    acumulador = acumulador or AcumuladorStreaming()
+    for umidade_vals, temp_vals, doc_vals in blocos_marginais(DISTRIBUICOES_MC[metodo], n_simulations,
+                                                             tamanho_bloco, amostrador, semente):
+        acumulador.atualizar(executar_simulacao_lote_cervejaria(umidade_vals, temp_vals, doc_vals, cervejaria, metodo))
+    return acumulador
+
+def _postos_limites(n, q, z):
+    # Postos (base 0) das estatísticas de ordem do IC binomial do quantil q, sem truncar
+    meia_largura = z * np.sqrt(n * q * (1 - q))
+    return int(np.floor(n * q - meia_largura)), int(np.ceil(n * q + meia_largura))
+
+def n_minimo_precisao(z=1.96, quantis=(0.025, 0.975)):
+    # Menor n em que os dois postos de todos os quantis caem dentro da amostra com pelo menos
+    # uma observação de folga (n·q − z·√(n·q·(1−q)) ≥ 1 e o simétrico na cauda superior)
+    n = 2
+    while not all(n * p - z * np.sqrt(n * p * (1 - p)) >= 1 for q in quantis for p in (q, 1 - q)):
+        n += 1
+    return n
+
+def precisao_monte_carlo(resultados, z=1.96, quantis=(0.025, 0.975)):
+    # (erro padrão da média, largura do IC 95% dos percentis 2,5%/97,5%), ambos relativos a |média|.
+    # O IC dos percentis usa estatísticas de ordem (binomial), sem supor distribuição; com n
+    # pequeno demais para os postos caberem na amostra, a largura é NaN (IC indefinido)
+    n = resultados.size
+    media = abs(float(resultados.mean()))
+    erro_padrao = float(resultados.std(ddof=1) / np.sqrt(n)) / media
+    postos = [_postos_limites(n, q, z) for q in quantis]
+    if min(inferior for inferior, _ in postos) < 0 or max(superior for _, superior in postos) > n - 1:
+        return erro_padrao, float('nan')
+    # Seleção parcial (linear) só das estatísticas de ordem usadas, em vez de ordenar tudo
+    indices = sorted({posto for par in postos for posto in par})
+    selecionados = dict(zip(indices, np.partition(resultados, indices)[indices]))
+    larguras = [selecionados[superior] - selecionados[inferior] for inferior, superior in postos]
+    return erro_padrao, float(max(larguras)) / media
+
+@instrumentar('monte_carlo_adaptativo')
+def executar_monte_carlo_adaptativo(cervejaria, erro_padrao_max=0.005, largura_limites_max=0.03, n_max=10000,
+                                    tamanho_lote=100, amostrador='mc', semente=None, ao_lote=None):
+    # Lotes de tamanho_lote pontos até que, para os dois métodos, o erro padrão relativo da
+    # média e a largura relativa do IC dos limites 2,5%/97,5% fiquem abaixo das metas (ou até
+    # n_max). A regra de parada só vale a partir de n_minimo_precisao() simulações. Os dois métodos recebem os mesmos pontos uniformes, cada um levado às suas
+    # marginais, então resultados[i] de compostagem e vermicompostagem formam pares válidos
+    # para ttest_rel/wilcoxon. ao_lote(historico) é chamado após cada lote (traço ao vivo).
+    semente = SEMENTES_MC['compostagem'] if semente is None else semente
+    n_minimo = n_minimo_precisao()
+    buffers = {metodo: np.empty(n_max) for metodo in DISTRIBUICOES_MC}
+    historico = []
+    convergiu = False
+    n = 0
+    for u in blocos_uniformes(3, n_max, tamanho_lote, amostrador, semente):
+        inicio, n = n, n + len(u)
+        linha = {'n': n}
+        for metodo, distribuicoes in DISTRIBUICOES_MC.items():
+            buffers[metodo][inicio:n] = executar_simulacao_lote_cervejaria(
+                *transformar_marginais(distribuicoes, u), cervejaria, metodo)
+            amostras = buffers[metodo][:n]
+            linha[f'media_{metodo}'] = float(amostras.mean())
+            linha[f'erro_padrao_{metodo}'], linha[f'largura_limites_{metodo}'] = precisao_monte_carlo(amostras)
+        historico.append(linha)
+        if ao_lote is not None:
+            ao_lote(historico)
+        convergiu = n >= n_minimo and all(
+            linha[f'erro_padrao_{metodo}'] <= erro_padrao_max and linha[f'largura_limites_{metodo}'] <= largura_limites_max
+            for metodo in DISTRIBUICOES_MC)
+        if convergiu:
+            break
+    resultados = {metodo: buffer[:n].copy() for metodo, buffer in buffers.items()}
+
+    convergencia = {
+        'n_simulations': n,
+        'avaliacoes': n * len(DISTRIBUICOES_MC),
+        'convergiu': convergiu,
+        'erro_padrao_max': erro_padrao_max,
+        'largura_limites_max': largura_limites_max,
+        'historico': historico,
+    }
+    return resultados, convergencia
+
+def amostras_necessarias(metodo, cervejaria, largura_relativa=0.01, amostradores=tuple(AMOSTRADORES),
+                         tamanhos=tuple(2 ** k for k in range(5, 14)), replicas=20, nivel=(2.5, 97.5)):
+    # Para cada amostrador, o menor n (potência de dois) em que o IC 95% dos percentis do
+    # intervalo (2,5% e 97,5%), estimado por réplicas independentes, fica mais estreito que
+    # largura_relativa × |média|. n_necessario None = nenhum tamanho testado bastou.
+    relatorio = []
+    for amostrador in amostradores:
+        linha = {'amostrador': amostrador, 'n_necessario': None, 'largura_relativa': None}
+        for n in tamanhos:
+            percentis = np.array([
+                np.percentile(executar_monte_carlo(n, metodo, cervejaria, amostrador, semente=r), nivel)
+                for r in range(replicas)
+            ])
+            media = np.mean(executar_monte_carlo(n, metodo, cervejaria, amostrador, semente=replicas))
+            largura = float(np.max(2 * 1.96 * percentis.std(axis=0, ddof=1)) / abs(media))
+            linha['largura_relativa'] = largura
+            if largura <= largura_relativa:
+                linha['n_necessario'] = n
+                break
+        relatorio.append(linha)
+    return relatorio
+
+@instrumentar('testes_estatisticos')
+def comparar_metodos(results_array_compost, results_array_vermi):
+    # Teste de normalidade para as diferenças
+    diferencas = results_array_compost - results_array_vermi
+    _, p_valor_normalidade_diff = stats.normaltest(diferencas)
+
+    # Teste T pareado
+    ttest_pareado, p_ttest_pareado = stats.ttest_rel(results_array_compost, results_array_vermi)
+
+    # Teste de Wilcoxon para amostras pareadas
+    wilcoxon_stat, p_wilcoxon = stats.wilcoxon(results_array_compost, results_array_vermi)
+
+    return {
+        'p_normalidade': p_valor_normalidade_diff,
+        'ttest': ttest_pareado,
+        'p_ttest': p_ttest_pareado,
+        'wilcoxon': wilcoxon_stat,
+        'p_wilcoxon': p_wilcoxon,
+    }
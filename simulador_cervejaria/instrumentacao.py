@@ -0,0 +1,152 @@
+"""Instrumentação das fases quentes: cronômetros e contadores por processo.
+
+``cronometrar(nome)`` (gerenciador de contexto) e ``instrumentar(nome)``
+(decorador) acumulam, por fase, número de chamadas, tempo total, máximo e
+último; ``contar(nome)`` incrementa contadores de eventos. As métricas ficam em
+um registro global thread-safe, exposto como tabela (``instantaneo``), em texto
+no formato de exposição do Prometheus (``texto_prometheus``) e, se
+``SIMULADOR_METRICAS_PORTA`` estiver definida, num endpoint HTTP ``/metrics``
+local. Cada medição também é emitida como log estruturado (JSON) no logger
+``simulador_cervejaria.metricas`` em nível DEBUG.
+"""
+
+import functools
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+logger = logging.getLogger('simulador_cervejaria.metricas')
+
+PREFIXO_METRICAS = 'simulador_cervejaria'
+
+
+class RegistroMetricas:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._fases = {}
+        self._contadores = {}
+
+    def registrar_tempo(self, nome, segundos):
+        with self._lock:
+            fase = self._fases.setdefault(nome, {'chamadas': 0, 'total_s': 0.0, 'max_s': 0.0, 'ultimo_s': 0.0})
+            fase['chamadas'] += 1
+            fase['total_s'] += segundos
+            fase['max_s'] = max(fase['max_s'], segundos)
+            fase['ultimo_s'] = segundos
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(json.dumps({'fase': nome, 'segundos': round(segundos, 6)}))
+
+    def contar(self, nome, n=1):
+        with self._lock:
+            self._contadores[nome] = self._contadores.get(nome, 0) + n
+
+    def instantaneo(self):
+        with self._lock:
+            fases = {nome: dict(fase) for nome, fase in self._fases.items()}
+            contadores = dict(self._contadores)
+        return fases, contadores
+
+    def zerar(self):
+        with self._lock:
+            self._fases.clear()
+            self._contadores.clear()
+
+    def texto_prometheus(self):
+        fases, contadores = self.instantaneo()
+        linhas = [
+            f'# HELP {PREFIXO_METRICAS}_fase_segundos_total Tempo acumulado por fase.',
+            f'# TYPE {PREFIXO_METRICAS}_fase_segundos_total counter',
+        ]
+        linhas += [f'{PREFIXO_METRICAS}_fase_segundos_total{{fase="{nome}"}} {fase["total_s"]:.6f}'
+                   for nome, fase in sorted(fases.items())]
+        linhas += [
+            f'# HELP {PREFIXO_METRICAS}_fase_chamadas_total Chamadas por fase.',
+            f'# TYPE {PREFIXO_METRICAS}_fase_chamadas_total counter',
+        ]
+        linhas += [f'{PREFIXO_METRICAS}_fase_chamadas_total{{fase="{nome}"}} {fase["chamadas"]}'
+                   for nome, fase in sorted(fases.items())]
+        linhas += [
+            f'# HELP {PREFIXO_METRICAS}_fase_segundos_max Maior duração observada por fase.',
+            f'# TYPE {PREFIXO_METRICAS}_fase_segundos_max gauge',
+        ]
+        linhas += [f'{PREFIXO_METRICAS}_fase_segundos_max{{fase="{nome}"}} {fase["max_s"]:.6f}'
+                   for nome, fase in sorted(fases.items())]
+        linhas += [
+            f'# HELP {PREFIXO_METRICAS}_eventos_total Contadores de eventos.',
+            f'# TYPE {PREFIXO_METRICAS}_eventos_total counter',
+        ]
+        linhas += [f'{PREFIXO_METRICAS}_eventos_total{{evento="{nome}"}} {valor}'
+                   for nome, valor in sorted(contadores.items())]
+        return '\n'.join(linhas) + '\n'
+
+
+metricas = RegistroMetricas()
+
+
+@contextmanager
+def cronometrar(nome, registro=None):
+    registro = registro or metricas
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        registro.registrar_tempo(nome, time.perf_counter() - inicio)
+
+def instrumentar(nome):
+    def decorador(funcao):
+        @functools.wraps(funcao)
+        def envoltorio(*args, **kwargs):
+            with cronometrar(nome):
+                return funcao(*args, **kwargs)
+        return envoltorio
+    return decorador
+
+def contar(nome, n=1):
+    metricas.contar(nome, n)
+
+
+def _criar_servidor_metricas(endereco, porta):
+    # http.server só é importado quando o endpoint é pedido, para não pesar no import do pacote
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class TratadorMetricas(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split('?')[0] != '/metrics':
+                self.send_error(404)
+                return
+            corpo = metricas.texto_prometheus().encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+            self.send_header('Content-Length', str(len(corpo)))
+            self.end_headers()
+            self.wfile.write(corpo)
+
+        def log_message(self, formato, *args):
+            pass
+
+    return ThreadingHTTPServer((endereco, porta), TratadorMetricas)
+
+
+_servidor = None
+_servidor_tentado = False
+_lock_servidor = threading.Lock()
+
+def iniciar_servidor_metricas(porta=None, endereco='127.0.0.1'):
+    # Idempotente: uma única tentativa por processo, mesmo com vários reruns/sessões do Streamlit
+    global _servidor, _servidor_tentado
+    porta = porta or os.environ.get('SIMULADOR_METRICAS_PORTA')
+    if not porta:
+        return None
+    with _lock_servidor:
+        if not _servidor_tentado:
+            _servidor_tentado = True
+            try:
+                _servidor = _criar_servidor_metricas(endereco, int(porta))
+            except OSError as erro:
+                logger.warning("Endpoint de métricas indisponível na porta %s: %s", porta, erro)
+            else:
+                threading.Thread(target=_servidor.serve_forever, name='metricas-http', daemon=True).start()
+    return _servidor
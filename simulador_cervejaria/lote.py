@@ -0,0 +1,155 @@
+"""Simulação em lote de um portfólio de cervejarias, com saída colunar em Parquet.
+
+Cada linha do arquivo de entrada (CSV ou Parquet) traz os campos de
+``ParametrosCervejaria``; colunas ausentes e células vazias assumem os valores
+padrão da barra lateral, e uma linha inválida interrompe a leitura com uma
+mensagem que a identifica. Os totais anuais de cada cervejaria vêm das somas de kernels por ano
+(sem materializar séries diárias), e cada bloco é gravado como um row group
+assim que fica pronto, de modo que a memória não cresce com o tamanho do
+portfólio.
+
+Uso::
+
+    python -m simulador_cervejaria entrada.csv saida.parquet --preco-carbono 85.5 --taxa-cambio 5.5
+"""
+
+import argparse
+import os
+from dataclasses import fields
+from pathlib import Path
+
+from joblib.externals.loky import get_reusable_executor
+import numpy as np
+import pandas as pd
+
+from .financeiro import calcular_valor_creditos
+from .parametros import ParametrosCervejaria, validar_parametro
+from .totais import calcular_totais_anuais_cervejaria
+
+CAMPOS_PARAMETROS = [campo.name for campo in fields(ParametrosCervejaria)]
+PADROES_PARAMETROS = {campo.name: campo.default for campo in fields(ParametrosCervejaria)}
+# Além das faixas físicas (dias e anos já começam em 1), a produção precisa ser estritamente positiva
+CAMPOS_POSITIVOS = ('producao_mensal_litros',)
+COLUNA_ID = 'id'
+
+
+def ler_cervejarias(caminho):
+    caminho = Path(caminho)
+    if caminho.suffix.lower() in ('.parquet', '.pq'):
+        tabela = pd.read_parquet(caminho)
+    else:
+        tabela = pd.read_csv(caminho)
+
+    ids = tabela[COLUNA_ID].astype(str).tolist() if COLUNA_ID in tabela else [str(i) for i in range(len(tabela))]
+    colunas = [c for c in CAMPOS_PARAMETROS if c in tabela]
+    cervejarias = []
+    for linha, (id_cervejaria, registro) in enumerate(zip(ids, tabela[colunas].to_dict('records')), start=1):
+        try:
+            cervejarias.append(converter_registro(registro))
+        except (TypeError, ValueError) as erro:
+            raise ValueError(f"{caminho.name}, linha {linha} ({COLUNA_ID}={id_cervejaria}): {erro}") from erro
+    return ids, cervejarias
+
+def converter_registro(registro):
+    # Células vazias (NaN) assumem o padrão da barra lateral; campos inteiros só aceitam valores
+    # inteiros (20.0 do Parquet/CSV vira 20, 20.5 é rejeitado) e todos os campos precisam estar
+    # na faixa física (percentuais em 0–100, DOC em 0–1, horas expostas em 0–24)
+    valores = {}
+    for campo, valor in registro.items():
+        if pd.isna(valor):
+            valor = PADROES_PARAMETROS[campo]
+        numero = validar_parametro(campo, valor)
+        if campo in CAMPOS_POSITIVOS and numero <= 0:
+            raise ValueError(f"{campo}: {valor!r} deve ser positivo")
+        valores[campo] = numero
+    return ParametrosCervejaria(**valores)
+
+def simular_cervejaria(cervejaria, preco_carbono, taxa_cambio):
+    totais = calcular_totais_anuais_cervejaria(cervejaria.params_base, cervejaria)
+    anos = int(cervejaria.anos_simulacao)
+
+    aterro = totais['CH4_Aterro_tCO2eq'] + totais['N2O_Aterro_tCO2eq']
+    compost = totais['CH4_Compost_tCO2eq'] + totais['N2O_Compost_tCO2eq']
+    vermi = totais['CH4_Vermi_tCO2eq'] + totais['N2O_Vermi_tCO2eq']
+
+    reducao_compost = aterro - compost
+    reducao_vermi = aterro - vermi
+    return {
+        'ano': np.arange(1, anos + 1),
+        'aterro_tco2eq': aterro,
+        'compost_tco2eq': compost,
+        'vermi_tco2eq': vermi,
+        'reducao_compost_tco2eq': reducao_compost,
+        'reducao_vermi_tco2eq': reducao_vermi,
+        'valor_compost_eur': calcular_valor_creditos(reducao_compost, preco_carbono, "€"),
+        'valor_vermi_eur': calcular_valor_creditos(reducao_vermi, preco_carbono, "€"),
+        'valor_compost_brl': calcular_valor_creditos(reducao_compost, preco_carbono, "R$", taxa_cambio),
+        'valor_vermi_brl': calcular_valor_creditos(reducao_vermi, preco_carbono, "R$", taxa_cambio),
+    }
+
+def simular_bloco(ids, cervejarias, preco_carbono, taxa_cambio):
+    partes = []
+    for id_cervejaria, cervejaria in zip(ids, cervejarias):
+        resultado = simular_cervejaria(cervejaria, preco_carbono, taxa_cambio)
+        partes.append(pd.DataFrame({COLUNA_ID: id_cervejaria, **resultado}))
+    return pd.concat(partes, ignore_index=True)
+
+def executar_lote(entrada, saida, preco_carbono, taxa_cambio, n_workers=None, tamanho_bloco=256):
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as erro:
+        raise RuntimeError("A saída em Parquet requer o pacote 'pyarrow'") from erro
+
+    ids, cervejarias = ler_cervejarias(entrada)
+    if not cervejarias:
+        raise ValueError(f"Nenhuma cervejaria em {entrada}; nada foi gravado")
+    n_workers = n_workers or os.cpu_count() or 1
+    inicios = range(0, len(cervejarias), tamanho_bloco)
+    blocos_ids = [ids[i:i + tamanho_bloco] for i in inicios]
+    blocos_cervejarias = [cervejarias[i:i + tamanho_bloco] for i in inicios]
+    n_blocos = len(blocos_ids)
+
+    if n_workers == 1:
+        resultados = map(simular_bloco, blocos_ids, blocos_cervejarias,
+                         [preco_carbono] * n_blocos, [taxa_cambio] * n_blocos)
+    else:
+        executor = get_reusable_executor(max_workers=n_workers, reuse=True)
+        resultados = executor.map(simular_bloco, blocos_ids, blocos_cervejarias,
+                                  [preco_carbono] * n_blocos, [taxa_cambio] * n_blocos)
+
+    escritor = None
+    n_linhas = 0
+    try:
+        for tabela_bloco in resultados:
+            tabela = pa.Table.from_pandas(tabela_bloco, preserve_index=False)
+            if escritor is None:
+                escritor = pq.ParquetWriter(saida, tabela.schema)
+            escritor.write_table(tabela)
+            n_linhas += tabela.num_rows
+    finally:
+        if escritor is not None:
+            escritor.close()
+
+    return len(cervejarias), n_linhas
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m simulador_cervejaria',
+        description="Simula um portfólio de cervejarias e grava os totais anuais em Parquet.",
+    )
+    parser.add_argument('entrada', help="CSV ou Parquet com uma cervejaria por linha (colunas de ParametrosCervejaria)")
+    parser.add_argument('saida', help="Arquivo Parquet de saída")
+    parser.add_argument('--preco-carbono', type=float, default=85.50, help="Preço do carbono em €/tCO₂eq")
+    parser.add_argument('--taxa-cambio', type=float, default=5.50, help="Câmbio EUR/BRL")
+    parser.add_argument('--workers', type=int, default=None, help="Processos do pool (padrão: um por núcleo)")
+    parser.add_argument('--tamanho-bloco', type=int, default=256, help="Cervejarias por tarefa enviada ao pool")
+    args = parser.parse_args(argv)
+
+    try:
+        n_cervejarias, n_linhas = executar_lote(
+            args.entrada, args.saida, args.preco_carbono, args.taxa_cambio, args.workers, args.tamanho_bloco
+        )
+    except (RuntimeError, ValueError) as erro:
+        parser.exit(1, f"erro: {erro}\n")
+    print(f"{n_cervejarias} cervejarias simuladas; {n_linhas} linhas gravadas em {args.saida}")
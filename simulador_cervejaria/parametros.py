@@ -0,0 +1,97 @@
+"""Parâmetros de entrada de uma cervejaria (equivalentes aos controles da barra lateral)."""
+
+import math
+from dataclasses import dataclass, fields
+
+
+@dataclass(frozen=True)
+class ParametrosCervejaria:
+    producao_mensal_litros: float = 1500
+    dias_operacao_mes: int = 25
+    fator_residuos: float = 0.17  # kg de resíduo por litro de cerveja
+    percentual_bagaco: float = 80
+    umidade_bagaco: float = 80  # %
+    umidade_levedura: float = 90  # %
+    temperatura: float = 25  # °C
+    doc_bagaco: float = 0.80
+    doc_levedura: float = 0.90
+    h_exposta: float = 8  # horas de exposição por dia
+    anos_simulacao: int = 20
+
+    @property
+    def residuos_kg_dia(self):
+        return (self.producao_mensal_litros * self.fator_residuos) / self.dias_operacao_mes
+
+    @property
+    def massa_exposta_kg(self):
+        # Toda a produção diária é exposta
+        return self.residuos_kg_dia
+
+    @property
+    def percentual_levedura(self):
+        return 100 - self.percentual_bagaco
+
+    @property
+    def umidade_media(self):
+        # Umidade média ponderada pela composição (%)
+        return (self.umidade_bagaco * self.percentual_bagaco + self.umidade_levedura * self.percentual_levedura) / 100
+
+    @property
+    def umidade(self):
+        return self.umidade_media / 100.0
+
+    @property
+    def doc(self):
+        # DOC médio ponderado pela composição
+        return (self.doc_bagaco * self.percentual_bagaco + self.doc_levedura * self.percentual_levedura) / 100
+
+    @property
+    def docf(self):
+        return 0.0147 * self.temperatura + 0.28
+
+    @property
+    def dias(self):
+        return self.anos_simulacao * 365
+
+    @property
+    def params_base(self):
+        return [self.umidade, self.temperatura, self.doc]
+
+
+TIPOS_PARAMETROS = {campo.name: campo.type for campo in fields(ParametrosCervejaria)}
+
+# Faixas fisicamente possíveis (inclusivas; None = sem limite): percentuais em 0–100, DOC
+# como fração em 0–1, horas de exposição dentro do dia
+LIMITES_FISICOS = {
+    'producao_mensal_litros': (0, None),
+    'dias_operacao_mes': (1, 31),
+    'fator_residuos': (0, None),
+    'percentual_bagaco': (0, 100),
+    'umidade_bagaco': (0, 100),
+    'umidade_levedura': (0, 100),
+    'temperatura': (None, None),
+    'doc_bagaco': (0, 1),
+    'doc_levedura': (0, 1),
+    'h_exposta': (0, 24),
+    'anos_simulacao': (1, None),
+}
+
+
+def validar_parametro(campo, valor, limites=LIMITES_FISICOS):
+    # Valor convertido ao tipo do campo; ValueError se não numérico ou não finito, não inteiro
+    # num campo inteiro ("8.5" não vira 8) ou fora de limites[campo]
+    try:
+        numero = float(valor)
+    except (TypeError, ValueError):
+        raise ValueError(f"{campo}: {valor!r} não é numérico") from None
+    if not math.isfinite(numero):
+        raise ValueError(f"{campo}: {valor!r} não é finito")
+    if TIPOS_PARAMETROS[campo] is int:
+        if not numero.is_integer():
+            raise ValueError(f"{campo}: {valor!r} deve ser inteiro")
+        numero = int(numero)
+    inferior, superior = limites[campo]
+    if (inferior is not None and numero < inferior) or (superior is not None and numero > superior):
+        faixa = f"[{'-∞' if inferior is None else f'{inferior:g}'}, {'∞' if superior is None else f'{superior:g}'}]"
+        raise ValueError(f"{campo}: {valor!r} fora da faixa {faixa}")
+    return numero
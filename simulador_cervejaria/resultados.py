@@ -0,0 +1,99 @@
+"""Representação compacta dos resultados diários de uma simulação.
+
+Só as seis séries primitivas (kg/dia de CH₄ e N₂O por cenário) ficam em
+memória, opcionalmente em float32; tCO₂eq, totais, acumulados, reduções e os
+resumos anual e mensal são calculados sob demanda. Acumulações são feitas
+sempre em float64, mesmo quando as séries estão em float32.
+"""
+
+import numpy as np
+import pandas as pd
+
+from .agregacao import totais_anuais, totais_mensais
+from .constantes import GWP_CH4_20, GWP_N2O_20
+
+CENARIOS = ('Aterro', 'Compost', 'Vermi')
+GASES = ('CH4', 'N2O')
+GWP_POR_GAS = {'CH4': GWP_CH4_20, 'N2O': GWP_N2O_20}
+
+
+class ResultadoDiario:
+    def __init__(self, data_inicio, series_kg_dia, dtype=np.float64):
+        # series_kg_dia: {'CH4_Aterro': array, 'N2O_Aterro': array, ...}
+        self.data_inicio = pd.Timestamp(data_inicio)
+        self.dtype = np.dtype(dtype)
+        self.series_kg_dia = {
+            f'{gas}_{cenario}': np.asarray(series_kg_dia[f'{gas}_{cenario}'], dtype=self.dtype)
+            for cenario in CENARIOS for gas in GASES
+        }
+        self.dias = len(self.series_kg_dia['CH4_Aterro'])
+
+    @property
+    def nbytes(self):
+        return sum(serie.nbytes for serie in self.series_kg_dia.values())
+
+    @property
+    def datas(self):
+        return pd.date_range(start=self.data_inicio, periods=self.dias, freq='D')
+
+    def tco2eq_dia(self, gas, cenario):
+        return self.series_kg_dia[f'{gas}_{cenario}'] * (GWP_POR_GAS[gas] / 1000)
+
+    def total_dia(self, cenario):
+        return self.tco2eq_dia('CH4', cenario) + self.tco2eq_dia('N2O', cenario)
+
+    def acumulado(self, cenario):
+        return np.cumsum(self.total_dia(cenario), dtype=np.float64)
+
+    def reducao_acumulada(self, cenario):
+        return self.acumulado('Aterro') - self.acumulado(cenario)
+
+    def total_evitado(self, cenario):
+        return float(np.sum(self.total_dia('Aterro'), dtype=np.float64)
+                     - np.sum(self.total_dia(cenario), dtype=np.float64))
+
+    def _totais_por_cenario(self):
+        return np.stack([self.total_dia(cenario).astype(np.float64) for cenario in CENARIOS])
+
+    def resumo_anual(self):
+        anos, totais = totais_anuais(self._totais_por_cenario(), self.data_inicio)
+        df_anual = pd.DataFrame({'Year': anos})
+        for cenario, total in zip(CENARIOS, totais):
+            df_anual[f'Total_{cenario}_tCO2eq_dia'] = total
+
+        df_anual['Emission reductions Compost (t CO₂eq)'] = df_anual['Total_Aterro_tCO2eq_dia'] - df_anual['Total_Compost_tCO2eq_dia']
+        df_anual['Emission reductions Vermi (t CO₂eq)'] = df_anual['Total_Aterro_tCO2eq_dia'] - df_anual['Total_Vermi_tCO2eq_dia']
+        df_anual['Cumulative reduction Compost (t CO₂eq)'] = df_anual['Emission reductions Compost (t CO₂eq)'].cumsum()
+        df_anual['Cumulative reduction Vermi (t CO₂eq)'] = df_anual['Emission reductions Vermi (t CO₂eq)'].cumsum()
+
+        return df_anual.rename(columns={
+            'Total_Aterro_tCO2eq_dia': 'Baseline emissions (t CO₂eq)',
+            'Total_Compost_tCO2eq_dia': 'Project emissions Compost (t CO₂eq)',
+            'Total_Vermi_tCO2eq_dia': 'Project emissions Vermi (t CO₂eq)',
+        })
+
+    def resumo_mensal(self):
+        meses, totais = totais_mensais(self._totais_por_cenario(), self.data_inicio)
+        df_mensal = pd.DataFrame({'Mês': meses.astype('datetime64[ns]')})
+        for cenario, total in zip(CENARIOS, totais):
+            df_mensal[f'{cenario} (t CO₂eq)'] = total
+        df_mensal['Reduction Compost (t CO₂eq)'] = totais[0] - totais[1]
+        df_mensal['Reduction Vermi (t CO₂eq)'] = totais[0] - totais[2]
+        return df_mensal
+
+    def para_dataframe(self):
+        # Tabela diária completa (mesmas colunas do DataFrame antigo), para exportação
+        df = pd.DataFrame({'Data': self.datas})
+        for nome, serie in self.series_kg_dia.items():
+            df[f'{nome}_kg_dia'] = serie
+        for nome in self.series_kg_dia:
+            gas, cenario = nome.split('_')
+            df[f'{nome}_tCO2eq'] = self.tco2eq_dia(gas, cenario)
+        for cenario in CENARIOS:
+            df[f'Total_{cenario}_tCO2eq_dia'] = self.total_dia(cenario)
+        for cenario in CENARIOS:
+            df[f'Total_{cenario}_tCO2eq_acum'] = self.acumulado(cenario)
+        for cenario in CENARIOS[1:]:
+            df[f'Reducao_{cenario}_tCO2eq_acum'] = self.reducao_acumulada(cenario)
+        df['Year'] = df['Data'].dt.year
+        return df
@@ -0,0 +1,136 @@
+"""Análise de sensibilidade global (Sobol) sobre o modelo vetorizado."""
+
+import os
+import time
+
+from joblib.externals.loky import get_reusable_executor
+import numpy as np
+from SALib.analyze.sobol import analyze
+from SALib.sample.sobol import sample
+
+from .instrumentacao import metricas
+from .totais import executar_simulacao_lote_cervejaria
+
+# Semente fixa do modo adaptativo: com ela, o desenho de Saltelli para N amostras é prefixo
+# do desenho para 2N, e as avaliações já feitas são reaproveitadas a cada duplicação
+SEMENTE_SOBOL = 2024
+
+PROBLEMA_SOBOL_CERVEJARIA = {
+    'num_vars': 3,
+    'names': ['umidade', 'T', 'DOC'],
+    'bounds': [
+        [0.75, 0.90],    # Umidade para cervejaria
+        [20.0, 35.0],    # Temperatura
+        [0.70, 0.90],    # DOC para cervejaria
+    ]
+}
+
+
+def _avaliar_bloco_sobol(bloco, metodo, cervejaria):
+    return executar_simulacao_lote_cervejaria(bloco[:, 0], bloco[:, 1], bloco[:, 2], cervejaria, metodo)
+
+def avaliar_em_blocos(param_values, metodo, cervejaria, tamanho_bloco=None, n_workers=1, ao_progresso=None):
+    # Divide a matriz de Saltelli em blocos contíguos (um por worker, por padrão) e avalia
+    # cada bloco com o modelo vetorizado. Por padrão tudo roda no próprio processo; o pool do
+    # loky (que permanece aquecido entre chamadas) só é iniciado com n_workers > 1, ou com
+    # n_workers=0/None, que pedem um worker por núcleo.
+    # ao_progresso(fração das linhas avaliadas) é chamado a cada bloco recebido, na ordem
+    n_workers = n_workers or os.cpu_count() or 1
+    n_linhas = len(param_values)
+    tamanho_bloco = tamanho_bloco or max(1, -(-n_linhas // n_workers))
+    blocos = [param_values[i:i + tamanho_bloco] for i in range(0, n_linhas, tamanho_bloco)]
+
+    if n_workers == 1 or len(blocos) == 1:
+        resultados = (_avaliar_bloco_sobol(bloco, metodo, cervejaria) for bloco in blocos)
+    else:
+        executor = get_reusable_executor(max_workers=n_workers, reuse=True)
+        n_blocos = len(blocos)
+        resultados = executor.map(_avaliar_bloco_sobol, blocos, [metodo] * n_blocos, [cervejaria] * n_blocos)
+
+    partes = []
+    avaliadas = 0
+    for parte in resultados:
+        partes.append(parte)
+        avaliadas += len(parte)
+        if ao_progresso is not None:
+            ao_progresso(avaliadas / n_linhas)
+    return np.concatenate(partes)
+
+def executar_analise_sobol(problem, n_samples, metodo, cervejaria, tamanho_bloco=None, n_workers=1,
+                           ao_progresso=None):
+    # O SALib acrescenta chaves ao dicionário do problema; a cópia preserva a constante do módulo
+    problem = dict(problem)
+    tempos = {}
+
+    inicio = time.perf_counter()
+    param_values = sample(problem, n_samples)
+    tempos['amostragem'] = time.perf_counter() - inicio
+    metricas.registrar_tempo('sobol_amostragem', tempos['amostragem'])
+
+    inicio = time.perf_counter()
+    resultados = avaliar_em_blocos(param_values, metodo, cervejaria, tamanho_bloco, n_workers, ao_progresso)
+    tempos['avaliacao'] = time.perf_counter() - inicio
+    metricas.registrar_tempo('sobol_avaliacao', tempos['avaliacao'])
+
+    inicio = time.perf_counter()
+    Si = analyze(problem, resultados, print_to_console=False)
+    tempos['analise'] = time.perf_counter() - inicio
+    metricas.registrar_tempo('sobol_analise', tempos['analise'])
+
+    return Si, tempos
+
+def executar_analise_sobol_adaptativa(problem, n_max, metodo, cervejaria, tolerancia=0.05, n_inicial=32,
+                                      tamanho_bloco=None, n_workers=1, semente=SEMENTE_SOBOL, ao_progresso=None):
+    # Dobra N (potências de dois) até a maior meia-largura dos ICs de S1/ST ficar abaixo da
+    # tolerância ou N chegar a n_max; só as linhas novas do desenho são avaliadas a cada rodada.
+    # ao_progresso recebe a fração das linhas do desenho máximo já avaliadas
+    problem = dict(problem)
+    tempos = {'amostragem': 0.0, 'avaliacao': 0.0, 'analise': 0.0}
+    linhas_por_amostra = 2 * problem['num_vars'] + 2
+    n_max = 2 ** int(np.floor(np.log2(n_max)))
+    n = min(2 ** int(np.ceil(np.log2(n_inicial))), n_max)
+
+    inicio = time.perf_counter()
+    param_values = sample(problem, n_max, seed=semente)
+    tempos['amostragem'] = time.perf_counter() - inicio
+    metricas.registrar_tempo('sobol_amostragem', tempos['amostragem'])
+
+    resultados = np.empty(len(param_values))
+    avaliadas = 0
+    historico = []
+    while True:
+        linhas = n * linhas_por_amostra
+
+        def progresso_rodada(fracao, primeira=avaliadas, ultima=linhas):
+            ao_progresso((primeira + fracao * (ultima - primeira)) / len(param_values))
+
+        inicio = time.perf_counter()
+        resultados[avaliadas:linhas] = avaliar_em_blocos(param_values[avaliadas:linhas], metodo, cervejaria,
+                                                         tamanho_bloco, n_workers,
+                                                         progresso_rodada if ao_progresso else None)
+        avaliadas = linhas
+        duracao = time.perf_counter() - inicio
+        tempos['avaliacao'] += duracao
+        metricas.registrar_tempo('sobol_avaliacao', duracao)
+
+        inicio = time.perf_counter()
+        Si = analyze(problem, resultados[:linhas], print_to_console=False, seed=semente)
+        duracao = time.perf_counter() - inicio
+        tempos['analise'] += duracao
+        metricas.registrar_tempo('sobol_analise', duracao)
+
+        meia_largura = float(max(np.max(Si['S1_conf']), np.max(Si['ST_conf'])))
+        historico.append({'n_samples': n, 'avaliacoes': linhas, 'meia_largura_ic': meia_largura})
+        if meia_largura <= tolerancia or n >= n_max:
+            break
+        n *= 2
+
+    convergencia = {
+        'n_samples': n,
+        'avaliacoes': avaliadas,
+        'avaliacoes_economizadas': n_max * linhas_por_amostra - avaliadas,
+        'convergiu': meia_largura <= tolerancia,
+        'tolerancia': tolerancia,
+        'historico': historico,
+    }
+    return Si, tempos, convergencia
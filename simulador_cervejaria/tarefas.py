@@ -0,0 +1,115 @@
+"""Etapas pesadas em segundo plano, com progresso e cancelamento cooperativo.
+
+``gerenciador_tarefas.obter(chave, funcao)`` roda ``funcao(tarefa)`` num
+``ThreadPoolExecutor`` do processo, ou devolve a tarefa já em andamento com a
+mesma chave; assim um rerun do Streamlit reencontra a etapa que o rerun anterior
+iniciou em vez de recomeçá-la. A função informa o andamento com
+``tarefa.informar(fracao, parcial)``, que também é o ponto de cancelamento:
+depois de ``tarefa.cancelar()``, a próxima chamada levanta ``TarefaCancelada``.
+
+Cada sessão se registra como interessada nas tarefas que acompanha; quando as
+entradas mudam, ``liberar(chave_anterior, sessao)`` retira o interesse e, se
+nenhuma outra sessão acompanha aquela chave, cancela e descarta a tarefa. O
+registro é limitado a ``max_tarefas``: além disso, as tarefas já concluídas mais
+antigas são descartadas (o resultado continua no armazém em disco).
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from .instrumentacao import contar
+
+
+class TarefaCancelada(Exception):
+    pass
+
+
+class Tarefa:
+    def __init__(self, chave):
+        self.chave = chave
+        self.progresso = 0.0
+        self.parcial = None
+        self.futuro = None
+        self.interessados = set()
+        self._cancelamento = threading.Event()
+
+    def informar(self, fracao, parcial=None):
+        # Chamada pela função em execução a cada bloco concluído
+        if self._cancelamento.is_set():
+            raise TarefaCancelada(self.chave)
+        self.progresso = min(max(float(fracao), 0.0), 1.0)
+        if parcial is not None:
+            self.parcial = parcial
+
+    def cancelar(self):
+        self._cancelamento.set()
+
+    @property
+    def cancelada(self):
+        # Um pedido de cancelamento que chega depois do último bloco não descarta o resultado
+        if not self._cancelamento.is_set():
+            return False
+        return not self.futuro.done() or isinstance(self.futuro.exception(), TarefaCancelada)
+
+    def aguardar(self, timeout):
+        # True quando terminou (com resultado, erro ou cancelamento)
+        return bool(wait([self.futuro], timeout=timeout).done)
+
+    def resultado(self):
+        return self.futuro.result()
+
+
+class GerenciadorTarefas:
+    def __init__(self, max_workers=2, max_tarefas=32):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='simulador-etapa')
+        self._tarefas = {}
+        self._lock = threading.Lock()
+        self.max_tarefas = max_tarefas
+
+    def __len__(self):
+        return len(self._tarefas)
+
+    def obter(self, chave, funcao, interessado=None):
+        with self._lock:
+            tarefa = self._tarefas.get(chave)
+            if tarefa is None or tarefa._cancelamento.is_set():
+                tarefa = Tarefa(chave)
+                tarefa.futuro = self._executor.submit(funcao, tarefa)
+                self._tarefas[chave] = tarefa
+                contar('etapas_iniciadas')
+                self._limitar()
+            if interessado is not None:
+                tarefa.interessados.add(interessado)
+            return tarefa
+
+    def _limitar(self):
+        # Descarta as tarefas concluídas mais antigas (ordem de inserção) até caber no limite;
+        # tarefas em andamento nunca são descartadas aqui
+        excesso = len(self._tarefas) - self.max_tarefas
+        for chave in [c for c, t in self._tarefas.items() if t.futuro.done()][:max(excesso, 0)]:
+            del self._tarefas[chave]
+
+    def descartar(self, chave):
+        # Chamada depois que o resultado foi lido
+        with self._lock:
+            tarefa = self._tarefas.pop(chave, None)
+        if tarefa is not None and tarefa.cancelada:
+            contar('etapas_canceladas')
+
+    def liberar(self, chave, interessado):
+        # A sessão deixou de acompanhar a chave (entradas mudaram); sem interessados, a tarefa é
+        # cancelada e descartada
+        with self._lock:
+            tarefa = self._tarefas.get(chave)
+            if tarefa is None:
+                return
+            tarefa.interessados.discard(interessado)
+            if tarefa.interessados:
+                return
+            tarefa.cancelar()
+            del self._tarefas[chave]
+        if tarefa.cancelada:
+            contar('etapas_canceladas')
+
+
+gerenciador_tarefas = GerenciadorTarefas()
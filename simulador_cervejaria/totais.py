@@ -0,0 +1,145 @@
+"""Totais acumulados (tCO2eq) no horizonte sem materializar séries diárias.
+
+Como o modelo é linear nas entradas, cada total é um fator por kg vezes a soma
+fechada do kernel correspondente; o custo por amostra é O(1) em memória e os
+parâmetros podem ser escalares ou vetores (n,).
+"""
+
+from functools import lru_cache
+from types import MappingProxyType
+
+import numpy as np
+
+from .constantes import (
+    GWP_CH4_20,
+    GWP_N2O_20,
+    KERNEL_N2O_ATERRO,
+    PERFIL_CH4_CERVEJARIA,
+    PERFIL_CH4_VERMI,
+    PERFIL_N2O_CERVEJARIA,
+    PERFIL_N2O_PRE_DESCARTE,
+    PERFIL_N2O_VERMI,
+    k_ano,
+)
+from .emissoes import (
+    _dias,
+    ajustar_emissoes_pre_descarte,
+    emissao_n2o_aterro_por_kg,
+    fatores_compostagem_por_kg,
+    fatores_vermicompostagem_por_kg,
+    kernel_ch4_aterro,
+    potencial_ch4_aterro_por_kg,
+)
+
+
+def somar_convolucao_constante(kernel, dias_simulacao):
+    # Σ_{d<D} (entrada unitária * kernel)[d] = Σ_j kernel[j]·(D - j): cada atraso conta nos dias restantes do horizonte
+    kernel = np.asarray(kernel, dtype=float)[:dias_simulacao]
+    return float(kernel @ (dias_simulacao - np.arange(kernel.shape[0])))
+
+def somar_kernel_ch4_aterro(dias_simulacao):
+    # Série geométrica: Σ_{d=1..D} (1 - r^d), com r = exp(-k/365)
+    r = np.exp(-k_ano / 365.0)
+    return dias_simulacao - r * (1 - r ** dias_simulacao) / (1 - r)
+
+def _resposta_entrada_constante(kernel, dias_simulacao):
+    # Série diária (entrada unitária * kernel)[:D]: soma acumulada do kernel, constante após o último atraso
+    kernel = np.asarray(kernel, dtype=float)[:dias_simulacao]
+    resposta = np.full(dias_simulacao, kernel.sum())
+    resposta[:kernel.shape[0]] = np.cumsum(kernel)
+    return resposta
+
+def _fracoes_pre_descarte():
+    return [PERFIL_N2O_PRE_DESCARTE.get(d, 0) for d in range(1, max(PERFIL_N2O_PRE_DESCARTE) + 1)]
+
+@lru_cache(maxsize=32)
+def _somas_kernels(dias_simulacao):
+    # Soma no horizonte da resposta de cada componente a 1 kg/dia com fator unitário.
+    # Resultado compartilhado pelo cache: dicionário somente leitura
+    return MappingProxyType({
+        'ch4_aterro': somar_kernel_ch4_aterro(dias_simulacao),
+        'n2o_aterro': somar_convolucao_constante(KERNEL_N2O_ATERRO, dias_simulacao),
+        'ch4_pre_descarte': float(dias_simulacao),
+        'n2o_pre_descarte': somar_convolucao_constante(_fracoes_pre_descarte(), dias_simulacao),
+        'ch4_compost': somar_convolucao_constante(PERFIL_CH4_CERVEJARIA, dias_simulacao),
+        'n2o_compost': somar_convolucao_constante(PERFIL_N2O_CERVEJARIA, dias_simulacao),
+        'ch4_vermi': somar_convolucao_constante(PERFIL_CH4_VERMI, dias_simulacao),
+        'n2o_vermi': somar_convolucao_constante(PERFIL_N2O_VERMI, dias_simulacao),
+    })
+
+@lru_cache(maxsize=16)
+def _somas_kernels_anuais(dias_simulacao):
+    # Mesmas somas de _somas_kernels, separadas em anos de 365 dias; arrays compartilhados
+    # pelo cache, portanto somente leitura
+    def por_ano(kernel):
+        somas = _resposta_entrada_constante(kernel, dias_simulacao).reshape(-1, 365).sum(axis=1)
+        somas.setflags(write=False)
+        return somas
+
+    return MappingProxyType({
+        'ch4_aterro': por_ano(kernel_ch4_aterro(dias_simulacao)),
+        'n2o_aterro': por_ano(KERNEL_N2O_ATERRO),
+        'ch4_pre_descarte': por_ano([1.0]),
+        'n2o_pre_descarte': por_ano(_fracoes_pre_descarte()),
+        'ch4_compost': por_ano(PERFIL_CH4_CERVEJARIA),
+        'n2o_compost': por_ano(PERFIL_N2O_CERVEJARIA),
+        'ch4_vermi': por_ano(PERFIL_CH4_VERMI),
+        'n2o_vermi': por_ano(PERFIL_N2O_VERMI),
+    })
+
+def _totais_aterro(params, cervejaria, somas):
+    umidade_val, temp_val, doc_val = (np.asarray(p, dtype=float) for p in params)
+    residuos_kg_dia = cervejaria.residuos_kg_dia
+    ch4_pre, n2o_pre = ajustar_emissoes_pre_descarte(21)
+
+    ch4_aterro_kg = residuos_kg_dia * (potencial_ch4_aterro_por_kg(temp_val, doc_val) * somas['ch4_aterro']
+                                       + ch4_pre / 1000 * somas['ch4_pre_descarte'])
+    n2o_aterro_kg = residuos_kg_dia * (emissao_n2o_aterro_por_kg(umidade_val, cervejaria) * somas['n2o_aterro']
+                                       + n2o_pre / 1000 * somas['n2o_pre_descarte'])
+    return {
+        'CH4_Aterro_tCO2eq': ch4_aterro_kg * GWP_CH4_20 / 1000,
+        'N2O_Aterro_tCO2eq': n2o_aterro_kg * GWP_N2O_20 / 1000,
+    }
+
+def _totais_projeto(params, cervejaria, somas):
+    umidade_val = np.asarray(params[0], dtype=float)
+    residuos_kg_dia = cervejaria.residuos_kg_dia
+    ch4_compost, n2o_compost = fatores_compostagem_por_kg(umidade_val)
+    ch4_vermi, n2o_vermi = fatores_vermicompostagem_por_kg(umidade_val)
+    return {
+        'CH4_Compost_tCO2eq': residuos_kg_dia * ch4_compost * somas['ch4_compost'] * GWP_CH4_20 / 1000,
+        'N2O_Compost_tCO2eq': residuos_kg_dia * n2o_compost * somas['n2o_compost'] * GWP_N2O_20 / 1000,
+        'CH4_Vermi_tCO2eq': residuos_kg_dia * ch4_vermi * somas['ch4_vermi'] * GWP_CH4_20 / 1000,
+        'N2O_Vermi_tCO2eq': residuos_kg_dia * n2o_vermi * somas['n2o_vermi'] * GWP_N2O_20 / 1000,
+    }
+
+def _combinar_totais(params, cervejaria, somas):
+    return {**_totais_aterro(params, cervejaria, somas), **_totais_projeto(params, cervejaria, somas)}
+
+def calcular_totais_cervejaria(params, cervejaria, dias_simulacao=None):
+    # Emissões acumuladas no horizonte (tCO2eq); devolve totais com o mesmo formato de params
+    return _combinar_totais(params, cervejaria, _somas_kernels(_dias(cervejaria, dias_simulacao)))
+
+def calcular_totais_anuais_cervejaria(params, cervejaria):
+    # Emissões por ano de 365 dias (tCO2eq) para params escalares; cada total tem forma (anos,)
+    return _combinar_totais(params, cervejaria, _somas_kernels_anuais(cervejaria.dias))
+
+def executar_simulacao_lote_cervejaria(umidade_vals, temp_vals, doc_vals, cervejaria, metodo='compostagem', dias_simulacao=None):
+    # Redução total (aterro - projeto) para vetores de parâmetros (n,)
+    if metodo == 'compostagem':
+        sufixo = 'Compost'
+    elif metodo == 'vermicompostagem':
+        sufixo = 'Vermi'
+    else:
+        raise ValueError(f"Método desconhecido: {metodo!r}")
+
+    totais = calcular_totais_cervejaria((umidade_vals, temp_vals, doc_vals), cervejaria, dias_simulacao)
+    total_aterro = totais['CH4_Aterro_tCO2eq'] + totais['N2O_Aterro_tCO2eq']
+    total_projeto = totais[f'CH4_{sufixo}_tCO2eq'] + totais[f'N2O_{sufixo}_tCO2eq']
+    return total_aterro - total_projeto
+
+def executar_simulacao_completa_cervejaria(parametros, cervejaria):
+    return float(executar_simulacao_lote_cervejaria(*parametros, cervejaria, metodo='compostagem'))
+
+def executar_simulacao_vermicompostagem_cervejaria(parametros, cervejaria):
+    return float(executar_simulacao_lote_cervejaria(*parametros, cervejaria, metodo='vermicompostagem'))
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# O repositório não é instalado como pacote; os testes importam a partir da raiz
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,66 @@
+"""Totais anuais e mensais por np.add.reduceat contra o groupby do pandas que substituíram."""
+
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from simulador_cervejaria.agregacao import limites_periodos, totais_anuais, totais_mensais
+from simulador_cervejaria.resultados import CENARIOS, GASES, ResultadoDiario
+
+# Inícios em 1º de janeiro, no meio do ano e em 31 de dezembro, com 2024 (bissexto) no horizonte
+INICIOS = [datetime(2024, 1, 1), datetime(2023, 7, 15), datetime(2023, 12, 31), datetime(2024, 2, 29)]
+DIAS = 3 * 365 + 40
+
+
+@pytest.fixture
+def series():
+    return np.random.default_rng(1).random((3, DIAS))
+
+
+@pytest.mark.parametrize('inicio', INICIOS)
+def test_totais_anuais_iguais_ao_groupby(series, inicio):
+    datas = pd.date_range(inicio, periods=DIAS, freq='D')
+    anos, totais = totais_anuais(series, inicio)
+    for serie, total in zip(series, totais):
+        esperado = pd.Series(serie, index=datas).groupby(datas.year).sum()
+        np.testing.assert_array_equal(anos, esperado.index.to_numpy())
+        np.testing.assert_allclose(total, esperado.to_numpy(), rtol=1e-12)
+
+
+@pytest.mark.parametrize('inicio', INICIOS)
+def test_totais_mensais_iguais_ao_groupby(series, inicio):
+    datas = pd.date_range(inicio, periods=DIAS, freq='D')
+    meses, totais = totais_mensais(series[0], inicio)
+    esperado = pd.Series(series[0], index=datas).groupby(datas.to_period('M')).sum()
+    assert [str(mes) for mes in meses] == [str(periodo) for periodo in esperado.index]
+    np.testing.assert_allclose(totais, esperado.to_numpy(), rtol=1e-12)
+
+
+def test_limites_sao_memorizados_e_somente_leitura():
+    periodos, inicios = limites_periodos(datetime(2024, 2, 29), 400, 'mensal')
+    assert limites_periodos(np.datetime64('2024-02-29'), 400, 'mensal')[1] is inicios
+    assert not inicios.flags.writeable and not periodos.flags.writeable
+    assert inicios[:3].tolist() == [0, 1, 32]
+
+
+@pytest.mark.parametrize('inicio', INICIOS)
+def test_resumos_do_resultado_iguais_ao_groupby(inicio):
+    rng = np.random.default_rng(2)
+    resultado = ResultadoDiario(inicio, {f'{gas}_{cenario}': rng.random(DIAS) for cenario in CENARIOS for gas in GASES})
+    df = resultado.para_dataframe()
+
+    anual = df.groupby('Year')[[f'Total_{cenario}_tCO2eq_dia' for cenario in CENARIOS]].sum().reset_index()
+    resumo_anual = resultado.resumo_anual()
+    np.testing.assert_array_equal(resumo_anual['Year'], anual['Year'])
+    np.testing.assert_allclose(resumo_anual['Baseline emissions (t CO₂eq)'], anual['Total_Aterro_tCO2eq_dia'],
+                               rtol=1e-12)
+    np.testing.assert_allclose(resumo_anual['Emission reductions Vermi (t CO₂eq)'],
+                               anual['Total_Aterro_tCO2eq_dia'] - anual['Total_Vermi_tCO2eq_dia'], rtol=1e-12)
+
+    mensal = df.groupby(df['Data'].dt.to_period('M'))['Total_Compost_tCO2eq_dia'].sum()
+    resumo_mensal = resultado.resumo_mensal()
+    assert len(resumo_mensal) == len(mensal)
+    np.testing.assert_allclose(resumo_mensal['Compost (t CO₂eq)'], mensal.to_numpy(), rtol=1e-12)
+    assert resumo_mensal['Mês'].iloc[0] == pd.Timestamp(inicio.year, inicio.month, 1)
@@ -0,0 +1,87 @@
+"""Amostradores MC/LHS/Sobol: estado global intocado, marginais iguais às dos geradores legados e blocos."""
+
+import numpy as np
+import pytest
+from scipy import stats
+
+from simulador_cervejaria.amostragem import (
+    AMOSTRADORES,
+    amostrar_marginais,
+    blocos_marginais,
+    blocos_uniformes,
+    cdf_inversa,
+)
+from simulador_cervejaria.incerteza import DISTRIBUICOES_MC
+
+N = 4096
+
+
+def distribuicao_scipy(tipo, parametros):
+    # As mesmas marginais de np.random.uniform/normal/triangular dos geradores legados
+    if tipo == 'uniforme':
+        minimo, maximo = parametros
+        return stats.uniform(loc=minimo, scale=maximo - minimo)
+    if tipo == 'normal':
+        return stats.norm(*parametros)
+    minimo, moda, maximo = parametros
+    return stats.triang((moda - minimo) / (maximo - minimo), loc=minimo, scale=maximo - minimo)
+
+
+@pytest.mark.parametrize('amostrador', list(AMOSTRADORES))
+def test_estado_global_do_numpy_intocado(amostrador):
+    np.random.seed(123)
+    antes = np.random.get_state()
+    amostrar_marginais(DISTRIBUICOES_MC['compostagem'], 256, amostrador, semente=1)
+    list(blocos_marginais(DISTRIBUICOES_MC['compostagem'], 256, 100, amostrador, semente=1))
+    depois = np.random.get_state()
+    assert antes[0] == depois[0]
+    np.testing.assert_array_equal(antes[1], depois[1])
+    assert antes[2:] == depois[2:]
+
+
+@pytest.mark.parametrize('amostrador', list(AMOSTRADORES))
+@pytest.mark.parametrize('metodo', list(DISTRIBUICOES_MC))
+def test_marginais_seguem_as_distribuicoes_legadas(amostrador, metodo):
+    distribuicoes = DISTRIBUICOES_MC[metodo]
+    amostras = amostrar_marginais(distribuicoes, N, amostrador, semente=2024)
+    for (tipo, parametros), valores in zip(distribuicoes, amostras):
+        resultado = stats.kstest(valores, distribuicao_scipy(tipo, parametros).cdf)
+        assert resultado.pvalue > 0.01, (tipo, resultado)
+
+
+def test_amostras_legadas_passam_no_mesmo_teste():
+    # Controle: as amostras do gerador legado (np.random com semente 50) passam no mesmo KS
+    rng = np.random.RandomState(50)
+    legado = [rng.uniform(0.75, 0.90, N), rng.normal(25, 3, N), rng.triangular(0.70, 0.80, 0.90, N)]
+    for (tipo, parametros), valores in zip(DISTRIBUICOES_MC['compostagem'], legado):
+        assert stats.kstest(valores, distribuicao_scipy(tipo, parametros).cdf).pvalue > 0.01
+
+
+@pytest.mark.parametrize('amostrador', list(AMOSTRADORES))
+def test_semente_fixa_reproduz(amostrador):
+    a = amostrar_marginais(DISTRIBUICOES_MC['vermicompostagem'], 300, amostrador, semente=9)
+    b = amostrar_marginais(DISTRIBUICOES_MC['vermicompostagem'], 300, amostrador, semente=9)
+    c = amostrar_marginais(DISTRIBUICOES_MC['vermicompostagem'], 300, amostrador, semente=10)
+    for x, y, z in zip(a, b, c):
+        np.testing.assert_array_equal(x, y)
+        assert not np.array_equal(x, z)
+
+
+@pytest.mark.parametrize('amostrador', ['mc', 'sobol'])
+def test_blocos_concatenados_igualam_amostragem_unica(amostrador):
+    blocos = list(blocos_uniformes(3, 1000, 256, amostrador, semente=4))
+    assert [len(bloco) for bloco in blocos] == [256, 256, 256, 232]
+    unica = AMOSTRADORES[amostrador](1000, 3, np.random.default_rng(4))
+    np.testing.assert_array_equal(np.vstack(blocos), unica)
+
+
+def test_cdf_inversa_rejeita_tipo_desconhecido():
+    with pytest.raises(ValueError, match='desconhecida'):
+        cdf_inversa('lognormal', (0, 1), np.array([0.5]))
+
+
+def test_amostrador_desconhecido():
+    with pytest.raises(ValueError, match='Amostrador desconhecido'):
+        amostrar_marginais(DISTRIBUICOES_MC['compostagem'], 10, 'halton')
+    with pytest.raises(ValueError, match='Amostrador desconhecido'):
+        next(blocos_uniformes(3, 10, 5, 'halton'))
@@ -0,0 +1,110 @@
+"""Armazém em disco: chaves estáveis, entradas corrompidas, limite LRU e temporários órfãos."""
+
+import json
+import os
+import time
+from datetime import date, datetime
+
+import numpy as np
+import pytest
+
+from simulador_cervejaria.armazenamento import ARQUIVO_META, ArmazemResultados, chave_resultado
+from simulador_cervejaria.parametros import ParametrosCervejaria
+
+
+@pytest.fixture
+def armazem(tmp_path):
+    return ArmazemResultados(tmp_path / 'cache', limite_bytes=2**20)
+
+
+def test_chave_estavel_para_dataclass_data_e_array():
+    entradas = {'cervejaria': ParametrosCervejaria(h_exposta=12), 'data_inicio': datetime(2025, 1, 1),
+                'dia': date(2025, 1, 1), 'pontos': np.array([1.0, 2.5]), 'n': np.int64(3)}
+    chave = chave_resultado('tipo', **entradas)
+    assert len(chave) == 64
+    # Mesmo conteúdo em outra representação (lista, int nativo, ordem dos argumentos) dá a mesma chave
+    assert chave_resultado('tipo', n=3, pontos=[1.0, 2.5], dia=date(2025, 1, 1), data_inicio=datetime(2025, 1, 1),
+                           cervejaria=ParametrosCervejaria(h_exposta=12)) == chave
+    assert chave_resultado('outro', **entradas) != chave
+    assert chave_resultado('tipo', **{**entradas, 'cervejaria': ParametrosCervejaria(h_exposta=13)}) != chave
+    assert chave_resultado('tipo', **{**entradas, 'pontos': np.array([1.0, 2.6])}) != chave
+
+
+
+def test_chave_fixa_entre_execucoes():
+    # Valor fixo (muda só com VERSAO_MODELO): uma mudança acidental na normalização das entradas
+    # invalidaria o armazém de todos os usuários sem aviso
+    chave = chave_resultado('tipo', cervejaria=ParametrosCervejaria(), data_inicio=datetime(2025, 1, 1),
+                            pontos=np.array([1.0, 2.5]))
+    assert chave == '8610ad0b9bab4a4c3e6c9c020a6f21f7827403b377ee99d55d8409b745edbdce'
+
+
+def test_salvar_e_carregar(armazem):
+    chave = chave_resultado('t', x=1)
+    armazem.salvar(chave, {'a': np.arange(5.0)}, {'n': np.int64(5)})
+    arrays, extras = armazem.carregar(chave)
+    np.testing.assert_array_equal(arrays['a'], np.arange(5.0))
+    assert not arrays['a'].flags.writeable
+    assert extras == {'n': 5}
+
+
+def test_entrada_parcial_ou_corrompida_e_falta(armazem):
+    chave = chave_resultado('t', x=2)
+    armazem.salvar(chave, {'a': np.arange(3.0), 'b': np.ones(3)})
+    caminho = armazem._caminho(chave)
+    (caminho / 'b.npy').unlink()
+    assert armazem.carregar(chave) is None
+
+    (caminho / ARQUIVO_META).write_text('{incompleto')
+    assert armazem.carregar(chave) is None
+    assert armazem.carregar(chave_resultado('t', x=3)) is None
+
+
+def test_memorizar_recalcula_apos_corrupcao(armazem):
+    chamadas = []
+
+    def calcular():
+        chamadas.append(1)
+        return {'a': np.arange(4.0)}, {}
+
+    armazem.memorizar_arrays('t', {'x': 4}, calcular)
+    armazem.memorizar_arrays('t', {'x': 4}, calcular)
+    assert len(chamadas) == 1
+    (armazem._caminho(chave_resultado('t', x=4)) / 'a.npy').unlink()
+    arrays, _ = armazem.memorizar_arrays('t', {'x': 4}, calcular)
+    assert len(chamadas) == 2
+    np.testing.assert_array_equal(arrays['a'], np.arange(4.0))
+
+
+def test_limite_remove_as_menos_recentemente_usadas(tmp_path):
+    armazem = ArmazemResultados(tmp_path / 'cache', limite_bytes=3 * 90_000)
+    chaves = [chave_resultado('t', i=i) for i in range(3)]
+    for i, chave in enumerate(chaves):
+        armazem.salvar(chave, {'a': np.zeros(10_000)})  # ~80 KB cada
+        os.utime(armazem._caminho(chave) / ARQUIVO_META, (1000 + i, 1000 + i))
+    assert armazem.carregar(chaves[0]) is not None  # uso recente: passa a ser a mais nova
+
+    armazem.salvar(chave_resultado('t', i=3), {'a': np.zeros(10_000)})
+    assert armazem.tamanho_total() <= armazem.limite_bytes
+    assert armazem.carregar(chaves[1]) is None
+    assert armazem.carregar(chaves[0]) is not None
+    assert armazem.carregar(chaves[2]) is not None
+
+
+def test_temporarios_orfaos_sao_removidos(armazem):
+    chave = chave_resultado('t', x=5)
+    armazem.salvar(chave, {'a': np.arange(2.0)})
+    pasta = armazem._caminho(chave).parent
+    orfao, recente = pasta / '.tmp-orfao', pasta / '.tmp-recente'
+    for temporario in (orfao, recente):
+        temporario.mkdir()
+        (temporario / 'a.npy').write_bytes(b'x' * 100)
+        (temporario / ARQUIVO_META).write_text(json.dumps({'arrays': ['a']}))
+    antigo = time.time() - 2 * 3600
+    os.utime(orfao, (antigo, antigo))
+
+    assert all(not caminho.name.startswith('.tmp-') for _, _, caminho in armazem.entradas())
+    armazem.aplicar_limite()
+    assert not orfao.exists()
+    assert recente.exists()  # pode ser uma gravação em andamento em outro processo
+    assert armazem.carregar(chave) is not None
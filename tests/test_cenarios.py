@@ -0,0 +1,46 @@
+"""Grade de cenários: validação dos valores e equivalência com a simulação em lote."""
+
+import pytest
+
+from simulador_cervejaria.cenarios import LIMITES_PARAMETROS, avaliar_cenarios, grade_cenarios, validar_valor_grade
+from simulador_cervejaria.lote import simular_cervejaria
+from simulador_cervejaria.parametros import ParametrosCervejaria
+
+
+def test_grade_converte_inteiros_e_respeita_a_ordem():
+    cenarios = grade_cenarios(ParametrosCervejaria(), {'h_exposta': ['8', 12.5], 'anos_simulacao': ['10', 20.0]})
+    assert [(c.h_exposta, c.anos_simulacao) for c in cenarios] == [(8.0, 10), (8.0, 20), (12.5, 10), (12.5, 20)]
+    assert all(isinstance(c.anos_simulacao, int) for c in cenarios)
+
+
+@pytest.mark.parametrize('campo, valor, mensagem', [
+    ('dias_operacao_mes', '22.5', 'deve ser inteiro'),
+    ('anos_simulacao', 8.5, 'deve ser inteiro'),
+    ('h_exposta', '25', 'fora da faixa'),
+    ('temperatura', -1, 'fora da faixa'),
+    ('doc_bagaco', 'alto', 'não é numérico'),
+])
+def test_valores_invalidos(campo, valor, mensagem):
+    with pytest.raises(ValueError, match=f'{campo}: .*{mensagem}'):
+        grade_cenarios(ParametrosCervejaria(), {campo: [valor]})
+
+
+def test_limites_sao_inclusivos():
+    for campo, (inferior, superior) in LIMITES_PARAMETROS.items():
+        assert validar_valor_grade(campo, inferior) == inferior
+        assert validar_valor_grade(campo, superior) == superior
+
+
+def test_campo_desconhecido():
+    with pytest.raises(ValueError, match='desconhecidos'):
+        grade_cenarios(ParametrosCervejaria(), {'preco_carbono': [80]})
+
+
+def test_cenarios_iguais_a_simulacao_individual():
+    cenarios = grade_cenarios(ParametrosCervejaria(), {'h_exposta': [4, 24], 'anos_simulacao': [5, 10]})
+    anuais = avaliar_cenarios(cenarios)
+    for indice, cenario in enumerate(cenarios):
+        esperado = simular_cervejaria(cenario, 85.5, 5.5)
+        obtido = anuais[anuais['cenario'] == indice]
+        for coluna in ('aterro_tco2eq', 'reducao_compost_tco2eq', 'reducao_vermi_tco2eq'):
+            assert obtido[coluna].to_numpy() == pytest.approx(esperado[coluna], rel=1e-12)
@@ -0,0 +1,217 @@
+"""Cotações contra um servidor HTTP local: cache não bloqueante com TTL e fontes em paralelo."""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from simulador_cervejaria.cotacoes import (
+    COTACAO_CARBONO_REFERENCIA,
+    COTACAO_EURO_REFERENCIA,
+    CacheCotacoes,
+    FonteCotacao,
+    ProvedorCotacoes,
+    criar_sessao,
+    extrair_cotacao_awesomeapi,
+    extrair_preco_investing,
+    obter_cotacao_carbono,
+    obter_cotacao_euro_real,
+)
+
+
+class Rota:
+    def __init__(self, corpo, status=200, atraso=0.0, tipo='application/json'):
+        self.corpo = corpo
+        self.status = status
+        self.atraso = atraso
+        self.tipo = tipo
+        self.liberada = threading.Event()
+        self.liberada.set()
+
+
+class ManipuladorCotacoes(BaseHTTPRequestHandler):
+    def do_GET(self):
+        rota = self.server.rotas.get(self.path)
+        if rota is None:
+            self.send_error(404)
+            return
+        rota.liberada.wait(10)
+        time.sleep(rota.atraso)
+        corpo = rota.corpo.encode()
+        self.send_response(rota.status)
+        self.send_header('Content-Type', rota.tipo)
+        self.send_header('Content-Length', str(len(corpo)))
+        self.end_headers()
+        self.wfile.write(corpo)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def servidor():
+    servidor = ThreadingHTTPServer(('127.0.0.1', 0), ManipuladorCotacoes)
+    servidor.daemon_threads = True
+    servidor.rotas = {}
+    servidor.url = f'http://127.0.0.1:{servidor.server_port}'
+    thread = threading.Thread(target=servidor.serve_forever, daemon=True)
+    thread.start()
+    yield servidor
+    for rota in servidor.rotas.values():
+        rota.liberada.set()
+    servidor.shutdown()
+    servidor.server_close()
+
+
+def json_euro(valor):
+    return json.dumps({'EURBRL': {'bid': str(valor)}})
+
+
+def html_carbono(valor):
+    return f'<html><span data-test="instrument-price-last">{valor}</span></html>'
+
+
+def cache_local(servidor, ttl_segundos=900):
+    servidor.rotas['/carbono'] = Rota(html_carbono(91.25), tipo='text/html')
+    servidor.rotas['/euro'] = Rota(json_euro(6.1))
+    sessao = criar_sessao()
+    carbono = ProvedorCotacoes([FonteCotacao('Carbono', servidor.url + '/carbono', extrair_preco_investing,
+                                             timeout=5, stream=True)], sessao=sessao)
+    euro = ProvedorCotacoes([FonteCotacao('Euro', servidor.url + '/euro', extrair_cotacao_awesomeapi, timeout=5)],
+                            sessao=sessao)
+    return CacheCotacoes(ttl_segundos, lambda: obter_cotacao_carbono(carbono), lambda: obter_cotacao_euro_real(euro))
+
+
+def test_obter_nao_bloqueia_durante_atualizacao(servidor):
+    cache = cache_local(servidor)
+    servidor.rotas['/euro'].liberada.clear()
+
+    inicio = time.perf_counter()
+    carbono, euro = cache.obter()
+    assert time.perf_counter() - inicio < 0.5
+    assert (carbono, euro) == (COTACAO_CARBONO_REFERENCIA, COTACAO_EURO_REFERENCIA)
+    assert cache.atualizando()
+    assert cache.obter()[1] == COTACAO_EURO_REFERENCIA
+
+    servidor.rotas['/euro'].liberada.set()
+    cache.atualizar(esperar=True)
+    carbono, euro = cache.obter()
+    assert carbono[:2] == (91.25, "€") and carbono[3]
+    assert euro == (6.1, "R$", True, 'Euro')
+
+
+def test_ttl_expira_e_dispara_nova_consulta(servidor):
+    cache = cache_local(servidor, ttl_segundos=0.2)
+    cache.atualizar(esperar=True)
+    assert not cache.expirado()
+    assert cache.obter()[1][0] == 6.1
+
+    servidor.rotas['/euro'].corpo = json_euro(6.3)
+    assert cache.obter()[1][0] == 6.1  # ainda dentro do TTL: nenhuma consulta
+    time.sleep(0.3)
+    assert cache.expirado()
+    cache.obter()
+    cache.atualizar(esperar=True)
+    assert cache.obter()[1][0] == 6.3
+
+
+def test_falha_mantem_ultimo_valor_conhecido(servidor):
+    cache = cache_local(servidor, ttl_segundos=0.5)
+    cache.atualizar(esperar=True)
+    assert cache.obter()[1][0] == 6.1
+
+    servidor.rotas['/euro'].status = 500
+    time.sleep(0.6)
+    cache.obter()
+    cache.atualizar(esperar=True)
+    assert cache.obter()[1] == (6.1, "R$", True, 'Euro')
+    assert not cache.expirado()  # a falha também conta para o TTL
+
+
+def provedor_local(servidor, rotas, estrategia):
+    fontes = []
+    for nome, rota in rotas.items():
+        servidor.rotas['/' + nome] = rota
+        fontes.append(FonteCotacao(nome, f'{servidor.url}/{nome}', extrair_cotacao_awesomeapi, timeout=5))
+    return ProvedorCotacoes(fontes, estrategia, sessao=criar_sessao())
+
+
+def test_estrategia_primeira_devolve_a_fonte_mais_rapida(servidor):
+    provedor = provedor_local(servidor, {
+        'lenta': Rota(json_euro(5.9), atraso=0.5),
+        'rapida': Rota(json_euro(6.0)),
+    }, 'primeira')
+    inicio = time.perf_counter()
+    assert provedor.obter() == (6.0, 'rapida')
+    assert time.perf_counter() - inicio < 0.4
+
+
+def test_estrategia_primeira_ignora_falhas(servidor):
+    provedor = provedor_local(servidor, {
+        'falha': Rota('', status=503),
+        'valida': Rota(json_euro(6.2), atraso=0.1),
+    }, 'primeira')
+    assert provedor.obter() == (6.2, 'valida')
+
+
+def test_estrategia_mediana_descarta_fontes_com_falha(servidor):
+    provedor = provedor_local(servidor, {
+        'a': Rota(json_euro(5.0)),
+        'b': Rota(json_euro(6.0)),
+        'c': Rota(json_euro(5.2)),
+        'falha': Rota('sem json'),
+    }, 'mediana')
+    valor, fonte = provedor.obter()
+    assert valor == pytest.approx(5.2)
+    assert fonte == 'Mediana (a, b, c)'
+
+
+def test_todas_as_fontes_falham(servidor):
+    provedor = provedor_local(servidor, {'falha': Rota('', status=500)}, 'mediana')
+    assert provedor.obter() == (None, None)
+    assert obter_cotacao_euro_real(provedor) == COTACAO_EURO_REFERENCIA
+
+
+def test_estrategia_desconhecida():
+    with pytest.raises(ValueError, match='Estratégia'):
+        ProvedorCotacoes([], 'media')
+
+
+def test_contadores_de_latencia_e_falhas_por_fonte(servidor):
+    provedor = provedor_local(servidor, {
+        'ok': Rota(json_euro(6.0), atraso=0.05),
+        'falha': Rota('', status=500),
+    }, 'mediana')
+    for _ in range(3):
+        provedor.obter()
+
+    ok, falha = provedor.estatisticas()
+    assert (ok['fonte'], ok['consultas'], ok['falhas'], ok['ultimo_erro']) == ('ok', 3, 0, None)
+    assert ok['latencia_media_ms'] >= 50 and ok['ultima_latencia_ms'] >= 50
+    assert (falha['fonte'], falha['consultas'], falha['falhas']) == ('falha', 3, 3)
+    assert '500' in falha['ultimo_erro']
+
+
+@pytest.mark.parametrize('status, corpo', [(500, html_carbono(90.0)), (200, '<html>sem preço</html>')])
+def test_resposta_em_fluxo_e_fechada_em_falha(servidor, status, corpo):
+    servidor.rotas['/carbono'] = Rota(corpo, status=status, tipo='text/html')
+    respostas = []
+
+    def extrair_com_erro(resposta):
+        raise ValueError("extrator falhou")
+
+    sessao = criar_sessao()
+    fonte = FonteCotacao('Carbono', servidor.url + '/carbono', extrair_com_erro, timeout=5, stream=True)
+    original = sessao.get
+
+    def get_registrando(*args, **kwargs):
+        resposta = original(*args, **kwargs)
+        respostas.append(resposta)
+        return resposta
+
+    sessao.get = get_registrando
+    assert fonte.consultar(sessao) is None
+    assert fonte.estatisticas()['falhas'] == 1
+    assert respostas and all(resposta.raw.closed for resposta in respostas)
@@ -0,0 +1,69 @@
+"""Cronogramas diários arbitrários de entrada: convolução via FFT contra o laço direto por lote."""
+
+import numpy as np
+import pytest
+
+from simulador_cervejaria.constantes import PERFIL_CH4_CERVEJARIA, PERFIL_N2O_CERVEJARIA
+from simulador_cervejaria.emissoes import (
+    calcular_emissoes_compostagem_cervejaria,
+    convoluir_perfil,
+    fatores_compostagem_por_kg,
+)
+from simulador_cervejaria.parametros import ParametrosCervejaria
+
+DIAS = 400
+
+
+def laco_direto(entradas, perfil, dias):
+    # Implementação original: cada lote diário emite o perfil a partir do dia de entrada
+    saida = np.zeros(dias)
+    for dia_entrada in range(dias):
+        for k, fracao in enumerate(perfil):
+            if dia_entrada + k >= dias:
+                break
+            saida[dia_entrada + k] += entradas[dia_entrada] * fracao
+    return saida
+
+
+@pytest.fixture
+def cronograma():
+    # Entradas irregulares, com dias sem produção
+    rng = np.random.default_rng(7)
+    entradas = rng.uniform(0.0, 500.0, DIAS)
+    entradas[rng.random(DIAS) < 0.2] = 0.0
+    return entradas
+
+
+def test_convolucao_igual_ao_laco_direto(cronograma):
+    for perfil in (PERFIL_CH4_CERVEJARIA, PERFIL_N2O_CERVEJARIA):
+        np.testing.assert_allclose(convoluir_perfil(cronograma, perfil, DIAS),
+                                   laco_direto(cronograma, perfil, DIAS), rtol=1e-12, atol=1e-12)
+
+
+def test_compostagem_com_cronograma_igual_ao_laco_direto(cronograma):
+    cervejaria = ParametrosCervejaria()
+    params = cervejaria.params_base
+    ch4, n2o = calcular_emissoes_compostagem_cervejaria(params, cervejaria, DIAS, entradas_kg_dia=cronograma)
+    ch4_por_kg, n2o_por_kg = fatores_compostagem_por_kg(params[0])
+
+    np.testing.assert_allclose(ch4, laco_direto(cronograma * ch4_por_kg, PERFIL_CH4_CERVEJARIA, DIAS),
+                               rtol=1e-12, atol=1e-12)
+    np.testing.assert_allclose(n2o, laco_direto(cronograma * n2o_por_kg, PERFIL_N2O_CERVEJARIA, DIAS),
+                               rtol=1e-12, atol=1e-12)
+
+
+def test_cronograma_constante_igual_ao_padrao():
+    cervejaria = ParametrosCervejaria()
+    params = cervejaria.params_base
+    constante = np.full(DIAS, cervejaria.residuos_kg_dia)
+    for padrao, explicito in zip(calcular_emissoes_compostagem_cervejaria(params, cervejaria, DIAS),
+                                 calcular_emissoes_compostagem_cervejaria(params, cervejaria, DIAS,
+                                                                          entradas_kg_dia=constante)):
+        np.testing.assert_array_equal(padrao, explicito)
+
+
+def test_cronograma_mais_curto_que_o_horizonte(cronograma):
+    cervejaria = ParametrosCervejaria()
+    with pytest.raises(ValueError, match='Cronograma'):
+        calcular_emissoes_compostagem_cervejaria(cervejaria.params_base, cervejaria, DIAS,
+                                                 entradas_kg_dia=cronograma[:DIAS - 1])
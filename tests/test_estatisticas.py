@@ -0,0 +1,114 @@
+"""Acumulador em fluxo: momentos de Welford/Chan, quantis do t-digest e histograma de limites fixos."""
+
+import numpy as np
+import pytest
+from scipy import stats
+
+from simulador_cervejaria import estatisticas
+from simulador_cervejaria.estatisticas import AcumuladorStreaming, TDigest
+
+
+def blocos(valores, tamanhos):
+    inicio = 0
+    for tamanho in tamanhos:
+        yield valores[inicio:inicio + tamanho]
+        inicio += tamanho
+
+
+@pytest.fixture
+def amostras():
+    rng = np.random.default_rng(7)
+    # Assimétrica e com deslocamento grande, o caso em que somas de quadrados ingênuas perdem precisão
+    return 1e6 + rng.lognormal(3.0, 0.6, 20_000)
+
+
+def test_media_e_variancia_iguais_ao_numpy(amostras):
+    acumulador = AcumuladorStreaming()
+    for bloco in blocos(amostras, [1, 2, 997, 5000, 14_000]):
+        acumulador.atualizar(bloco)
+    assert acumulador.n == amostras.size
+    assert acumulador.media == pytest.approx(amostras.mean(), rel=1e-14)
+    assert acumulador.variancia == pytest.approx(amostras.var(ddof=1), rel=1e-9)
+    assert acumulador.desvio == pytest.approx(amostras.std(ddof=1), rel=1e-9)
+
+
+@pytest.mark.parametrize('q', [0.001, 0.025, 0.25, 0.5, 0.75, 0.975, 0.999])
+def test_quantis_do_tdigest_proximos_de_np_percentile(amostras, q):
+    digest = TDigest()
+    for bloco in blocos(amostras, [4096] * 5):
+        digest.atualizar(bloco)
+    # Erro de posto: o quantil estimado deve cair perto de q na distribuição empírica
+    posto = np.searchsorted(np.sort(amostras), digest.quantil(q)) / amostras.size
+    assert abs(posto - q) < 2e-3
+    assert digest.quantil(q) == pytest.approx(np.percentile(amostras, 100 * q), rel=1e-3)
+
+
+def test_quantis_extremos_sao_minimo_e_maximo(amostras):
+    digest = TDigest()
+    digest.atualizar(amostras)
+    assert digest.quantil(0.0) == amostras.min()
+    assert digest.quantil(1.0) == amostras.max()
+
+
+def test_mesclar_equivale_a_um_unico_acumulador(amostras):
+    limites = (np.percentile(amostras, 5), np.percentile(amostras, 95))
+    partes = [AcumuladorStreaming(limites_histograma=limites) for _ in range(4)]
+    for acumulador, bloco in zip(partes, np.array_split(amostras, 4)):
+        acumulador.atualizar(bloco)
+    total = AcumuladorStreaming(limites_histograma=limites)
+    for acumulador in partes:
+        total.mesclar(acumulador)
+    total.mesclar(AcumuladorStreaming(limites_histograma=limites))  # vazio: sem efeito
+
+    assert total.n == amostras.size
+    assert total.media == pytest.approx(amostras.mean(), rel=1e-14)
+    assert total.variancia == pytest.approx(amostras.var(ddof=1), rel=1e-9)
+    for q in total.quantis:
+        assert total.quantil(q) == pytest.approx(np.percentile(amostras, 100 * q), rel=1e-3)
+    contagens, bordas = total.histograma()
+    np.testing.assert_array_equal(contagens, np.histogram(amostras, bins=bordas)[0])
+    assert total.abaixo == np.count_nonzero(amostras < limites[0])
+    assert total.acima == np.count_nonzero(amostras > limites[1])
+
+
+def test_histograma_nao_depende_da_ordem_dos_dados(amostras):
+    limites = (amostras.min(), amostras.max())
+    ordenado, embaralhado = (AcumuladorStreaming(limites_histograma=limites, n_bins=20) for _ in range(2))
+    for bloco in blocos(np.sort(amostras), [1000] * 20):
+        ordenado.atualizar(bloco)
+    for bloco in blocos(amostras, [1000] * 20):
+        embaralhado.atualizar(bloco)
+    np.testing.assert_array_equal(ordenado.histograma()[0], embaralhado.histograma()[0])
+    assert ordenado.histograma()[0].sum() == amostras.size
+    assert ordenado.abaixo == ordenado.acima == 0
+
+
+def test_histograma_exige_limites(amostras):
+    acumulador = AcumuladorStreaming()
+    acumulador.atualizar(amostras)
+    with pytest.raises(ValueError, match='limites_histograma'):
+        acumulador.histograma()
+    with pytest.raises(ValueError, match='inválidos'):
+        AcumuladorStreaming(limites_histograma=(1.0, 1.0))
+
+
+def test_mesclar_com_bins_diferentes_falha(amostras):
+    a = AcumuladorStreaming(limites_histograma=(0.0, 1.0))
+    for outro in (AcumuladorStreaming(limites_histograma=(0.0, 2.0)), AcumuladorStreaming()):
+        outro.atualizar(amostras[:10])
+        with pytest.raises(ValueError, match='mesmos bins'):
+            a.mesclar(outro)
+
+
+def test_teste_t_pareado_igual_ao_scipy():
+    rng = np.random.default_rng(3)
+    compost = rng.normal(100, 5, 5000)
+    vermi = compost - rng.normal(0.2, 1.0, 5000)
+    acumulador = AcumuladorStreaming()
+    for bloco in blocos(compost - vermi, [1000] * 5):
+        acumulador.atualizar(bloco)
+    # Via módulo: o nome teste_* seria coletado pelo pytest se importado aqui
+    t, p = estatisticas.teste_t_pareado_streaming(acumulador)
+    esperado = stats.ttest_rel(compost, vermi)
+    assert t == pytest.approx(esperado.statistic, rel=1e-9)
+    assert p == pytest.approx(esperado.pvalue, rel=1e-6)
@@ -0,0 +1,62 @@
+"""Valoração dos créditos: formas da grade preço × câmbio × desconto e VPL contra o cálculo direto."""
+
+import numpy as np
+import pytest
+
+from simulador_cervejaria.financeiro import (
+    calcular_valor_creditos,
+    fatores_desconto,
+    valorar_cenarios_precos,
+    valorar_reducoes,
+)
+
+REDUCOES = np.array([10.0, 12.5, 7.0, 20.0])
+PRECOS = [40.0, 85.5, 160.0]
+CAMBIOS = [4.5, 5.5]
+DESCONTOS = [0.0, 0.08, 0.15, 0.2, 0.3]
+
+
+@pytest.fixture
+def valores():
+    return valorar_reducoes(REDUCOES, PRECOS, CAMBIOS, DESCONTOS)
+
+
+def test_formas_da_grade(valores):
+    p, c, d, a = len(PRECOS), len(CAMBIOS), len(DESCONTOS), len(REDUCOES)
+    assert valores['receita_anual_eur'].shape == (p, a)
+    assert valores['receita_anual_brl'].shape == (p, c, a)
+    assert valores['vpl_eur'].shape == (p, d)
+    assert valores['vpl_brl'].shape == (p, c, d)
+    assert fatores_desconto(DESCONTOS, a).shape == (d, a)
+
+
+def test_vpl_igual_ao_somatorio_descontado(valores):
+    for i, preco in enumerate(PRECOS):
+        for k, taxa in enumerate(DESCONTOS):
+            esperado = sum(r * preco / (1 + taxa) ** t for t, r in enumerate(REDUCOES, start=1))
+            assert valores['vpl_eur'][i, k] == pytest.approx(esperado, rel=1e-12)
+
+
+def test_desconto_zero_e_a_soma_simples(valores):
+    for i, preco in enumerate(PRECOS):
+        assert valores['vpl_eur'][i, 0] == pytest.approx(REDUCOES.sum() * preco, rel=1e-12)
+        np.testing.assert_allclose(valores['receita_anual_eur'][i], REDUCOES * preco, rtol=1e-12)
+
+
+def test_brl_e_eur_vezes_cambio(valores):
+    for j, cambio in enumerate(CAMBIOS):
+        np.testing.assert_allclose(valores['receita_anual_brl'][:, j, :], valores['receita_anual_eur'] * cambio,
+                                   rtol=1e-12)
+        np.testing.assert_allclose(valores['vpl_brl'][:, j, :], valores['vpl_eur'] * cambio, rtol=1e-12)
+
+
+def test_escalares_viram_grades_unitarias():
+    valores = valorar_reducoes(REDUCOES, 85.5, 5.5, 0.08)
+    assert valores['vpl_brl'].shape == (1, 1, 1)
+    assert valores['receita_anual_eur'][0] == pytest.approx(calcular_valor_creditos(REDUCOES, 85.5, "€"))
+
+
+def test_cenarios_por_metodo():
+    por_metodo = valorar_cenarios_precos({'compostagem': REDUCOES, 'vermicompostagem': 2 * REDUCOES},
+                                         PRECOS, CAMBIOS, DESCONTOS)
+    np.testing.assert_allclose(por_metodo['vermicompostagem']['vpl_eur'], 2 * por_metodo['compostagem']['vpl_eur'])
@@ -0,0 +1,22 @@
+"""O pacote importa só numpy; pandas, scipy e SALib ficam para os submódulos que os usam."""
+
+import subprocess
+import sys
+from pathlib import Path
+
+
+def test_importar_pacote_nao_carrega_dependencias_pesadas():
+    codigo = (
+        "import sys, simulador_cervejaria; "
+        "print(sorted(m for m in ('pandas', 'scipy', 'SALib') if m in sys.modules))"
+    )
+    saida = subprocess.run([sys.executable, '-c', codigo], capture_output=True, text=True, check=True,
+                           cwd=Path(__file__).resolve().parents[1])
+    assert saida.stdout.strip() == '[]'
+
+
+def test_resultado_diario_carregado_sob_demanda():
+    import simulador_cervejaria
+    from simulador_cervejaria.resultados import ResultadoDiario
+
+    assert simulador_cervejaria.ResultadoDiario is ResultadoDiario
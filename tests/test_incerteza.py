@@ -0,0 +1,72 @@
+"""Monte Carlo adaptativo: pares entre os métodos, regra de parada e IC dos limites por estatísticas de ordem."""
+
+import numpy as np
+import pytest
+
+from simulador_cervejaria.amostragem import blocos_uniformes, transformar_marginais
+from simulador_cervejaria.incerteza import (
+    DISTRIBUICOES_MC,
+    executar_monte_carlo_adaptativo,
+    n_minimo_precisao,
+    precisao_monte_carlo,
+)
+from simulador_cervejaria.parametros import ParametrosCervejaria
+from simulador_cervejaria.totais import executar_simulacao_lote_cervejaria
+
+
+def test_metodos_avaliados_sobre_os_mesmos_pontos():
+    cervejaria = ParametrosCervejaria()
+    resultados, convergencia = executar_monte_carlo_adaptativo(cervejaria, 0.0, 0.0, n_max=250, tamanho_lote=100,
+                                                               semente=11)
+    u = np.vstack(list(blocos_uniformes(3, 250, 100, 'mc', 11)))
+    for metodo, distribuicoes in DISTRIBUICOES_MC.items():
+        esperado = executar_simulacao_lote_cervejaria(*transformar_marginais(distribuicoes, u), cervejaria, metodo)
+        np.testing.assert_array_equal(resultados[metodo], esperado)
+    assert convergencia['avaliacoes'] == 2 * 250
+
+
+def test_metas_inatingiveis_param_em_n_max():
+    resultados, convergencia = executar_monte_carlo_adaptativo(ParametrosCervejaria(), 0.0, 0.0, n_max=250,
+                                                               tamanho_lote=100)
+    assert not convergencia['convergiu']
+    assert convergencia['n_simulations'] == 250
+    assert [linha['n'] for linha in convergencia['historico']] == [100, 200, 250]
+    assert all(len(valores) == 250 for valores in resultados.values())
+
+
+def test_nao_para_antes_do_minimo_de_amostras():
+    # Metas folgadas (dentro das faixas da barra lateral) seriam atingidas já no primeiro lote
+    _, convergencia = executar_monte_carlo_adaptativo(ParametrosCervejaria(), 0.02, 0.10, n_max=5000,
+                                                      tamanho_lote=100)
+    assert convergencia['convergiu']
+    assert convergencia['n_simulations'] >= n_minimo_precisao()
+    primeiro = convergencia['historico'][0]
+    assert np.isnan(primeiro['largura_limites_compostagem'])
+
+
+def test_n_minimo_deixa_os_postos_dentro_da_amostra():
+    n = n_minimo_precisao()
+    for q in (0.025, 0.975):
+        for p in (q, 1 - q):
+            assert n * p - 1.96 * np.sqrt(n * p * (1 - p)) >= 1
+    p = 0.025
+    assert (n - 1) * p - 1.96 * np.sqrt((n - 1) * p * (1 - p)) < 1
+
+
+def test_precisao_igual_ao_calculo_manual():
+    rng = np.random.default_rng(5)
+    valores = rng.normal(100, 10, 1000)
+    erro_padrao, largura = precisao_monte_carlo(valores)
+
+    ordenados = np.sort(valores)
+    media = valores.mean()
+    # n = 1000, q = 0,025: n·q = 25, meia-largura = 1,96·√(1000·0,025·0,975) = 9,677...
+    inferior, superior = ordenados[15], ordenados[35]
+    inferior_alto, superior_alto = ordenados[965], ordenados[985]
+    assert erro_padrao == pytest.approx(valores.std(ddof=1) / np.sqrt(1000) / media, rel=1e-12)
+    assert largura == pytest.approx(max(superior - inferior, superior_alto - inferior_alto) / media, rel=1e-12)
+
+
+def test_precisao_sem_postos_validos_e_nan():
+    _, largura = precisao_monte_carlo(np.arange(1.0, 101.0))
+    assert np.isnan(largura)
@@ -0,0 +1,75 @@
+"""Leitura do portfólio e CLI do lote: células vazias, inteiros vindos como float e linhas inválidas."""
+
+import pandas as pd
+import pytest
+
+from simulador_cervejaria.lote import ler_cervejarias, main
+from simulador_cervejaria.parametros import ParametrosCervejaria
+
+
+def gravar_csv(tmp_path, conteudo):
+    caminho = tmp_path / 'portfolio.csv'
+    caminho.write_text(conteudo)
+    return caminho
+
+
+def test_celulas_vazias_assumem_padrao(tmp_path):
+    caminho = gravar_csv(tmp_path, "id,producao_mensal_litros,anos_simulacao\na,,\nb,60000,10\n")
+    ids, cervejarias = ler_cervejarias(caminho)
+    padrao = ParametrosCervejaria()
+    assert ids == ['a', 'b']
+    assert cervejarias[0] == padrao
+    assert cervejarias[1].producao_mensal_litros == 60000.0
+    assert cervejarias[1].anos_simulacao == 10
+
+
+def test_inteiros_em_float_sao_convertidos(tmp_path):
+    caminho = tmp_path / 'portfolio.parquet'
+    pd.DataFrame({'id': ['a'], 'anos_simulacao': [20.0], 'dias_operacao_mes': [22.0]}).to_parquet(caminho)
+    _, (cervejaria,) = ler_cervejarias(caminho)
+    assert cervejaria.anos_simulacao == 20 and isinstance(cervejaria.anos_simulacao, int)
+    assert cervejaria.dias_operacao_mes == 22 and isinstance(cervejaria.dias_operacao_mes, int)
+
+
+@pytest.mark.parametrize('campo, valor, mensagem', [
+    ('anos_simulacao', '20.5', 'deve ser inteiro'),
+    ('anos_simulacao', 'vinte', 'não é numérico'),
+    ('anos_simulacao', '0', 'fora da faixa'),
+    ('producao_mensal_litros', '0', 'deve ser positivo'),
+    ('anos_simulacao', 'inf', 'não é finito'),
+    ('percentual_bagaco', '250', 'fora da faixa'),
+    ('umidade_bagaco', '140', 'fora da faixa'),
+    ('umidade_levedura', '-1', 'fora da faixa'),
+    ('h_exposta', '-5', 'fora da faixa'),
+    ('h_exposta', '25', 'fora da faixa'),
+    ('doc_bagaco', '1.2', 'fora da faixa'),
+    ('dias_operacao_mes', '32', 'fora da faixa'),
+])
+def test_linha_invalida_e_identificada(tmp_path, campo, valor, mensagem):
+    caminho = gravar_csv(tmp_path, f"id,{campo}\nok,{getattr(ParametrosCervejaria(), campo)}\nruim,{valor}\n")
+    with pytest.raises(ValueError, match=rf"linha 2 \(id=ruim\): {campo}: .*{mensagem}"):
+        ler_cervejarias(caminho)
+
+
+def test_limites_fisicos_sao_inclusivos(tmp_path):
+    caminho = gravar_csv(tmp_path, "id,percentual_bagaco,h_exposta,doc_levedura\na,100,24,1\nb,0,0,0\n")
+    _, cervejarias = ler_cervejarias(caminho)
+    assert [(c.percentual_bagaco, c.h_exposta, c.doc_levedura) for c in cervejarias] == [(100, 24, 1), (0, 0, 0)]
+
+
+def test_entrada_vazia_sai_com_erro(tmp_path, capsys):
+    entrada = gravar_csv(tmp_path, "id,anos_simulacao\n")
+    saida = tmp_path / 'saida.parquet'
+    with pytest.raises(SystemExit) as saida_cli:
+        main([str(entrada), str(saida), '--workers', '1'])
+    assert saida_cli.value.code == 1
+    assert 'Nenhuma cervejaria' in capsys.readouterr().err
+    assert not saida.exists()
+
+
+def test_cli_grava_totais_anuais(tmp_path):
+    entrada = gravar_csv(tmp_path, "id,anos_simulacao\na,3\nb,\n")
+    saida = tmp_path / 'saida.parquet'
+    main([str(entrada), str(saida), '--workers', '1'])
+    tabela = pd.read_parquet(saida)
+    assert tabela.groupby('id').size().to_dict() == {'a': 3, 'b': ParametrosCervejaria().anos_simulacao}
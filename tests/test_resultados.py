@@ -0,0 +1,80 @@
+"""ResultadoDiario: visões derivadas sob demanda contra as colunas calculadas antes de forma antecipada."""
+
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from simulador_cervejaria.constantes import GWP_CH4_20, GWP_N2O_20
+from simulador_cervejaria.emissoes import (
+    calcular_emissoes_aterro,
+    calcular_emissoes_compostagem_cervejaria,
+    calcular_emissoes_vermicompostagem_cervejaria,
+)
+from simulador_cervejaria.parametros import ParametrosCervejaria
+from simulador_cervejaria.resultados import ResultadoDiario
+
+INICIO = datetime(2025, 1, 1)
+
+
+@pytest.fixture(scope='module')
+def series():
+    cervejaria = ParametrosCervejaria(anos_simulacao=10)
+    params = cervejaria.params_base
+    (ch4_a, n2o_a), (ch4_c, n2o_c), (ch4_v, n2o_v) = (
+        calcular(params, cervejaria) for calcular in (calcular_emissoes_aterro, calcular_emissoes_compostagem_cervejaria,
+                                                      calcular_emissoes_vermicompostagem_cervejaria))
+    return {'CH4_Aterro': ch4_a, 'N2O_Aterro': n2o_a, 'CH4_Compost': ch4_c, 'N2O_Compost': n2o_c,
+            'CH4_Vermi': ch4_v, 'N2O_Vermi': n2o_v}
+
+
+def tabela_antecipada(series):
+    # As colunas que o app montava antes de ResultadoDiario, uma a uma
+    df = pd.DataFrame({'Data': pd.date_range(start=INICIO, periods=len(series['CH4_Aterro']), freq='D')})
+    for nome, serie in series.items():
+        df[f'{nome}_kg_dia'] = serie
+    for nome in series:
+        df[f'{nome}_tCO2eq'] = df[f'{nome}_kg_dia'] * (GWP_CH4_20 if 'CH4' in nome else GWP_N2O_20) / 1000
+    for cenario in ('Aterro', 'Compost', 'Vermi'):
+        df[f'Total_{cenario}_tCO2eq_dia'] = df[f'CH4_{cenario}_tCO2eq'] + df[f'N2O_{cenario}_tCO2eq']
+        df[f'Total_{cenario}_tCO2eq_acum'] = df[f'Total_{cenario}_tCO2eq_dia'].cumsum()
+    for cenario in ('Compost', 'Vermi'):
+        df[f'Reducao_{cenario}_tCO2eq_acum'] = df['Total_Aterro_tCO2eq_acum'] - df[f'Total_{cenario}_tCO2eq_acum']
+    return df
+
+
+def test_visoes_derivadas_iguais_as_colunas_antecipadas(series):
+    resultado = ResultadoDiario(INICIO, series)
+    esperado = tabela_antecipada(series)
+    for nome in series:
+        gas, cenario = nome.split('_')
+        np.testing.assert_allclose(resultado.tco2eq_dia(gas, cenario), esperado[f'{nome}_tCO2eq'], rtol=1e-14)
+    for cenario in ('Aterro', 'Compost', 'Vermi'):
+        np.testing.assert_allclose(resultado.total_dia(cenario), esperado[f'Total_{cenario}_tCO2eq_dia'], rtol=1e-14)
+        np.testing.assert_allclose(resultado.acumulado(cenario), esperado[f'Total_{cenario}_tCO2eq_acum'], rtol=1e-12)
+    for cenario in ('Compost', 'Vermi'):
+        np.testing.assert_allclose(resultado.reducao_acumulada(cenario), esperado[f'Reducao_{cenario}_tCO2eq_acum'],
+                                   rtol=1e-12)
+        assert resultado.total_evitado(cenario) == pytest.approx(
+            esperado[f'Reducao_{cenario}_tCO2eq_acum'].iloc[-1], rel=1e-12)
+
+    exportado = resultado.para_dataframe()
+    pd.testing.assert_frame_equal(exportado[esperado.columns], esperado, rtol=1e-12)
+    assert (exportado['Year'] == exportado['Data'].dt.year).all()
+
+
+def test_float32_usa_metade_da_memoria(series):
+    duplo = ResultadoDiario(INICIO, series)
+    simples = ResultadoDiario(INICIO, series, np.float32)
+    assert simples.nbytes * 2 == duplo.nbytes
+    assert all(serie.dtype == np.float32 for serie in simples.series_kg_dia.values())
+
+    for cenario in ('Aterro', 'Compost', 'Vermi'):
+        np.testing.assert_allclose(simples.total_dia(cenario), duplo.total_dia(cenario), rtol=1e-6)
+        # Acumulados em float64 mesmo com séries em float32: o erro não cresce com o horizonte
+        assert simples.acumulado(cenario).dtype == np.float64
+        np.testing.assert_allclose(simples.acumulado(cenario), duplo.acumulado(cenario), rtol=1e-6)
+    for cenario in ('Compost', 'Vermi'):
+        assert simples.total_evitado(cenario) == pytest.approx(duplo.total_evitado(cenario), rel=1e-6)
+    np.testing.assert_allclose(simples.resumo_anual().iloc[:, 1:], duplo.resumo_anual().iloc[:, 1:], rtol=1e-6)
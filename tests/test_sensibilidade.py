@@ -0,0 +1,75 @@
+"""Avaliação da matriz de Saltelli em blocos: execução local por padrão, pool só quando pedido."""
+
+import numpy as np
+import pytest
+
+from simulador_cervejaria import sensibilidade
+from simulador_cervejaria.parametros import ParametrosCervejaria
+
+
+@pytest.fixture
+def matriz():
+    rng = np.random.default_rng(0)
+    limites = np.array(sensibilidade.PROBLEMA_SOBOL_CERVEJARIA['bounds'])
+    return limites[:, 0] + rng.random((64, 3)) * (limites[:, 1] - limites[:, 0])
+
+
+def test_padrao_avalia_no_proprio_processo(monkeypatch, matriz):
+    def pool_proibido(*args, **kwargs):
+        raise AssertionError("o pool do loky não deve ser iniciado sem pedido explícito")
+
+    monkeypatch.setattr(sensibilidade, 'get_reusable_executor', pool_proibido)
+    progresso = []
+    resultados = sensibilidade.avaliar_em_blocos(matriz, 'compostagem', ParametrosCervejaria(), tamanho_bloco=16,
+                                                 ao_progresso=progresso.append)
+    assert resultados.shape == (64,)
+    assert progresso == [0.25, 0.5, 0.75, 1.0]
+
+
+def test_pool_explicito_da_o_mesmo_resultado(matriz):
+    cervejaria = ParametrosCervejaria()
+    local = sensibilidade.avaliar_em_blocos(matriz, 'vermicompostagem', cervejaria)
+    paralelo = sensibilidade.avaliar_em_blocos(matriz, 'vermicompostagem', cervejaria, n_workers=2)
+    np.testing.assert_array_equal(local, paralelo)
+
+
+def test_desenho_de_saltelli_e_prefixo_do_maior():
+    # Premissa do modo adaptativo: com a mesma semente, o desenho para N é prefixo do desenho para 2N
+    problema = dict(sensibilidade.PROBLEMA_SOBOL_CERVEJARIA)
+    linhas = 64 * (2 * problema['num_vars'] + 2)
+    maior = sensibilidade.sample(dict(problema), 256, seed=sensibilidade.SEMENTE_SOBOL)
+    np.testing.assert_array_equal(maior[:linhas],
+                                  sensibilidade.sample(dict(problema), 64, seed=sensibilidade.SEMENTE_SOBOL))
+
+
+def test_adaptativo_igual_a_execucao_direta_no_n_de_parada():
+    cervejaria = ParametrosCervejaria()
+    problema = sensibilidade.PROBLEMA_SOBOL_CERVEJARIA
+    Si, _, convergencia = sensibilidade.executar_analise_sobol_adaptativa(problema, 1024, 'compostagem', cervejaria,
+                                                                         tolerancia=0.15)
+    n = convergencia['n_samples']
+    assert convergencia['convergiu'] and n < 1024
+
+    direto = dict(problema)
+    valores = sensibilidade.sample(direto, n, seed=sensibilidade.SEMENTE_SOBOL)
+    resultados = sensibilidade.avaliar_em_blocos(valores, 'compostagem', cervejaria)
+    esperado = sensibilidade.analyze(direto, resultados, print_to_console=False, seed=sensibilidade.SEMENTE_SOBOL)
+    for chave in ('S1', 'ST', 'S1_conf', 'ST_conf'):
+        np.testing.assert_allclose(Si[chave], esperado[chave], rtol=1e-12, atol=1e-15)
+
+    linhas_por_amostra = 2 * problema['num_vars'] + 2
+    assert convergencia['avaliacoes'] == n * linhas_por_amostra
+    assert convergencia['avaliacoes'] + convergencia['avaliacoes_economizadas'] == 1024 * linhas_por_amostra
+
+
+def test_tolerancia_zero_vai_ate_n_max():
+    progresso = []
+    _, _, convergencia = sensibilidade.executar_analise_sobol_adaptativa(
+        sensibilidade.PROBLEMA_SOBOL_CERVEJARIA, 256, 'vermicompostagem', ParametrosCervejaria(), tolerancia=0.0,
+        ao_progresso=progresso.append,
+    )
+    assert not convergencia['convergiu']
+    assert convergencia['n_samples'] == 256
+    assert convergencia['avaliacoes_economizadas'] == 0
+    assert [linha['n_samples'] for linha in convergencia['historico']] == [32, 64, 128, 256]
+    assert progresso[-1] == 1.0
@@ -0,0 +1,50 @@
+"""Gerenciador de etapas em segundo plano: cancelamento, liberação por sessão e limite do registro."""
+
+import threading
+
+import pytest
+
+from simulador_cervejaria.tarefas import GerenciadorTarefas, TarefaCancelada
+
+
+def esperar_cancelamento(liberada):
+    def funcao(tarefa):
+        while not liberada.wait(0.01):
+            tarefa.informar(0.5)
+        return 'pronta'
+    return funcao
+
+
+def test_cancelar_interrompe_no_proximo_informe():
+    gerenciador = GerenciadorTarefas()
+    tarefa = gerenciador.obter('a', esperar_cancelamento(threading.Event()))
+    tarefa.cancelar()
+    assert tarefa.aguardar(5)
+    assert tarefa.cancelada
+    with pytest.raises(TarefaCancelada):
+        tarefa.resultado()
+
+
+def test_liberar_cancela_quando_nenhuma_sessao_acompanha():
+    gerenciador = GerenciadorTarefas()
+    tarefa = gerenciador.obter('a', esperar_cancelamento(threading.Event()), 'sessao_1')
+    assert gerenciador.obter('a', None, 'sessao_2') is tarefa
+
+    gerenciador.liberar('a', 'sessao_1')
+    assert len(gerenciador) == 1 and not tarefa.cancelada
+
+    gerenciador.liberar('a', 'sessao_2')
+    assert tarefa.aguardar(5) and tarefa.cancelada
+    assert len(gerenciador) == 0
+
+
+def test_registro_descarta_concluidas_mais_antigas():
+    gerenciador = GerenciadorTarefas(max_tarefas=3)
+    liberada = threading.Event()
+    em_andamento = gerenciador.obter('lenta', esperar_cancelamento(liberada))
+    for i in range(6):
+        gerenciador.obter(i, lambda tarefa, i=i: i).aguardar(5)
+    assert len(gerenciador) <= 3
+    assert gerenciador.obter('lenta', None) is em_andamento
+    liberada.set()
+    assert em_andamento.resultado() == 'pronta'
@@ -0,0 +1,85 @@
+"""Totais em forma fechada contra a soma das séries diárias do modelo."""
+
+from dataclasses import replace
+
+import numpy as np
+import pytest
+
+from simulador_cervejaria import (
+    GWP_CH4_20,
+    GWP_N2O_20,
+    ParametrosCervejaria,
+    calcular_emissoes_aterro,
+    calcular_emissoes_compostagem_cervejaria,
+    calcular_emissoes_vermicompostagem_cervejaria,
+    calcular_totais_anuais_cervejaria,
+    calcular_totais_cervejaria,
+)
+from simulador_cervejaria.totais import _somas_kernels, _somas_kernels_anuais
+
+CERVEJARIAS = [
+    ParametrosCervejaria(),
+    ParametrosCervejaria(producao_mensal_litros=6500, dias_operacao_mes=22, fator_residuos=0.23,
+                         percentual_bagaco=72, umidade_bagaco=83, umidade_levedura=88, temperatura=31,
+                         doc_bagaco=0.74, doc_levedura=0.93, h_exposta=17),
+]
+ANOS = [5, 20, 50]
+
+
+def totais_pelas_series(cervejaria):
+    params = cervejaria.params_base
+    series = {
+        'Aterro': calcular_emissoes_aterro(params, cervejaria),
+        'Compost': calcular_emissoes_compostagem_cervejaria(params, cervejaria),
+        'Vermi': calcular_emissoes_vermicompostagem_cervejaria(params, cervejaria),
+    }
+    totais = {}
+    for cenario, (ch4, n2o) in series.items():
+        ch4, n2o = np.asarray(ch4), np.asarray(n2o)
+        totais[f'CH4_{cenario}_tCO2eq'] = ch4 * GWP_CH4_20 / 1000
+        totais[f'N2O_{cenario}_tCO2eq'] = n2o * GWP_N2O_20 / 1000
+    return totais
+
+
+@pytest.mark.parametrize('anos', ANOS)
+@pytest.mark.parametrize('base', CERVEJARIAS, ids=['padrao', 'alterada'])
+def test_totais_fechados_igualam_soma_das_series(base, anos):
+    cervejaria = replace(base, anos_simulacao=anos)
+    esperado = totais_pelas_series(cervejaria)
+    obtido = calcular_totais_cervejaria(cervejaria.params_base, cervejaria)
+    for chave, serie in esperado.items():
+        np.testing.assert_allclose(obtido[chave], serie.sum(), rtol=1e-12, err_msg=chave)
+
+
+@pytest.mark.parametrize('anos', ANOS)
+@pytest.mark.parametrize('base', CERVEJARIAS, ids=['padrao', 'alterada'])
+def test_totais_anuais_igualam_series_por_ano(base, anos):
+    cervejaria = replace(base, anos_simulacao=anos)
+    esperado = totais_pelas_series(cervejaria)
+    obtido = calcular_totais_anuais_cervejaria(cervejaria.params_base, cervejaria)
+    for chave, serie in esperado.items():
+        np.testing.assert_allclose(obtido[chave], serie.reshape(-1, 365).sum(axis=1), rtol=1e-12, err_msg=chave)
+
+
+def test_totais_vetoriais_igualam_escalares():
+    cervejaria = ParametrosCervejaria()
+    umidade = np.array([0.76, 0.82, 0.89])
+    temperatura = np.array([21.0, 27.5, 34.0])
+    doc = np.array([0.71, 0.80, 0.88])
+    vetorial = calcular_totais_cervejaria((umidade, temperatura, doc), cervejaria)
+    for i in range(3):
+        escalar = calcular_totais_cervejaria((umidade[i], temperatura[i], doc[i]), cervejaria)
+        for chave, valor in escalar.items():
+            np.testing.assert_allclose(vetorial[chave][i], valor, rtol=1e-12, err_msg=chave)
+
+
+def test_somas_em_cache_sao_somente_leitura():
+    somas = _somas_kernels(365 * 5)
+    with pytest.raises(TypeError):
+        somas['ch4_aterro'] = 0.0
+
+    anuais = _somas_kernels_anuais(365 * 5)
+    with pytest.raises(ValueError):
+        anuais['ch4_aterro'][0] = 0.0
+    with pytest.raises(TypeError):
+        anuais['ch4_aterro'] = np.zeros(5)